@@ -0,0 +1,16 @@
+"""Agents package for remote execution over SSH.
+
+``SSHClient`` is loaded on first access; paramiko itself is only imported
+when a connection is opened.
+"""
+from utils.lazy import lazy_exports
+
+_EXPORTS = {
+    "ResourceSampler": "resource_sampler",
+    "LatencyTimeline": "resource_sampler",
+    "SSHClient": "ssh_client",
+    "SSHPool": "ssh_client",
+}
+
+__all__ = sorted(_EXPORTS)
+__getattr__, __dir__ = lazy_exports(__name__, _EXPORTS)
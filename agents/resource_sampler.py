@@ -0,0 +1,354 @@
+"""Remote host resource sampling over pooled SSH, aligned with a latency timeline.
+
+``ResourceSampler`` polls a list of hosts on a fixed tick. For each host and
+tick it runs one batched shell command that reads ``/proc`` and
+``/sys/block``, over a persistent connection from ``SSHPool``. Successive
+snapshots are turned into CPU, memory, network and disk rates and stored in
+a ``TimelineBuffer`` keyed by tick time. ``LatencyTimeline`` buckets
+request latencies at the same resolution. ``merge_timelines`` joins the two
+into report rows, so latency spikes can be read side by side with server
+saturation.
+"""
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass
+from statistics import StatisticsError, correlation, quantiles
+from typing import Any, Dict, List, Optional
+import csv
+import logging
+import threading
+import time
+
+logger = logging.getLogger(__name__)
+
+SECTION = "@@"
+SNAPSHOT_COMMAND = f"; echo {SECTION}; ".join([
+    "head -n1 /proc/stat",
+    "cat /proc/loadavg",
+    "cat /proc/meminfo",
+    "cat /proc/net/dev",
+    "cat /proc/diskstats",
+    "ls /sys/block",
+])
+SECTOR_BYTES = 512
+DEFAULT_COMMAND_TIMEOUT = 10.0
+DEFAULT_MAX_SAMPLES = 6 * 3600
+
+
+@dataclass(frozen=True)
+class HostSnapshot:
+    """Raw cumulative counters read from one host at one tick."""
+    timestamp: float
+    cpu_total: int
+    cpu_idle: int
+    cpu_iowait: int
+    load1: float
+    mem_total_kb: int
+    mem_available_kb: int
+    net_rx_bytes: int
+    net_tx_bytes: int
+    disk_read_bytes: int
+    disk_write_bytes: int
+
+
+def parse_snapshot(output: str, timestamp: float) -> HostSnapshot:
+    """Parse the output of ``SNAPSHOT_COMMAND``.
+
+    Args:
+        output: Command output
+        timestamp: Local time the sample was taken
+
+    Returns:
+        Parsed counters
+
+    Raises:
+        ValueError: If the output is incomplete or malformed
+    """
+    sections = [section.strip().splitlines() for section in output.split(SECTION)]
+    if len(sections) != 6:
+        raise ValueError(f"Expected 6 sections in snapshot output, got {len(sections)}")
+    stat, loadavg, meminfo, netdev, diskstats, block_devices = sections
+
+    cpu = [int(value) for value in stat[0].split()[1:9]]
+    memory = {}
+    for line in meminfo:
+        name, _, value = line.partition(":")
+        memory[name] = int(value.split()[0])
+
+    rx = tx = 0
+    for line in netdev[2:]:
+        interface, _, counters = line.partition(":")
+        if interface.strip() != "lo":
+            fields = counters.split()
+            rx += int(fields[0])
+            tx += int(fields[8])
+
+    disks = {name for name in block_devices if not name.startswith(("loop", "ram"))}
+    read = written = 0
+    for line in diskstats:
+        fields = line.split()
+        if len(fields) >= 10 and fields[2] in disks:
+            read += int(fields[5]) * SECTOR_BYTES
+            written += int(fields[9]) * SECTOR_BYTES
+
+    return HostSnapshot(
+        timestamp=timestamp,
+        cpu_total=sum(cpu),
+        cpu_idle=cpu[3] + cpu[4],
+        cpu_iowait=cpu[4],
+        load1=float(loadavg[0].split()[0]),
+        mem_total_kb=memory["MemTotal"],
+        mem_available_kb=memory.get("MemAvailable", memory.get("MemFree", 0)),
+        net_rx_bytes=rx,
+        net_tx_bytes=tx,
+        disk_read_bytes=read,
+        disk_write_bytes=written,
+    )
+
+
+def resource_rates(previous: HostSnapshot, current: HostSnapshot) -> Dict[str, float]:
+    """Turn two snapshots into utilization and per-second rates.
+
+    Returns:
+        ``cpu_pct``, ``iowait_pct``, ``load1``, ``mem_used_pct`` and byte rates
+        for network (``net_rx_bps``, ``net_tx_bps``) and disk (``disk_read_bps``, ``disk_write_bps``)
+    """
+    elapsed = max(current.timestamp - previous.timestamp, 1e-6)
+    cpu_delta = max(current.cpu_total - previous.cpu_total, 1)
+    return {
+        "cpu_pct": 100.0 * (1 - (current.cpu_idle - previous.cpu_idle) / cpu_delta),
+        "iowait_pct": 100.0 * (current.cpu_iowait - previous.cpu_iowait) / cpu_delta,
+        "load1": current.load1,
+        "mem_used_pct": 100.0 * (1 - current.mem_available_kb / current.mem_total_kb),
+        "net_rx_bps": (current.net_rx_bytes - previous.net_rx_bytes) / elapsed,
+        "net_tx_bps": (current.net_tx_bytes - previous.net_tx_bytes) / elapsed,
+        "disk_read_bps": (current.disk_read_bytes - previous.disk_read_bytes) / elapsed,
+        "disk_write_bps": (current.disk_write_bytes - previous.disk_write_bytes) / elapsed,
+    }
+
+
+class TimelineBuffer:
+    """Bounded, thread-safe buffer of metrics per source, bucketed by time."""
+
+    def __init__(self, resolution: float = 1.0, max_buckets: int = 24 * 3600) -> None:
+        """Initialize the buffer.
+
+        Args:
+            resolution: Bucket width in seconds
+            max_buckets: Oldest buckets are dropped beyond this many
+        """
+        self.resolution = resolution
+        self.max_buckets = max_buckets
+        self._buckets: "OrderedDict[float, Dict[str, Dict[str, float]]]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def bucket(self, timestamp: float) -> float:
+        """Get the start of the bucket containing a timestamp."""
+        return timestamp - timestamp % self.resolution
+
+    def add(self, timestamp: float, source: str, values: Dict[str, float]) -> None:
+        """Store a source's metrics in the bucket for ``timestamp``."""
+        key = self.bucket(timestamp)
+        with self._lock:
+            bucket = self._buckets.get(key)
+            if bucket is None:
+                bucket = self._buckets[key] = {}
+                while len(self._buckets) > self.max_buckets:
+                    self._buckets.popitem(last=False)
+            bucket.setdefault(source, {}).update(values)
+
+    def rows(self) -> Dict[float, Dict[str, Dict[str, float]]]:
+        """Get a copy of all buckets in time order."""
+        with self._lock:
+            return {key: {source: dict(values) for source, values in bucket.items()} for key, bucket in self._buckets.items()}
+
+
+class ResourceSampler:
+    """Samples CPU, memory, network and disk usage of remote hosts in the background."""
+
+    def __init__(
+        self,
+        pool: Any,
+        hosts: List[str],
+        interval: float = 1.0,
+        buffer: Optional[TimelineBuffer] = None,
+        command_timeout: float = DEFAULT_COMMAND_TIMEOUT,
+        max_samples: int = DEFAULT_MAX_SAMPLES
+    ) -> None:
+        """Initialize the sampler.
+
+        Args:
+            pool: ``SSHPool`` (or compatible) providing a persistent client per host
+            hosts: Hostnames to sample
+            interval: Seconds between ticks; also the default bucket width
+            buffer: Buffer receiving the samples
+            command_timeout: Seconds a remote command may block before the sample counts as failed
+            max_samples: Ticks kept by the default buffer; older ones are dropped
+        """
+        self.pool = pool
+        self.hosts = hosts
+        self.interval = interval
+        self.command_timeout = command_timeout
+        self.buffer = buffer or TimelineBuffer(resolution=interval, max_buckets=max_samples)
+        self.errors = 0
+        self._previous: Dict[str, HostSnapshot] = {}
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+        self._executor = ThreadPoolExecutor(max_workers=max(1, len(hosts)), thread_name_prefix="resource-sampler")
+
+    def start(self) -> "ResourceSampler":
+        """Start sampling on a background thread."""
+        self._thread = threading.Thread(target=self._run, name="resource-sampler", daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self) -> None:
+        """Stop sampling and close the pooled connections, waiting at most for one command timeout."""
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join(self.command_timeout + self.interval)
+            if self._thread.is_alive():
+                logger.warning("Resource sampling still blocked after %.1fs; closing its connections", self.command_timeout)
+        self._executor.shutdown(wait=False, cancel_futures=True)
+        self.pool.close_all()
+
+    def __enter__(self) -> "ResourceSampler":
+        return self.start()
+
+    def __exit__(self, *exc_info: Any) -> None:
+        self.stop()
+
+    def _run(self) -> None:
+        # Ticks are aligned to multiples of the interval so every host shares bucket boundaries
+        next_tick = time.time() // self.interval * self.interval + self.interval
+        while not self._stop.wait(max(0.0, next_tick - time.time())):
+            self.sample(next_tick)
+            next_tick += self.interval
+            if next_tick < time.time():  # a tick overran; skip missed ticks instead of bursting
+                next_tick = time.time() // self.interval * self.interval + self.interval
+
+    def sample(self, timestamp: float) -> None:
+        """Sample every host once, concurrently, and store the rates."""
+        for _ in self._executor.map(lambda host: self._sample_host(host, timestamp), self.hosts):
+            pass
+
+    def _sample_host(self, host: str, timestamp: float) -> None:
+        try:
+            result = self.pool.get(host).execute_command(SNAPSHOT_COMMAND, timeout=self.command_timeout)
+            if not result or not result[0]:
+                raise ValueError(result[1] if result else "not connected")
+            snapshot = parse_snapshot(result[0], timestamp)
+        except Exception as e:  # a flaky host must not stop sampling of the others
+            self.errors += 1
+            self._previous.pop(host, None)
+            logger.warning("Resource sampling failed for %s: %s", host, e)
+            return
+        previous = self._previous.get(host)
+        self._previous[host] = snapshot
+        if previous is not None:
+            self.buffer.add(timestamp, host, resource_rates(previous, snapshot))
+
+
+class LatencyTimeline:
+    """Request latencies bucketed at the same resolution as a ``TimelineBuffer``."""
+
+    def __init__(self, resolution: float = 1.0) -> None:
+        self.resolution = resolution
+        self._latencies: Dict[float, List[float]] = {}
+        self._failures: Dict[float, int] = {}
+        self._lock = threading.Lock()
+
+    def record(self, timestamp: float, latency_ms: float, failed: bool = False) -> None:
+        """Record one request."""
+        key = timestamp - timestamp % self.resolution
+        with self._lock:
+            self._latencies.setdefault(key, []).append(latency_ms)
+            if failed:
+                self._failures[key] = self._failures.get(key, 0) + 1
+
+    def drain(self) -> List[List[Any]]:
+        """Remove and return the raw samples, e.g. for a Locust worker to report them to the master.
+
+        Returns:
+            ``[bucket, latencies_ms, failures]`` lists, serialisable by any transport
+        """
+        with self._lock:
+            latencies, failures = self._latencies, self._failures
+            self._latencies, self._failures = {}, {}
+        return [[key, values, failures.get(key, 0)] for key, values in latencies.items()]
+
+    def merge(self, samples: List[List[Any]]) -> None:
+        """Add samples drained from another process's timeline."""
+        with self._lock:
+            for key, values, failed in samples:
+                self._latencies.setdefault(key, []).extend(values)
+                if failed:
+                    self._failures[key] = self._failures.get(key, 0) + failed
+
+    def rows(self) -> Dict[float, Dict[str, float]]:
+        """Summarize each bucket as throughput, failures and latency percentiles."""
+        with self._lock:
+            buckets = {key: sorted(values) for key, values in self._latencies.items()}
+            failures = dict(self._failures)
+        rows = {}
+        for key in sorted(buckets):
+            values = buckets[key]
+            cuts = quantiles(values, n=100) if len(values) > 1 else values * 99
+            rows[key] = {
+                "rps": len(values) / self.resolution,
+                "failures": failures.get(key, 0),
+                "p50_ms": cuts[49],
+                "p95_ms": cuts[94],
+                "max_ms": values[-1],
+            }
+        return rows
+
+
+def merge_timelines(
+    latency: Dict[float, Dict[str, float]],
+    resources: Dict[float, Dict[str, Dict[str, float]]]
+) -> List[Dict[str, Any]]:
+    """Join latency and resource buckets into one row per bucket.
+
+    Resource columns are named ``<host>:<metric>``; buckets missing on one
+    side have empty cells.
+
+    Returns:
+        Rows in time order, each with a ``timestamp`` column
+    """
+    rows = []
+    for key in sorted(set(latency) | set(resources)):
+        row: Dict[str, Any] = {"timestamp": key}
+        row.update(latency.get(key, {}))
+        for host, values in resources.get(key, {}).items():
+            row.update({f"{host}:{metric}": value for metric, value in values.items()})
+        rows.append(row)
+    return rows
+
+
+def write_timeline_csv(path: str, rows: List[Dict[str, Any]]) -> None:
+    """Write merged timeline rows as CSV."""
+    columns: List[str] = []
+    for row in rows:
+        columns.extend(column for column in row if column not in columns)
+    with open(path, "w", newline="") as handle:
+        writer = csv.DictWriter(handle, fieldnames=columns)
+        writer.writeheader()
+        writer.writerows(rows)
+
+
+def latency_correlations(rows: List[Dict[str, Any]], latency_column: str = "p95_ms") -> Dict[str, float]:
+    """Correlate a latency column with every resource column (Pearson).
+
+    Returns:
+        Correlation coefficient per resource column, strongest first
+    """
+    result = {}
+    resource_columns = {column for row in rows for column in row if ":" in column}
+    for column in resource_columns:
+        pairs = [(row[latency_column], row[column]) for row in rows if latency_column in row and column in row]
+        try:
+            result[column] = correlation([pair[0] for pair in pairs], [pair[1] for pair in pairs])
+        except (StatisticsError, ValueError):
+            continue
+    return dict(sorted(result.items(), key=lambda item: -abs(item[1])))
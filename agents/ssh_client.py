@@ -1,4 +1,6 @@
-import paramiko
+import logging
+
+logger = logging.getLogger(__name__)
 
 class SSHClient:
     def __init__(self, hostname, username, password):
@@ -8,31 +10,62 @@ class SSHClient:
         self.client = None
 
     def connect(self):
+        import paramiko  # deferred: the crypto stack is slow to import and most workers never open SSH
+
         try:
             self.client = paramiko.SSHClient()
             self.client.set_missing_host_key_policy(paramiko.AutoAddPolicy())  # Not recommended for production
             self.client.connect(self.hostname, username=self.username, password=self.password)
-            print(f"Connected to {self.hostname}")
+            self.client.get_transport().set_keepalive(30)  # keep idle pooled connections alive through NAT/firewalls
+            logger.info("Connected to %s", self.hostname)
         except Exception as e:
-            print(f"Error connecting to {self.hostname}: {e}")
+            logger.error("Error connecting to %s: %s", self.hostname, e)
             self.client = None
 
-    def execute_command(self, command):
+    def is_connected(self):
+        transport = self.client.get_transport() if self.client else None
+        return transport is not None and transport.is_active()
+
+    def execute_command(self, command, timeout=None):
         if not self.client:
-            print("Not connected to SSH server.")
+            logger.warning("Not connected to SSH server.")
             return None
 
         try:
-            stdin, stdout, stderr = self.client.exec_command(command)
+            # The timeout applies to every read, so a hung channel raises instead of blocking forever
+            stdin, stdout, stderr = self.client.exec_command(command, timeout=timeout)
             output = stdout.read().decode('utf-8')
             error = stderr.read().decode('utf-8')
             return output, error
         except Exception as e:
-            print(f"Error executing command: {e}")
+            logger.error("Error executing command: %s", e)
             return None, str(e)
 
     def close(self):
         if self.client:
             self.client.close()
-            print(f"Connection to {self.hostname} closed.")
-            self.client = None
\ No newline at end of file
+            logger.info("Connection to %s closed.", self.hostname)
+            self.client = None
+
+
+class SSHPool:
+    """Keeps one persistent connection per host and reopens dropped ones on demand."""
+
+    def __init__(self, username, password, client_factory=SSHClient):
+        self.username = username
+        self.password = password
+        self.client_factory = client_factory
+        self.clients = {}
+
+    def get(self, hostname):
+        client = self.clients.get(hostname)
+        if client is None or not client.is_connected():
+            client = self.client_factory(hostname, self.username, self.password)
+            client.connect()
+            self.clients[hostname] = client
+        return client
+
+    def close_all(self):
+        for client in self.clients.values():
+            client.close()
+        self.clients.clear()
@@ -1 +1,38 @@
-"""Core package for the automation framework.""" 
\ No newline at end of file
+"""Core package for the automation framework.
+
+Public names are loaded on first access, so importing the package (or one
+light submodule) does not pull in requests, pydantic or httpx.
+"""
+from utils.lazy import lazy_exports
+
+_EXPORTS = {
+    "APIClient": "api_client",
+    "PreparedRequest": "api_client",
+    "CircuitBreaker": "circuit_breaker",
+    "CommandExecutionError": "command_executor",
+    "CommandExecutor": "command_executor",
+    "CommandResult": "command_executor",
+    "SubprocessExecutor": "command_executor",
+    "NoteCreateRequest": "data_models",
+    "NoteResponse": "data_models",
+    "UserRegisterRequest": "data_models",
+    "UserRegisterResponse": "data_models",
+    "UserRegistrationRequest": "data_models",
+    "UserRegistrationResponse": "data_models",
+    "APIError": "exceptions",
+    "AutomationError": "exceptions",
+    "CircuitOpenError": "exceptions",
+    "ResponseTooLargeError": "exceptions",
+    "SchemaValidationError": "exceptions",
+    "HedgePolicy": "hedging",
+    "HedgeStats": "hedging",
+    "RateLimit": "rate_limiter",
+    "RateLimiter": "rate_limiter",
+    "ResponseCache": "response_cache",
+    "SchemaRegistry": "schema_validator",
+    "StreamingResponse": "streaming",
+    "HTTPXSession": "transports",
+}
+
+__all__ = sorted(_EXPORTS)
+__getattr__, __dir__ = lazy_exports(__name__, _EXPORTS)
@@ -1,10 +1,99 @@
 """API Client module for making HTTP requests to the ExpandTesting API."""
-from typing import Dict, Optional, Any, Union
+from typing import TYPE_CHECKING, Dict, Optional, Any, Union
 from urllib.parse import urlencode
 import json
+import logging
+import time
 import requests
 from requests import Response, Session
-from .exceptions import APIError
+from utils.logger import new_request_id, request_id_var
+from .endpoints import endpoint_name
+from .exceptions import APIError, CircuitOpenError
+from .response_cache import CACHEABLE_METHODS, INVALIDATING_METHODS, ResponseCache
+from .streaming import DEFAULT_CHUNK_SIZE, DEFAULT_MAX_BYTES, StreamingResponse
+from .transports import create_session
+
+if TYPE_CHECKING:  # only needed for annotations; callers that use them import them anyway
+    from .circuit_breaker import CircuitBreaker
+    from .hedging import HedgePolicy
+    from .metrics import LatencyHistogram
+    from .rate_limiter import RateLimiter
+    from .schema_validator import SchemaRegistry
+    from .transports import HTTPXSession
+
+logger = logging.getLogger(__name__)
+
+try:
+    import orjson
+except ImportError:  # orjson is an optional speedup
+    orjson = None
+
+
+def _encode_json(data: Any) -> Union[str, bytes]:
+    """Serialize a JSON payload, preferring orjson when it is installed."""
+    if orjson is not None:
+        try:
+            return orjson.dumps(data)
+        except TypeError:
+            pass
+    return json.dumps(data)
+
+
+class PreparedRequest:
+    """A request template whose URL, headers and body are built once.
+
+    Instances are created with ``APIClient.prepare`` and can be sent any
+    number of times. Merged headers are rebuilt only when the client's
+    auth token changes.
+    """
+
+    __slots__ = (
+        "_client", "method", "url", "body", "params",
+        "_extra_headers", "_base_headers", "_headers", "timeout", "retries",
+    )
+
+    def __init__(
+        self,
+        client: "APIClient",
+        method: str,
+        url: str,
+        body: Optional[Union[str, bytes]],
+        params: Optional[Dict[str, Any]],
+        extra_headers: Dict[str, str],
+        timeout: Optional[float],
+        retries: int
+    ) -> None:
+        self._client = client
+        self.method = method
+        self.url = url
+        self.body = body
+        self.params = params
+        self._extra_headers = extra_headers
+        self._base_headers: Optional[Dict[str, str]] = None
+        self._headers: Dict[str, str] = {}
+        self.timeout = timeout
+        self.retries = retries
+
+    @property
+    def headers(self) -> Dict[str, str]:
+        """Get the merged request headers for the current auth token."""
+        base = self._client._cached_default_headers()
+        if base is not self._base_headers:
+            self._headers = {**base, **self._extra_headers}
+            self._base_headers = base
+        return self._headers
+
+    def send(self) -> Response:
+        """Send the prepared request through its client.
+
+        Returns:
+            Response object
+
+        Raises:
+            APIError: If request fails after retries
+        """
+        return self._client._send(self)
+
 
 class APIClient:
     """Client for interacting with the ExpandTesting API.
@@ -17,7 +106,14 @@ class APIClient:
         self,
         base_url: str = "https://practice.expandtesting.com/notes/api",
         timeout: int = 30,
-        verify_ssl: bool = True
+        verify_ssl: bool = True,
+        cache: Optional[ResponseCache] = None,
+        rate_limiter: Optional["RateLimiter"] = None,
+        transport: Union[str, Session, "HTTPXSession"] = "requests",
+        circuit_breaker: Optional["CircuitBreaker"] = None,
+        hedging: Optional["HedgePolicy"] = None,
+        latency_histogram: Optional["LatencyHistogram"] = None,
+        schemas: Optional["SchemaRegistry"] = None
     ) -> None:
         """Initialize API client.
         
@@ -25,12 +121,29 @@ class APIClient:
             base_url: Base URL for the API endpoints
             timeout: Default request timeout in seconds
             verify_ssl: Whether to verify SSL certificates
+            cache: Optional response cache for idempotent reads
+            rate_limiter: Optional limiter pacing requests to the target
+            transport: HTTP backend, "requests" (HTTP/1.1) or "httpx" (HTTP/2
+                multiplexing), or a ready-made session object
+            circuit_breaker: Optional breaker that fails fast while the target is down
+            hedging: Optional policy for hedging slow ``get`` and ``health_check`` calls
+            latency_histogram: Optional per-endpoint histogram every attempt's latency is recorded into
+            schemas: Optional compiled response schemas; buffered responses that do not
+                match their endpoint's schema raise ``SchemaValidationError``
         """
         self.base_url = base_url.rstrip('/')
         self.timeout = timeout
         self.verify_ssl = verify_ssl
-        self.session = Session()
+        self.cache = cache
+        self.rate_limiter = rate_limiter
+        self.circuit_breaker = circuit_breaker
+        self.hedging = hedging
+        self.latency_histogram = latency_histogram
+        self.schemas = schemas
+        self.session = create_session(transport, verify_ssl)
         self._auth_token: Optional[str] = None
+        self._header_cache: Optional[Dict[str, str]] = None
+        self._header_cache_token: Optional[str] = None
 
     @property
     def auth_token(self) -> Optional[str]:
@@ -44,13 +157,24 @@ class APIClient:
     @property
     def default_headers(self) -> Dict[str, str]:
         """Get default headers for API requests."""
-        headers = {
-            "Accept": "application/json",
-            "Content-Type": "application/json",
-        }
-        if self._auth_token:
-            headers["x-auth-token"] = self._auth_token
-        return headers
+        return dict(self._cached_default_headers())
+
+    def _cached_default_headers(self) -> Dict[str, str]:
+        """Get the shared default headers dict, rebuilt when the token changes.
+
+        The token is compared by value rather than invalidated in the setter
+        so that direct assignments to ``_auth_token`` are honoured too.
+        """
+        if self._header_cache is None or self._header_cache_token != self._auth_token:
+            headers = {
+                "Accept": "application/json",
+                "Content-Type": "application/json",
+            }
+            if self._auth_token:
+                headers["x-auth-token"] = self._auth_token
+            self._header_cache = headers
+            self._header_cache_token = self._auth_token
+        return self._header_cache
 
     def _build_url(self, endpoint: str) -> str:
         """Build full URL for the API endpoint.
@@ -95,6 +219,53 @@ class APIClient:
                 response=error_data
             ) from e
 
+    def prepare(
+        self,
+        method: str,
+        endpoint: str,
+        data: Optional[Dict[str, Any]] = None,
+        params: Optional[Dict[str, Any]] = None,
+        headers: Optional[Dict[str, str]] = None,
+        timeout: Optional[float] = None,
+        content_type: str = "json",
+        retries: int = 2
+    ) -> PreparedRequest:
+        """Build a reusable request with its URL, headers and body encoded once.
+
+        Args:
+            method: HTTP method (GET, POST, etc.)
+            endpoint: API endpoint path
+            data: Request payload data
+            params: Query parameters
+            headers: Additional headers
+            timeout: Request timeout override
+            content_type: Content type for request (json/form)
+            retries: Number of times to retry the request on failure
+
+        Returns:
+            PreparedRequest that can be sent repeatedly
+        """
+        extra_headers = dict(headers or {})
+
+        if data and content_type == "form":
+            extra_headers["Content-Type"] = "application/x-www-form-urlencoded"
+            body: Optional[Union[str, bytes]] = urlencode(data)
+        elif data:
+            body = _encode_json(data)
+        else:
+            body = None
+
+        return PreparedRequest(
+            client=self,
+            method=method,
+            url=self._build_url(endpoint),
+            body=body,
+            params=params,
+            extra_headers=extra_headers,
+            timeout=timeout,
+            retries=retries
+        )
+
     def request(
         self,
         method: str,
@@ -124,30 +295,148 @@ class APIClient:
         Raises:
             APIError: If request fails after retries
         """
-        url = self._build_url(endpoint)
-        request_headers = {**self.default_headers, **(headers or {})}
-        
-        if data and content_type == "form":
-            request_headers["Content-Type"] = "application/x-www-form-urlencoded"
-            processed_data = urlencode(data)
-        elif data:
-            processed_data = json.dumps(data)
-        else:
-            processed_data = None
+        return self.prepare(
+            method=method,
+            endpoint=endpoint,
+            data=data,
+            params=params,
+            headers=headers,
+            timeout=timeout,
+            content_type=content_type,
+            retries=retries
+        ).send()
+
+    def stream(
+        self,
+        method: str,
+        endpoint: str,
+        data: Optional[Dict[str, Any]] = None,
+        params: Optional[Dict[str, Any]] = None,
+        headers: Optional[Dict[str, str]] = None,
+        timeout: Optional[float] = None,
+        chunk_size: int = DEFAULT_CHUNK_SIZE,
+        max_bytes: Optional[int] = DEFAULT_MAX_BYTES,
+        retries: int = 2
+    ) -> StreamingResponse:
+        """Make a request whose body is read incrementally instead of buffered.
+
+        Streamed requests bypass the response cache. Use the result as a context
+        manager so the connection is released as soon as the caller is done.
+
+        Args:
+            method: HTTP method (GET, POST, etc.)
+            endpoint: API endpoint path
+            data: Request payload data
+            params: Query parameters
+            headers: Additional headers
+            timeout: Request timeout override
+            chunk_size: Number of bytes read from the socket at a time
+            max_bytes: Maximum body size, or None for no limit
+            retries: Number of times to retry the request on failure
+
+        Returns:
+            StreamingResponse over the response body
+
+        Raises:
+            APIError: If request fails after retries
+        """
+        prepared = self.prepare(
+            method=method,
+            endpoint=endpoint,
+            data=data,
+            params=params,
+            headers=headers,
+            timeout=timeout,
+            retries=retries
+        )
+        response = self._transmit(prepared, prepared.headers, stream=True)
+        if self.cache is not None and method.upper() in INVALIDATING_METHODS:
+            self.cache.invalidate(prepared.url)
+        return StreamingResponse(response, chunk_size=chunk_size, max_bytes=max_bytes)
+
+    def _send(self, prepared: PreparedRequest) -> Response:
+        """Send a prepared request, consulting the response cache if enabled.
+
+        Args:
+            prepared: Request built by ``prepare``
+
+        Returns:
+            Response object
+
+        Raises:
+            APIError: If request fails after retries
+        """
+        token = request_id_var.set(new_request_id())
+        try:
+            method = prepared.method.upper()
+            if self.cache is None:
+                return self._transmit(prepared, prepared.headers)
+            if method in CACHEABLE_METHODS:
+                return self._send_cached(prepared, self.cache)
+
+            response = self._transmit(prepared, prepared.headers)
+            if method in INVALIDATING_METHODS:
+                self.cache.invalidate(prepared.url)
+            return response
+        finally:
+            request_id_var.reset(token)
+
+    def _send_cached(self, prepared: PreparedRequest, cache: ResponseCache) -> Response:
+        """Serve a read from the cache, revalidating stale entries with the server.
+
+        Args:
+            prepared: Request built by ``prepare``
+            cache: Cache to consult
+
+        Returns:
+            Response object
+        """
+        key = cache.key(prepared.method, prepared.url, prepared.params, self._auth_token)
+        entry, fresh = cache.lookup(key)
+        if entry is not None and fresh:
+            return entry.to_response()
+
+        headers = prepared.headers
+        if entry is not None and entry.validators:
+            headers = {**headers, **entry.validators}
+
+        response = self._transmit(prepared, headers)
+        if entry is not None and response.status_code == 304:
+            cache.revalidated(key, entry)
+            return entry.to_response()
+        cache.store(key, response)
+        return response
+
+    def _transmit(
+        self,
+        prepared: PreparedRequest,
+        headers: Dict[str, str],
+        stream: bool = False
+    ) -> Response:
+        """Put a prepared request on the wire, retrying on transport failures.
+
+        Args:
+            prepared: Request built by ``prepare``
+            headers: Headers to send with the request
+            stream: Whether to defer downloading the response body
 
+        Returns:
+            Response object
+
+        Raises:
+            APIError: If request fails after retries
+            SchemaValidationError: If the response does not match its schema
+        """
+        retries = prepared.retries
+        breaker = self.circuit_breaker
         for attempt in range(retries):
+            if breaker is not None:
+                self._check_circuit(prepared.url)
             try:
-                response = self.session.request(
-                    method=method,
-                    url=url,
-                    headers=request_headers,
-                    params=params,
-                    data=processed_data,
-                    timeout=timeout or self.timeout,
-                    verify=self.verify_ssl
-                )
-                return self._handle_response(response)
+                response = self._dispatch(prepared, headers, stream)
             except requests.RequestException as e:
+                if breaker is not None:
+                    breaker.record_failure(prepared.url)
                 if attempt < retries - 1:  # If not the last attempt, log and retry
                     continue
                 raise APIError(
@@ -156,6 +445,116 @@ class APIClient:
                     response=getattr(e.response, 'text', None)
                 ) from e
 
+            if breaker is not None:
+                if response.status_code >= 500:
+                    breaker.record_failure(prepared.url)
+                else:
+                    breaker.record_success(prepared.url)
+            if (
+                response.status_code == 429
+                and self.rate_limiter is not None
+                and attempt < retries - 1
+            ):  # The limiter has already slowed down, so retry at the new pace
+                response.close()
+                continue
+            if self.schemas is not None and not stream:
+                self.schemas.validate(
+                    prepared.method, prepared.url[len(self.base_url):], response.status_code, response.content
+                )
+            return self._handle_response(response)
+
+    def _check_circuit(self, url: str) -> None:
+        """Fail fast if the circuit for a URL is open, probing it once its cool-down ends.
+
+        Args:
+            url: URL of the request about to be sent
+
+        Raises:
+            CircuitOpenError: If the circuit is open or the probe fails
+        """
+        circuits = self.circuit_breaker.before_call(url)
+        if not circuits:
+            return
+        healthy = self._probe_health()
+        self.circuit_breaker.probe_result(circuits, healthy)
+        if not healthy:
+            raise CircuitOpenError(
+                message=f"Health probe failed; circuit for {circuits[0].name} re-opened",
+                status_code=None
+            )
+
+    def _probe_health(self) -> bool:
+        """Send a single health check that bypasses the circuit breaker.
+
+        Returns:
+            Whether the target answered without a server error
+        """
+        probe = self.prepare(method="GET", endpoint="/health-check", retries=1)
+        try:
+            response = self._dispatch(probe, probe.headers)
+        except requests.RequestException:
+            return False
+        response.close()
+        return response.status_code < 500
+
+    def _dispatch(
+        self,
+        prepared: PreparedRequest,
+        headers: Dict[str, str],
+        stream: bool = False
+    ) -> Response:
+        """Send a single attempt through the session, honouring the rate limiter.
+
+        Args:
+            prepared: Request built by ``prepare``
+            headers: Headers to send with the request
+            stream: Whether to defer downloading the response body
+
+        Returns:
+            Response object
+        """
+        if self.rate_limiter is None:
+            started = time.perf_counter()
+            response = self._session_request(prepared, headers, stream)
+        else:
+            with self.rate_limiter.slot(prepared.url):
+                started = time.perf_counter()
+                try:
+                    response = self._session_request(prepared, headers, stream)
+                except requests.RequestException:
+                    self.rate_limiter.record(prepared.url, None, time.perf_counter() - started)
+                    raise
+            self.rate_limiter.record(prepared.url, response.status_code, time.perf_counter() - started)
+        if self.latency_histogram is not None:
+            self.latency_histogram.record(
+                prepared.method, prepared.url[len(self.base_url):], time.perf_counter() - started
+            )
+
+        if logger.isEnabledFor(logging.DEBUG):
+            logger.debug(
+                "%s %s -> %s in %.1f ms", prepared.method, prepared.url,
+                response.status_code, response.elapsed.total_seconds() * 1000
+            )
+        return response
+
+    def _session_request(
+        self,
+        prepared: PreparedRequest,
+        headers: Dict[str, str],
+        stream: bool = False
+    ) -> Response:
+        """Hand a single attempt to the underlying session."""
+        return self.session.request(
+            method=prepared.method,
+            url=prepared.url,
+            headers=headers,
+            params=prepared.params,
+            data=prepared.body,
+            timeout=prepared.timeout or self.timeout,
+            verify=self.verify_ssl,
+            stream=stream
+        )
+
     def login(self, email: str, password: str) -> Dict[str, Any]:
         """Authenticate user and store token.
         
@@ -181,12 +580,18 @@ class APIClient:
             self._auth_token = data["data"]["token"]
         return data
 
-    def health_check(self, headers: Optional[Dict[str, str]] = None, timeout: Optional[float] = None) -> Response:
+    def health_check(
+        self,
+        headers: Optional[Dict[str, str]] = None,
+        timeout: Optional[float] = None,
+        hedge: bool = True
+    ) -> Response:
         """Check API health status.
         
         Args:
             headers (Optional[Dict[str, str]]): Optional headers to include in the request.
             timeout (Optional[float]): Optional timeout for the request in seconds.
+            hedge (bool): Whether to hedge the request if the client has a hedging policy.
         
         Returns:
             Response: Response object containing health status
@@ -195,12 +600,13 @@ class APIClient:
             APIError: If health check fails
         """
         # Pass the headers and timeout to the request method
-        return self.request(method="GET", endpoint="/health-check", headers=headers, timeout=timeout)
+        return self.get(endpoint="/health-check", headers=headers, timeout=timeout, hedge=hedge)
 
     def get(
         self,
         endpoint: str,
         params: Optional[Dict[str, Any]] = None,
+        hedge: bool = True,
         **kwargs: Any
     ) -> Response:
         """Send GET request.
@@ -208,12 +614,18 @@ class APIClient:
         Args:
             endpoint: API endpoint
             params: Query parameters
+            hedge: Whether to hedge the request if the client has a hedging policy
             **kwargs: Additional request parameters
             
         Returns:
             Response object
         """
-        return self.request(method="GET", endpoint=endpoint, params=params, **kwargs)
+        if self.hedging is None or not hedge:
+            return self.request(method="GET", endpoint=endpoint, params=params, **kwargs)
+        return self.hedging.execute(
+            endpoint_name("GET", endpoint),
+            lambda: self.request(method="GET", endpoint=endpoint, params=params, **kwargs)
+        )
 
     def post(
         self,
@@ -0,0 +1,197 @@
+"""Circuit breaker that makes APIClient fail fast while the target is down."""
+from typing import Dict, List, Optional, Tuple
+import hashlib
+import os
+import threading
+import time
+
+from .endpoints import endpoint_key
+from .exceptions import CircuitOpenError
+from .shared_state import Record, SharedRecord
+
+CLOSED = 0.0
+OPEN = 1.0
+HALF_OPEN = 2.0
+
+_STATE_NAMES = {CLOSED: "closed", OPEN: "open", HALF_OPEN: "half-open"}
+
+_registry: Dict[str, "CircuitBreaker"] = {}
+_registry_lock = threading.Lock()
+
+
+class Circuit:
+    """One closed/open/half-open state machine.
+
+    The record holds (state, consecutive failures, time of last transition).
+    """
+
+    def __init__(self, name: str, state_file: Optional[str] = None) -> None:
+        self.name = name
+        self._record = SharedRecord((CLOSED, 0, 0), state_file)
+
+    @property
+    def state(self) -> str:
+        """Get the state name: closed, open or half-open."""
+        return _STATE_NAMES[self._record.read()[0]]
+
+
+class CircuitBreaker:
+    """Per-host and per-endpoint circuit breaker.
+
+    After ``failure_threshold`` consecutive failures a circuit opens and calls
+    are rejected with ``CircuitOpenError`` for ``reset_timeout`` seconds. The
+    first call after that asks for a probe (APIClient sends a health check);
+    if the probe succeeds the circuit goes half-open and admits a single trial
+    request, whose outcome closes or re-opens it.
+
+    Endpoint paths are normalised so ``/notes/1`` and ``/notes/2`` share a
+    circuit. With ``state_dir`` set, circuits are shared between processes.
+    """
+
+    def __init__(
+        self,
+        failure_threshold: int = 5,
+        reset_timeout: float = 30.0,
+        per_endpoint: bool = True,
+        state_dir: Optional[str] = None
+    ) -> None:
+        """Initialize the circuit breaker.
+
+        Args:
+            failure_threshold: Consecutive failures that open a circuit
+            reset_timeout: Seconds an open circuit rejects calls before probing
+            per_endpoint: Whether to track endpoints separately from their host
+            state_dir: Optional directory used to share state between processes
+        """
+        self.failure_threshold = failure_threshold
+        self.reset_timeout = reset_timeout
+        self.per_endpoint = per_endpoint
+        self.state_dir = state_dir
+        self._circuits: Dict[str, Circuit] = {}
+        self._lock = threading.Lock()
+        if state_dir:
+            os.makedirs(state_dir, exist_ok=True)
+
+    @classmethod
+    def shared(cls, name: str = "default", **options: object) -> "CircuitBreaker":
+        """Get the process-wide breaker registered under ``name``, creating it if needed.
+
+        Args:
+            name: Registry name
+            **options: Constructor arguments, used only on first creation
+
+        Returns:
+            The shared CircuitBreaker
+        """
+        with _registry_lock:
+            breaker = _registry.get(name)
+            if breaker is None:
+                breaker = _registry[name] = cls(**options)
+            return breaker
+
+    def circuits_for(self, url: str) -> List[Circuit]:
+        """Get the circuits guarding a URL, host first."""
+        host, endpoint = endpoint_key(url)
+        names = [host, endpoint] if self.per_endpoint else [host]
+        return [self._circuit(name) for name in names]
+
+    def _circuit(self, name: str) -> Circuit:
+        with self._lock:
+            circuit = self._circuits.get(name)
+            if circuit is None:
+                state_file = None
+                if self.state_dir:
+                    digest = hashlib.sha256(name.encode()).hexdigest()[:16]
+                    state_file = os.path.join(self.state_dir, f"circuit-{digest}.state")
+                circuit = self._circuits[name] = Circuit(name, state_file)
+            return circuit
+
+    def before_call(self, url: str) -> List[Circuit]:
+        """Check whether a call may proceed.
+
+        Args:
+            url: URL of the request about to be sent
+
+        Returns:
+            Circuits whose cool-down just expired and that need a probe
+
+        Raises:
+            CircuitOpenError: If a circuit is open, or half-open with a trial in flight
+        """
+        now = time.time()
+        circuits = self.circuits_for(url)
+        # Check every circuit before claiming any probe, so that a later open
+        # circuit cannot leave an earlier one claimed by a call that never runs
+        for circuit in circuits:
+            state, _, changed_at = circuit._record.read()
+            if state != CLOSED and now - changed_at < self.reset_timeout:
+                raise self._open_error(circuit, state)
+
+        claimed = []
+        try:
+            for circuit in circuits:
+                with circuit._record.locked() as record:
+                    state, failures, changed_at = record[0]
+                    if state == CLOSED:
+                        continue
+                    if now - changed_at < self.reset_timeout:  # claimed by another caller since the check
+                        raise self._open_error(circuit, state)
+                    # Claim the probe so concurrent callers keep failing fast meanwhile
+                    claimed.append((circuit, record[0]))
+                    record[0] = (state, failures, now)
+        except Exception:
+            self._release(claimed, now)
+            raise
+        return [circuit for circuit, _ in claimed]
+
+    @staticmethod
+    def _open_error(circuit: Circuit, state: float) -> CircuitOpenError:
+        return CircuitOpenError(
+            message=f"Circuit for {circuit.name} is {_STATE_NAMES[state]}; failing fast",
+            status_code=None
+        )
+
+    @staticmethod
+    def _release(claimed: List[Tuple[Circuit, Record]], claimed_at: float) -> None:
+        """Give back probe claims, unless the circuit has changed since."""
+        for circuit, previous in claimed:
+            with circuit._record.locked() as record:
+                state, _, changed_at = record[0]
+                if state == previous[0] and changed_at == claimed_at:
+                    record[0] = previous
+
+    def probe_result(self, circuits: List[Circuit], healthy: bool) -> None:
+        """Apply the outcome of a health probe.
+
+        Healthy circuits go half-open and admit one trial request; unhealthy
+        ones are re-opened for another cool-down.
+
+        Args:
+            circuits: Circuits returned by ``before_call``
+            healthy: Whether the probe succeeded
+        """
+        now = time.time()
+        for circuit in circuits:
+            with circuit._record.locked() as record:
+                _, failures, _ = record[0]
+                # A half-open circuit rejects everyone except the trial for one cool-down
+                record[0] = (HALF_OPEN if healthy else OPEN, failures, now)
+
+    def record_success(self, url: str) -> None:
+        """Close the circuits of a URL after a successful call."""
+        for circuit in self.circuits_for(url):
+            with circuit._record.locked() as record:
+                if record[0][:2] != (CLOSED, 0):
+                    record[0] = (CLOSED, 0, time.time())
+
+    def record_failure(self, url: str) -> None:
+        """Count a failed call, opening circuits that reach the threshold."""
+        now = time.time()
+        for circuit in self.circuits_for(url):
+            with circuit._record.locked() as record:
+                state, failures, changed_at = record[0]
+                failures += 1
+                if state == HALF_OPEN or failures >= self.failure_threshold:
+                    record[0] = (OPEN, failures, now)
+                else:
+                    record[0] = (state, failures, changed_at)
@@ -44,7 +44,8 @@ class SubprocessExecutor(CommandExecutor):
         if not command or not isinstance(command, list):
             raise ValueError("Command must be a non-empty list of strings")
             
-        self.logger.debug(f"Executing command: {' '.join(command)}")
+        if self.logger.isEnabledFor(logging.DEBUG):
+            self.logger.debug("Executing command: %s", " ".join(command))
         
         try:
             result = subprocess.run(
@@ -65,12 +66,12 @@ class SubprocessExecutor(CommandExecutor):
             )
             
             if not cmd_result.success:
-                self.logger.warning(f"Command returned non-zero exit code: {result.returncode}")
+                self.logger.warning("Command returned non-zero exit code: %s", result.returncode)
             
             return cmd_result
             
         except subprocess.TimeoutExpired as e:
-            self.logger.error(f"Command timed out: {str(e)}")
+            self.logger.error("Command timed out: %s", e)
             return CommandResult(
                 stdout=e.stdout or "",
                 stderr=e.stderr or "",
@@ -78,7 +79,7 @@ class SubprocessExecutor(CommandExecutor):
                 success=False
             )
         except Exception as e:
-            self.logger.error(f"Command execution failed: {str(e)}")
+            self.logger.error("Command execution failed: %s", e)
             raise CommandExecutionError(f"Failed to execute command: {str(e)}")
 
 class CommandExecutionError(Exception):
@@ -0,0 +1,35 @@
+"""Endpoint naming shared by the circuit breaker, latency histograms and schema lookup.
+
+Path segments that look like resource IDs (numbers, hex object IDs, UUIDs)
+are replaced by ``:id`` so that every request to one endpoint gets the
+same name, whichever resource it addressed.
+"""
+from typing import Tuple
+from urllib.parse import urlsplit
+import re
+
+ID_SEGMENT = re.compile(r"^(?:\d+|[0-9a-fA-F]{8,}|[0-9a-fA-F-]{36})$")
+
+
+def normalize_path(path: str) -> str:
+    """Replace the ID segments of a URL path with ``:id`` and drop any trailing slash."""
+    return "/".join(":id" if ID_SEGMENT.match(segment) else segment for segment in path.split("/")).rstrip("/")
+
+
+def endpoint_key(url: str) -> Tuple[str, str]:
+    """Get the host and the host-qualified normalised endpoint of a URL."""
+    parts = urlsplit(url)
+    return parts.netloc, parts.netloc + normalize_path(parts.path)
+
+
+def endpoint_name(method: str, path: str) -> str:
+    """Get the name of an endpoint, e.g. ``"GET /notes/:id"``.
+
+    Args:
+        method: HTTP method
+        path: Request path relative to the API base URL; a query string is ignored
+
+    Returns:
+        Upper-case method and normalised path
+    """
+    return f"{method.upper()} {normalize_path(urlsplit(path).path) or '/'}"
@@ -9,4 +9,26 @@ class APIError(AutomationError):
     def __init__(self, message: str, status_code: int | None = None, response: str | None = None):
         self.status_code = status_code
         self.response = response
-        super().__init__(message) 
\ No newline at end of file
+        super().__init__(message) 
+
+class ResponseTooLargeError(APIError):
+    """Raised when a streamed response exceeds the configured size limit."""
+    pass
+
+class CircuitOpenError(APIError):
+    """Raised without contacting the target while its circuit breaker is open."""
+    pass
+
+class SchemaValidationError(APIError):
+    """Raised when a response body does not match its endpoint's JSON Schema."""
+    def __init__(
+        self,
+        message: str,
+        endpoint: str,
+        status_code: int | None = None,
+        path: str | None = None,
+        response: str | None = None
+    ):
+        self.endpoint = endpoint
+        self.path = path
+        super().__init__(message, status_code=status_code, response=response)
@@ -0,0 +1,176 @@
+"""Hedged requests for idempotent reads to cut tail latency."""
+from collections import deque
+from concurrent.futures import FIRST_COMPLETED, Future, ThreadPoolExecutor, wait
+from dataclasses import dataclass
+from typing import Callable, Deque, Dict
+import contextvars
+import threading
+import time
+
+from requests import Response
+
+
+@dataclass
+class HedgeStats:
+    """Counters describing hedging activity.
+
+    Attributes:
+        requests: Hedge-eligible requests sent
+        hedges: Duplicate requests sent because the primary was slow
+        wins: Hedges that answered before their primary
+        skipped: Hedges not sent because the budget was exhausted
+    """
+    requests: int = 0
+    hedges: int = 0
+    wins: int = 0
+    skipped: int = 0
+
+    @property
+    def hedge_rate(self) -> float:
+        """Get the fraction of requests that were hedged."""
+        return self.hedges / self.requests if self.requests else 0.0
+
+    def summary(self) -> str:
+        """Get a one-line human readable summary."""
+        return (
+            f"Hedged {self.hedges}/{self.requests} requests ({self.hedge_rate:.1%}), "
+            f"hedge wins: {self.wins}, skipped by budget: {self.skipped}"
+        )
+
+
+class HedgePolicy:
+    """Sends a duplicate request when the first is slower than usual.
+
+    The hedge delay is the configured percentile of recently observed
+    latencies for the same endpoint, clamped to ``[min_delay, max_delay]``.
+    At most ``budget`` of all requests (plus a small burst allowance) may be
+    hedged. The slower of the two requests is abandoned; its response is
+    closed as soon as it arrives so the connection goes back to the pool.
+    """
+
+    def __init__(
+        self,
+        percentile: float = 95.0,
+        initial_delay: float = 0.5,
+        min_delay: float = 0.02,
+        max_delay: float = 2.0,
+        budget: float = 0.1,
+        burst: int = 5,
+        window: int = 200,
+        max_workers: int = 16
+    ) -> None:
+        """Initialize the hedge policy.
+
+        Args:
+            percentile: Latency percentile after which a hedge is sent
+            initial_delay: Delay used until an endpoint has enough samples
+            min_delay: Lower bound for the hedge delay in seconds
+            max_delay: Upper bound for the hedge delay in seconds
+            budget: Maximum fraction of requests that may be hedged
+            burst: Hedges allowed beyond the budget before any requests are seen
+            window: Number of recent latencies kept per endpoint
+            max_workers: Threads available for in-flight requests
+        """
+        self.percentile = percentile
+        self.initial_delay = initial_delay
+        self.min_delay = min_delay
+        self.max_delay = max_delay
+        self.budget = budget
+        self.burst = burst
+        self.window = window
+        self.stats = HedgeStats()
+        self._latencies: Dict[str, Deque[float]] = {}
+        self._lock = threading.Lock()
+        self._executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="hedge")
+
+    def delay_for(self, key: str) -> float:
+        """Get the current hedge delay for an endpoint.
+
+        Args:
+            key: Endpoint identifier
+
+        Returns:
+            Seconds to wait for the primary before hedging
+        """
+        with self._lock:
+            samples = sorted(self._latencies.get(key, ()))
+        if len(samples) < 20:
+            delay = self.initial_delay
+        else:
+            index = min(len(samples) - 1, int(len(samples) * self.percentile / 100))
+            delay = samples[index]
+        return min(self.max_delay, max(self.min_delay, delay))
+
+    def _observe(self, key: str, latency: float) -> None:
+        with self._lock:
+            samples = self._latencies.get(key)
+            if samples is None:
+                samples = self._latencies[key] = deque(maxlen=self.window)
+            samples.append(latency)
+
+    def _take_budget(self) -> bool:
+        with self._lock:
+            if self.stats.hedges < self.stats.requests * self.budget + self.burst:
+                self.stats.hedges += 1
+                return True
+            self.stats.skipped += 1
+            return False
+
+    def _timed(self, key: str, send: Callable[[], Response]) -> Response:
+        started = time.perf_counter()
+        response = send()
+        self._observe(key, time.perf_counter() - started)
+        return response
+
+    def _submit(self, key: str, send: Callable[[], Response]) -> Future:
+        # Each attempt runs in its own copy of the caller's context, so the
+        # test and request correlation ids stay attached to its log records
+        return self._executor.submit(contextvars.copy_context().run, self._timed, key, send)
+
+    def execute(self, key: str, send: Callable[[], Response]) -> Response:
+        """Run ``send``, hedging it with a second call if it is slow.
+
+        Args:
+            key: Endpoint name used for latency tracking, e.g. ``"GET /notes/:id"``
+            send: Callable performing one complete request
+
+        Returns:
+            The first successful response
+
+        Raises:
+            Exception: Whatever ``send`` raised, if every attempt failed
+        """
+        with self._lock:
+            self.stats.requests += 1
+        primary = self._submit(key, send)
+        done, _ = wait([primary], timeout=self.delay_for(key))
+        if done or not self._take_budget():
+            return primary.result()
+
+        hedge = self._submit(key, send)
+        pending = {primary, hedge}
+        first_error = None
+        while pending:
+            done, pending = wait(pending, return_when=FIRST_COMPLETED)
+            for future in done:
+                if future.exception() is not None:
+                    first_error = first_error or future.exception()
+                    continue
+                for loser in (pending | done) - {future}:
+                    if not loser.cancel():
+                        loser.add_done_callback(_discard)
+                if future is hedge:
+                    with self._lock:
+                        self.stats.wins += 1
+                return future.result()
+        raise first_error
+
+    def close(self) -> None:
+        """Stop the worker threads once in-flight requests finish."""
+        self._executor.shutdown(wait=False)
+
+
+def _discard(future: Future) -> None:
+    """Release the connection held by an abandoned request."""
+    if not future.cancelled() and future.exception() is None:
+        future.result().close()
@@ -0,0 +1,79 @@
+"""Latency histograms: the bucket scheme shared by every recorder, and per-endpoint histograms for APIClient."""
+from typing import Dict, Optional
+import math
+import threading
+
+from .endpoints import endpoint_name
+
+Buckets = Dict[int, int]
+
+
+def bucket_ms(seconds: float) -> int:
+    """Get the histogram bucket for a latency: the next power of two in milliseconds.
+
+    APIClient histograms, shard result files and Locust results all use these
+    buckets, so their histograms can be compared and merged.
+    """
+    milliseconds = seconds * 1000
+    return 2 ** max(0, math.ceil(math.log2(milliseconds))) if milliseconds > 1 else 1
+
+
+def percentile(buckets: Buckets, q: float) -> Optional[float]:
+    """Estimate a percentile from a histogram as the upper bound of its bucket.
+
+    Args:
+        buckets: Mapping of bucket upper bound in ms to count
+        q: Percentile between 0 and 100
+
+    Returns:
+        Upper bound in ms of the bucket holding the percentile, or None if empty
+    """
+    total = sum(buckets.values())
+    if not total:
+        return None
+    rank = total * q / 100
+    seen = 0
+    for bound in sorted(buckets):
+        seen += buckets[bound]
+        if seen >= rank:
+            return float(bound)
+    return float(max(buckets))
+
+
+class LatencyHistogram:
+    """Thread-safe latency histograms keyed by endpoint name (``"GET /notes/:id"``).
+
+    Requests are named by ``core.endpoints.endpoint_name``, from the path
+    relative to the API base URL, so that pytest and Locust results for one
+    endpoint share a key, whichever resource was requested.
+    """
+
+    def __init__(self) -> None:
+        self._endpoints: Dict[str, Buckets] = {}
+        self._lock = threading.Lock()
+
+    def record(self, method: str, path: str, seconds: float) -> None:
+        """Count one request's latency.
+
+        Args:
+            method: HTTP method
+            path: Request path relative to the API base URL
+            seconds: Round-trip time
+        """
+        key, bucket = endpoint_name(method, path), bucket_ms(seconds)
+        with self._lock:
+            buckets = self._endpoints.setdefault(key, {})
+            buckets[bucket] = buckets.get(bucket, 0) + 1
+
+    def merge(self, endpoints: Dict[str, Buckets]) -> None:
+        """Add another histogram's counts, e.g. from an xdist worker."""
+        with self._lock:
+            for key, other in endpoints.items():
+                buckets = self._endpoints.setdefault(key, {})
+                for bucket, count in other.items():
+                    buckets[int(bucket)] = buckets.get(int(bucket), 0) + count
+
+    def snapshot(self) -> Dict[str, Buckets]:
+        """Get a copy of all histograms."""
+        with self._lock:
+            return {key: dict(buckets) for key, buckets in self._endpoints.items()}
@@ -0,0 +1,255 @@
+"""Client-side rate limiting and concurrency control for APIClient."""
+from contextlib import contextmanager
+from dataclasses import dataclass
+from typing import Callable, Dict, Iterator, List, Optional
+from urllib.parse import urlsplit
+import hashlib
+import os
+import threading
+import time
+
+from .shared_state import SharedRecord, fcntl
+
+
+@dataclass(frozen=True)
+class RateLimit:
+    """Token bucket settings.
+
+    Attributes:
+        rate: Sustained requests per second
+        burst: Number of requests that may be sent back to back
+    """
+    rate: float
+    burst: int = 1
+
+
+class TokenBucket:
+    """Token bucket whose state may be shared between processes.
+
+    With ``state_file`` set, the bucket state lives in a small file guarded by
+    ``flock`` so every xdist or locust worker draws from the same budget.
+    Callers that find the bucket empty reserve a token and sleep outside the
+    lock, so waiting callers are served in order without polling.
+    """
+
+    def __init__(self, limit: RateLimit, state_file: Optional[str] = None) -> None:
+        """Initialize the bucket.
+
+        Args:
+            limit: Rate ceiling and burst size
+            state_file: Optional file used to share state between processes
+        """
+        self.limit = limit
+        self.state_file = state_file
+        self._state = SharedRecord((limit.burst, time.time(), limit.rate), state_file)
+
+    @property
+    def rate(self) -> float:
+        """Get the current refill rate in requests per second."""
+        return self._state.read()[2]
+
+    def reserve(self) -> float:
+        """Take one token, returning how long the caller must wait before sending.
+
+        Returns:
+            Delay in seconds (0 if a token was immediately available)
+        """
+        with self._state.locked() as state:
+            tokens, updated_at, rate = state[0]
+            now = time.time()
+            tokens = min(float(self.limit.burst), tokens + max(0.0, now - updated_at) * rate)
+            tokens -= 1.0
+            state[0] = (tokens, now, rate)
+        return 0.0 if tokens >= 0 else -tokens / rate
+
+    def acquire(self) -> None:
+        """Block until the caller may send one request."""
+        delay = self.reserve()
+        if delay > 0:
+            time.sleep(delay)
+
+    def update_rate(self, update: Callable[[float], float]) -> float:
+        """Atomically replace the refill rate, keeping the current token balance.
+
+        Args:
+            update: Function mapping the current rate to the new one
+
+        Returns:
+            The new rate in requests per second
+        """
+        with self._state.locked() as state:
+            tokens, updated_at, rate = state[0]
+            rate = update(rate)
+            state[0] = (tokens, updated_at, rate)
+        return rate
+
+
+class ConcurrencyGovernor:
+    """Caps the number of requests in flight, optionally across processes.
+
+    Cross-process slots are files in ``state_dir`` held with a non-blocking
+    ``flock``; the kernel releases them if a worker dies mid-request.
+    """
+
+    def __init__(
+        self,
+        max_in_flight: int,
+        state_dir: Optional[str] = None,
+        poll_interval: float = 0.005
+    ) -> None:
+        """Initialize the governor.
+
+        Args:
+            max_in_flight: Maximum concurrent requests
+            state_dir: Optional directory for cross-process slot files
+            poll_interval: Seconds to wait between attempts when all slots are taken
+        """
+        if state_dir and fcntl is None:
+            raise RuntimeError("Shared concurrency limits require fcntl (POSIX only)")
+        self.max_in_flight = max_in_flight
+        self.state_dir = state_dir
+        self.poll_interval = poll_interval
+        self._semaphore = threading.BoundedSemaphore(max_in_flight)
+        if state_dir:
+            os.makedirs(state_dir, exist_ok=True)
+
+    @contextmanager
+    def slot(self) -> Iterator[None]:
+        """Hold one in-flight slot for the duration of the block."""
+        with self._semaphore:
+            if not self.state_dir:
+                yield
+                return
+            fd = self._claim_shared_slot()
+            try:
+                yield
+            finally:
+                fcntl.flock(fd, fcntl.LOCK_UN)
+                os.close(fd)
+
+    def _claim_shared_slot(self) -> int:
+        while True:
+            for index in range(self.max_in_flight):
+                path = os.path.join(self.state_dir, f"slot-{index}.lock")
+                fd = os.open(path, os.O_RDWR | os.O_CREAT, 0o644)
+                try:
+                    fcntl.flock(fd, fcntl.LOCK_EX | fcntl.LOCK_NB)
+                    return fd
+                except BlockingIOError:
+                    os.close(fd)
+            time.sleep(self.poll_interval)
+
+
+class RateLimiter:
+    """Per-host and per-endpoint-group rate limiter with optional AIMD adaptation.
+
+    Every host gets its own bucket built from ``host_limit``; requests whose
+    path starts with a key of ``groups`` additionally draw from that group's
+    bucket on the same host. In adaptive mode a 429, a transport failure or
+    timeout, or a response slower than ``latency_threshold`` multiplies the
+    rate by ``decrease_factor``, and each healthy response adds
+    ``increase_step`` back, up to the configured limit.
+    """
+
+    def __init__(
+        self,
+        host_limit: Optional[RateLimit] = None,
+        groups: Optional[Dict[str, RateLimit]] = None,
+        state_dir: Optional[str] = None,
+        adaptive: bool = False,
+        latency_threshold: Optional[float] = None,
+        decrease_factor: float = 0.5,
+        increase_step: float = 0.1,
+        min_rate: float = 0.1,
+        max_in_flight: Optional[int] = None
+    ) -> None:
+        """Initialize the rate limiter.
+
+        Args:
+            host_limit: Limit applied to each host
+            groups: Limits for endpoint groups, keyed by URL path prefix
+                (e.g. ``/notes/api/notes``)
+            state_dir: Optional directory used to share state between processes
+            adaptive: Whether to adjust rates from observed responses (AIMD)
+            latency_threshold: Response time in seconds treated as overload
+            decrease_factor: Multiplier applied to the rate on overload
+            increase_step: Requests per second added back on each healthy response
+            min_rate: Lower bound for adaptive rates
+            max_in_flight: Optional cap on concurrent requests
+        """
+        self.host_limit = host_limit
+        self.groups = dict(sorted((groups or {}).items(), key=lambda item: -len(item[0])))
+        self.state_dir = state_dir
+        self.adaptive = adaptive
+        self.latency_threshold = latency_threshold
+        self.decrease_factor = decrease_factor
+        self.increase_step = increase_step
+        self.min_rate = min_rate
+        self.governor = (
+            ConcurrencyGovernor(max_in_flight, os.path.join(state_dir, "slots") if state_dir else None)
+            if max_in_flight else None
+        )
+        self._buckets: Dict[str, TokenBucket] = {}
+        self._lock = threading.Lock()
+        if state_dir:
+            os.makedirs(state_dir, exist_ok=True)
+
+    def _buckets_for(self, url: str) -> List[TokenBucket]:
+        parts = urlsplit(url)
+        buckets = []
+        if self.host_limit:
+            buckets.append(self._bucket(parts.netloc, self.host_limit))
+        path = parts.path.rstrip("/")
+        for prefix, limit in self.groups.items():
+            if path == prefix.rstrip("/") or path.startswith(prefix.rstrip("/") + "/"):
+                buckets.append(self._bucket(f"{parts.netloc}{prefix}", limit))
+                break
+        return buckets
+
+    def _bucket(self, name: str, limit: RateLimit) -> TokenBucket:
+        with self._lock:
+            bucket = self._buckets.get(name)
+            if bucket is None:
+                state_file = None
+                if self.state_dir:
+                    digest = hashlib.sha256(name.encode()).hexdigest()[:16]
+                    state_file = os.path.join(self.state_dir, f"bucket-{digest}.state")
+                bucket = self._buckets[name] = TokenBucket(limit, state_file)
+            return bucket
+
+    @contextmanager
+    def slot(self, url: str) -> Iterator[None]:
+        """Wait for the rate budget and an in-flight slot, then hold the slot.
+
+        Args:
+            url: URL of the request about to be sent
+        """
+        delay = max((bucket.reserve() for bucket in self._buckets_for(url)), default=0.0)
+        if delay > 0:
+            time.sleep(delay)
+        if self.governor is None:
+            yield
+            return
+        with self.governor.slot():
+            yield
+
+    def record(self, url: str, status_code: Optional[int], elapsed: float) -> None:
+        """Feed a request outcome back into the adaptive rate.
+
+        Args:
+            url: URL of the completed request
+            status_code: Response status, or None if no response arrived
+            elapsed: Round-trip time in seconds
+        """
+        if not self.adaptive:
+            return
+        # No response at all (connection error, timeout) is the strongest overload signal
+        overloaded = status_code is None or status_code == 429 or (
+            self.latency_threshold is not None and elapsed > self.latency_threshold
+        )
+        for bucket in self._buckets_for(url):
+            if overloaded:
+                bucket.update_rate(lambda rate: max(self.min_rate, rate * self.decrease_factor))
+            else:
+                ceiling = bucket.limit.rate
+                bucket.update_rate(lambda rate: min(ceiling, rate + self.increase_step))
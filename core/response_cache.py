@@ -0,0 +1,293 @@
+"""HTTP response cache for idempotent APIClient reads."""
+from dataclasses import asdict, dataclass, field
+from datetime import timedelta
+from collections import OrderedDict
+from typing import Dict, Optional, Any, Tuple
+from urllib.parse import urlsplit
+import base64
+import hashlib
+import json
+import os
+import shutil
+import tempfile
+import threading
+import time
+
+from requests import Response
+from requests.structures import CaseInsensitiveDict
+
+CACHEABLE_METHODS = frozenset({"GET"})
+INVALIDATING_METHODS = frozenset({"POST", "PUT", "PATCH", "DELETE"})
+
+CacheKey = Tuple[str, str, str, str]
+
+
+@dataclass
+class CacheEntry:
+    """Stored copy of a cacheable response.
+
+    Attributes:
+        path: Resource path the entry belongs to
+        status_code: HTTP status code of the stored response
+        headers: Response headers
+        content: Raw response body
+        url: Final URL of the response
+        encoding: Response encoding, if known
+        reason: HTTP reason phrase
+        elapsed: Round-trip time of the original request in seconds
+        stored_at: Wall clock time the entry was stored
+    """
+    path: str
+    status_code: int
+    headers: Dict[str, str]
+    content: bytes
+    url: str
+    encoding: Optional[str]
+    reason: Optional[str]
+    elapsed: float
+    stored_at: float = field(default_factory=time.time)
+
+    @classmethod
+    def from_response(cls, path: str, response: Response) -> "CacheEntry":
+        """Create an entry from a live response."""
+        return cls(
+            path=path,
+            status_code=response.status_code,
+            headers=dict(response.headers),
+            content=response.content,
+            url=response.url,
+            encoding=response.encoding,
+            reason=response.reason,
+            elapsed=response.elapsed.total_seconds()
+        )
+
+    @property
+    def validators(self) -> Dict[str, str]:
+        """Get conditional request headers for revalidating this entry."""
+        headers = {}
+        etag = self.headers.get("ETag") or self.headers.get("etag")
+        last_modified = self.headers.get("Last-Modified") or self.headers.get("last-modified")
+        if etag:
+            headers["If-None-Match"] = etag
+        if last_modified:
+            headers["If-Modified-Since"] = last_modified
+        return headers
+
+    def to_json(self) -> str:
+        """Serialize the entry for the on-disk cache, with the body base64-encoded."""
+        return json.dumps({**asdict(self), "content": base64.b64encode(self.content).decode("ascii")})
+
+    @classmethod
+    def from_json(cls, data: str) -> "CacheEntry":
+        """Restore an entry written by ``to_json``."""
+        fields = json.loads(data)
+        fields["content"] = base64.b64decode(fields["content"])
+        return cls(**fields)
+
+    def to_response(self) -> Response:
+        """Build a fresh Response object from the stored data."""
+        response = Response()
+        response.status_code = self.status_code
+        response.headers = CaseInsensitiveDict(self.headers)
+        response._content = self.content
+        response._content_consumed = True  # there is no raw stream for close() to release
+        response.url = self.url
+        response.encoding = self.encoding
+        response.reason = self.reason
+        response.elapsed = timedelta(seconds=self.elapsed)
+        return response
+
+
+@dataclass
+class CacheStats:
+    """Counters describing cache effectiveness.
+
+    Attributes:
+        hits: Lookups answered from a fresh entry
+        misses: Lookups that had to go to the server
+        revalidations: Stale entries confirmed by a 304 response
+        invalidations: Entries dropped because of a write to their path
+    """
+    hits: int = 0
+    misses: int = 0
+    revalidations: int = 0
+    invalidations: int = 0
+
+
+class ResponseCache:
+    """In-memory LRU response cache with TTL and optional on-disk backing.
+
+    Keys are partitioned by a hash of the auth token so responses never leak
+    between users. Writes to a resource path invalidate cached reads of that
+    path and of its parent collection.
+    """
+
+    def __init__(
+        self,
+        ttl: float = 60.0,
+        max_entries: int = 256,
+        cache_dir: Optional[str] = None
+    ) -> None:
+        """Initialize the response cache.
+
+        Args:
+            ttl: Seconds an entry is served without revalidation
+            max_entries: Maximum number of entries kept in memory
+            cache_dir: Optional directory used to persist entries across processes
+        """
+        self.ttl = ttl
+        self.max_entries = max_entries
+        self.cache_dir = cache_dir
+        self.stats = CacheStats()
+        self._entries: "OrderedDict[CacheKey, CacheEntry]" = OrderedDict()
+        self._lock = threading.Lock()
+        if cache_dir:
+            os.makedirs(cache_dir, exist_ok=True)
+
+    @staticmethod
+    def _digest(value: str) -> str:
+        return hashlib.sha256(value.encode()).hexdigest()[:32]
+
+    def key(
+        self,
+        method: str,
+        url: str,
+        params: Optional[Dict[str, Any]],
+        auth_token: Optional[str]
+    ) -> CacheKey:
+        """Build the cache key for a request.
+
+        Args:
+            method: HTTP method
+            url: Full request URL
+            params: Query parameters
+            auth_token: Token the request is sent with
+
+        Returns:
+            Hashable cache key
+        """
+        partition = self._digest(auth_token) if auth_token else ""
+        query = repr(sorted((params or {}).items()))
+        return (partition, method.upper(), self._path(url), query)
+
+    @staticmethod
+    def _path(url: str) -> str:
+        return urlsplit(url).path.rstrip("/") or "/"
+
+    def lookup(self, key: CacheKey) -> Tuple[Optional[CacheEntry], bool]:
+        """Find an entry and report whether it is still fresh.
+
+        Args:
+            key: Key built by ``key``
+
+        Returns:
+            Tuple of the entry (or None) and its freshness
+        """
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                self._entries.move_to_end(key)
+        if entry is None:
+            entry = self._load(key)
+            if entry is not None:
+                self._remember(key, entry)
+
+        fresh = entry is not None and time.time() - entry.stored_at < self.ttl
+        with self._lock:
+            if fresh:
+                self.stats.hits += 1
+            else:
+                self.stats.misses += 1
+        return entry, fresh
+
+    def store(self, key: CacheKey, response: Response) -> None:
+        """Store a successful response.
+
+        Responses other than 200, or marked ``no-store``, are ignored.
+
+        Args:
+            key: Key built by ``key``
+            response: Response to store
+        """
+        if response.status_code != 200:
+            return
+        if "no-store" in response.headers.get("Cache-Control", ""):
+            return
+        entry = CacheEntry.from_response(key[2], response)
+        self._remember(key, entry)
+        self._persist(key, entry)
+
+    def revalidated(self, key: CacheKey, entry: CacheEntry) -> None:
+        """Mark a stale entry as confirmed by the server.
+
+        Args:
+            key: Key built by ``key``
+            entry: Entry the server answered 304 for
+        """
+        entry.stored_at = time.time()
+        with self._lock:
+            self.stats.revalidations += 1
+        self._persist(key, entry)
+
+    def invalidate(self, url: str) -> None:
+        """Drop cached reads of a resource and its parent collection.
+
+        Args:
+            url: URL of the resource that was written to
+        """
+        path = self._path(url)
+        paths = {path, path.rsplit("/", 1)[0] or "/"}
+        with self._lock:
+            stale = [key for key in self._entries if key[2] in paths]
+            for key in stale:
+                del self._entries[key]
+            self.stats.invalidations += len(stale)
+        if self.cache_dir:
+            for stale_path in paths:
+                shutil.rmtree(os.path.join(self.cache_dir, self._digest(stale_path)), ignore_errors=True)
+
+    def clear(self) -> None:
+        """Remove every cached entry, in memory and on disk."""
+        with self._lock:
+            self._entries.clear()
+        if self.cache_dir:
+            shutil.rmtree(self.cache_dir, ignore_errors=True)
+            os.makedirs(self.cache_dir, exist_ok=True)
+
+    def _remember(self, key: CacheKey, entry: CacheEntry) -> None:
+        with self._lock:
+            self._entries[key] = entry
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def _file_for(self, key: CacheKey) -> str:
+        return os.path.join(self.cache_dir, self._digest(key[2]), self._digest(repr(key)) + ".json")
+
+    def _load(self, key: CacheKey) -> Optional[CacheEntry]:
+        if not self.cache_dir:
+            return None
+        # Entries are plain JSON so that a shared cache directory can never execute code on load
+        try:
+            with open(self._file_for(key), encoding="utf-8") as handle:
+                return CacheEntry.from_json(handle.read())
+        except (OSError, ValueError, KeyError, TypeError):
+            return None
+
+    def _persist(self, key: CacheKey, entry: CacheEntry) -> None:
+        if not self.cache_dir:
+            return
+        target = self._file_for(key)
+        directory = os.path.dirname(target)
+        try:
+            os.makedirs(directory, exist_ok=True)
+            fd, tmp_path = tempfile.mkstemp(dir=directory)
+        except OSError:
+            return
+        try:
+            with os.fdopen(fd, "w", encoding="utf-8") as handle:
+                handle.write(entry.to_json())
+            os.replace(tmp_path, target)
+        except OSError:
+            if os.path.exists(tmp_path):
+                os.remove(tmp_path)
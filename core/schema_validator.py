@@ -0,0 +1,431 @@
+"""Precompiled JSON Schema validation of API responses.
+
+Each schema is compiled once, when its ``SchemaRegistry`` is built, into a
+tree of small closures. Validating a response then only costs one JSON
+parse of the raw body plus the checks themselves. The compiler supports
+the keywords the response contracts in ``tests/schemas`` need. Anything
+else is rejected at compile time instead of being silently ignored.
+"""
+from typing import Any, Callable, Dict, Iterable, List, Optional, Tuple
+import json
+import math
+import os
+import re
+import threading
+
+from .endpoints import endpoint_name
+from .exceptions import SchemaValidationError
+
+try:
+    import orjson
+except ImportError:  # orjson is an optional speedup
+    orjson = None
+
+MODES = ("full", "fast")
+DEFAULT_SAMPLE_SIZE = 32
+ENDPOINTS_FILE = "endpoints.json"
+
+# Keywords that only annotate a schema and never affect validation
+ANNOTATIONS = frozenset({
+    "$schema", "$id", "$comment", "$defs", "definitions", "title", "description", "examples", "default", "format",
+})
+KEYWORDS = frozenset({
+    "$ref", "type", "enum", "const", "anyOf", "properties", "required", "additionalProperties",
+    "items", "minItems", "maxItems", "minLength", "maxLength", "pattern", "minimum", "maximum",
+})
+
+_TYPE_CHECKS: Dict[str, Callable[[Any], bool]] = {
+    "object": lambda value: type(value) is dict,
+    "array": lambda value: type(value) is list,
+    "string": lambda value: type(value) is str,
+    "integer": lambda value: type(value) is int,
+    "number": lambda value: type(value) in (int, float),
+    "boolean": lambda value: type(value) is bool,
+    "null": lambda value: value is None,
+}
+_TYPE_NAMES = {dict: "object", list: "array", str: "string", int: "integer", float: "number", bool: "boolean"}
+
+
+class _Failure:
+    """First violation found, with its location collected while unwinding."""
+
+    __slots__ = ("message", "reversed_path")
+
+    def __init__(self, message: str) -> None:
+        self.message = message
+        self.reversed_path: List[Any] = []
+
+    @property
+    def path(self) -> str:
+        return "$" + "".join(
+            f"[{part}]" if isinstance(part, int) else f".{part}" for part in reversed(self.reversed_path)
+        )
+
+
+Check = Callable[[Any], Optional[_Failure]]
+
+
+def _valid(value: Any) -> None:
+    return None
+
+
+def _json_type(value: Any) -> str:
+    return "null" if value is None else _TYPE_NAMES.get(type(value), type(value).__name__)
+
+
+def _sample_indices(length: int, sample_size: int) -> Iterable[int]:
+    """Evenly spaced indices of a long array, always including the first and last item."""
+    step = math.ceil(length / sample_size)
+    indices = list(range(0, length, step))
+    if indices[-1] != length - 1:
+        indices.append(length - 1)
+    return indices
+
+
+class _Compiler:
+    """Compiles schema documents, resolving ``$ref`` between them."""
+
+    def __init__(self, documents: Dict[str, Any], sample_size: Optional[int]) -> None:
+        self.documents = documents
+        self.sample_size = sample_size
+        self._refs: Dict[str, Check] = {}
+
+    def compile_document(self, name: str) -> Check:
+        return self.compile(self.documents[name], name)
+
+    def compile(self, node: Any, document: str) -> Check:
+        if node is True or node == {}:
+            return _valid
+        if node is False:
+            return lambda value: _Failure("no value is allowed here")
+        if not isinstance(node, dict):
+            raise ValueError(f"Invalid schema in {document}: {node!r}")
+        unsupported = set(node) - KEYWORDS - ANNOTATIONS
+        if unsupported:
+            raise ValueError(f"Unsupported JSON Schema keyword(s) in {document}: {', '.join(sorted(unsupported))}")
+
+        checks: List[Check] = []
+        if "$ref" in node:
+            checks.append(self._ref(node["$ref"], document))
+        if "type" in node:
+            checks.append(self._type(node["type"]))
+        if "enum" in node or "const" in node:
+            checks.append(self._enum(node["enum"] if "enum" in node else [node["const"]]))
+        if "anyOf" in node:
+            checks.append(self._any_of([self.compile(option, document) for option in node["anyOf"]]))
+        if {"properties", "required", "additionalProperties"} & set(node):
+            checks.append(self._object(node, document))
+        if {"items", "minItems", "maxItems"} & set(node):
+            checks.append(self._array(node, document))
+        if {"minLength", "maxLength", "pattern"} & set(node):
+            checks.append(self._string(node))
+        if "minimum" in node or "maximum" in node:
+            checks.append(self._number(node))
+
+        if not checks:
+            return _valid
+        if len(checks) == 1:
+            return checks[0]
+
+        def check_all(value: Any) -> Optional[_Failure]:
+            for check in checks:
+                failure = check(value)
+                if failure is not None:
+                    return failure
+            return None
+        return check_all
+
+    def _ref(self, ref: str, document: str) -> Check:
+        name, _, pointer = ref.partition("#")
+        name = name or document
+        key = f"{name}#{pointer}"
+        if key not in self._refs:
+            if name not in self.documents:
+                raise ValueError(f"Unresolvable $ref {ref!r} in {document}")
+            target = self.documents[name]
+            for part in filter(None, pointer.split("/")):
+                target = target[part.replace("~1", "/").replace("~0", "~")]
+            # Registered before compiling so that recursive schemas refer back to this cell
+            compiled: List[Check] = []
+            self._refs[key] = lambda value: compiled[0](value)
+            compiled.append(self.compile(target, name))
+        return self._refs[key]
+
+    @staticmethod
+    def _type(types: Any) -> Check:
+        names = [types] if isinstance(types, str) else list(types)
+        predicates = [_TYPE_CHECKS[name] for name in names]
+        expected = " or ".join(names)
+
+        def check_type(value: Any) -> Optional[_Failure]:
+            for predicate in predicates:
+                if predicate(value):
+                    return None
+            return _Failure(f"expected {expected}, got {_json_type(value)}")
+        return check_type
+
+    @staticmethod
+    def _enum(values: List[Any]) -> Check:
+        # Compared with their types so that True does not match 1
+        allowed = [(type(value), value) for value in values]
+
+        def check_enum(value: Any) -> Optional[_Failure]:
+            if (type(value), value) in allowed:
+                return None
+            return _Failure(f"{value!r} is not one of {values!r}")
+        return check_enum
+
+    @staticmethod
+    def _any_of(options: List[Check]) -> Check:
+        def check_any_of(value: Any) -> Optional[_Failure]:
+            failures = [option(value) for option in options]
+            if any(failure is None for failure in failures):
+                return None
+            return _Failure("matches none of the allowed schemas: " + "; ".join(f.message for f in failures))
+        return check_any_of
+
+    def _object(self, node: Dict[str, Any], document: str) -> Check:
+        required = list(node.get("required", []))
+        properties = [(key, self.compile(schema, document)) for key, schema in node.get("properties", {}).items()]
+        known = frozenset(node.get("properties", {}))
+        extra = node.get("additionalProperties", True)
+        additional = None if extra is True else self.compile(extra, document)
+
+        def check_object(value: Any) -> Optional[_Failure]:
+            if type(value) is not dict:
+                return None
+            for key in required:
+                if key not in value:
+                    return _Failure(f"missing required property {key!r}")
+            for key, check in properties:
+                if key in value:
+                    failure = check(value[key])
+                    if failure is not None:
+                        failure.reversed_path.append(key)
+                        return failure
+            if additional is not None:
+                for key in value.keys() - known:
+                    failure = additional(value[key])
+                    if failure is not None:
+                        if extra is False:
+                            failure.message = f"unexpected property {key!r}"
+                        failure.reversed_path.append(key)
+                        return failure
+            return None
+        return check_object
+
+    def _array(self, node: Dict[str, Any], document: str) -> Check:
+        items = self.compile(node["items"], document) if "items" in node else None
+        min_items, max_items = node.get("minItems"), node.get("maxItems")
+        sample_size = self.sample_size
+
+        def check_array(value: Any) -> Optional[_Failure]:
+            if type(value) is not list:
+                return None
+            if min_items is not None and len(value) < min_items:
+                return _Failure(f"expected at least {min_items} items, got {len(value)}")
+            if max_items is not None and len(value) > max_items:
+                return _Failure(f"expected at most {max_items} items, got {len(value)}")
+            if items is None:
+                return None
+            if sample_size is not None and len(value) > sample_size:
+                indices: Iterable[int] = _sample_indices(len(value), sample_size)
+            else:
+                indices = range(len(value))
+            for index in indices:
+                failure = items(value[index])
+                if failure is not None:
+                    failure.reversed_path.append(index)
+                    return failure
+            return None
+        return check_array
+
+    @staticmethod
+    def _string(node: Dict[str, Any]) -> Check:
+        min_length, max_length = node.get("minLength"), node.get("maxLength")
+        pattern = re.compile(node["pattern"]) if "pattern" in node else None
+
+        def check_string(value: Any) -> Optional[_Failure]:
+            if type(value) is not str:
+                return None
+            if min_length is not None and len(value) < min_length:
+                return _Failure(f"expected at least {min_length} characters, got {len(value)}")
+            if max_length is not None and len(value) > max_length:
+                return _Failure(f"expected at most {max_length} characters, got {len(value)}")
+            if pattern is not None and not pattern.search(value):
+                return _Failure(f"{value!r} does not match {pattern.pattern!r}")
+            return None
+        return check_string
+
+    @staticmethod
+    def _number(node: Dict[str, Any]) -> Check:
+        minimum, maximum = node.get("minimum"), node.get("maximum")
+
+        def check_number(value: Any) -> Optional[_Failure]:
+            if type(value) not in (int, float):
+                return None
+            if minimum is not None and value < minimum:
+                return _Failure(f"{value} is less than the minimum of {minimum}")
+            if maximum is not None and value > maximum:
+                return _Failure(f"{value} is greater than the maximum of {maximum}")
+            return None
+        return check_number
+
+
+def compile_schema(
+    schema: Any,
+    documents: Optional[Dict[str, Any]] = None,
+    sample_size: Optional[int] = None
+) -> Callable[[Any], Optional[Tuple[str, str]]]:
+    """Compile a schema into a reusable validator.
+
+    Args:
+        schema: JSON Schema as parsed JSON
+        documents: Other schemas by file name, for ``$ref`` such as ``note.json#/$defs/note``
+        sample_size: Validate only an evenly spaced sample of this many items of longer arrays
+
+    Returns:
+        Function taking a parsed document and returning None if it is valid,
+        else the JSON path and description of the first violation
+
+    Raises:
+        ValueError: If the schema uses an unsupported keyword or an unresolvable ``$ref``
+    """
+    check = _Compiler({**(documents or {}), "": schema}, sample_size).compile_document("")
+
+    def validate(document: Any) -> Optional[Tuple[str, str]]:
+        failure = check(document)
+        return None if failure is None else (failure.path, failure.message)
+    return validate
+
+
+class SchemaRegistry:
+    """Compiled response validators keyed by endpoint and status code.
+
+    Endpoints are ``"<METHOD> <path>"`` relative to the API base URL, with ID
+    segments written as ``:id`` (e.g. ``"GET /notes/:id"``). Statuses are
+    exact codes or classes such as ``"4XX"``.
+    """
+
+    def __init__(
+        self,
+        endpoints: Dict[str, Dict[str, str]],
+        documents: Dict[str, Any],
+        mode: str = "full",
+        sample_size: int = DEFAULT_SAMPLE_SIZE,
+        strict: bool = False
+    ) -> None:
+        """Compile the schema of every endpoint and status.
+
+        Args:
+            endpoints: Schema file name per status, per endpoint
+            documents: Parsed schemas by file name
+            mode: "full" validates every array item; "fast" validates an evenly
+                spaced sample of ``sample_size`` items of longer arrays, such as
+                large note lists
+            sample_size: Array length above which "fast" mode samples
+            strict: Whether responses without a registered schema are an error
+
+        Raises:
+            ValueError: If the mode is unknown or a schema cannot be compiled
+        """
+        if mode not in MODES:
+            raise ValueError(f"Unknown schema validation mode {mode!r}; expected one of {MODES}")
+        self.mode = mode
+        self.strict = strict
+        compiler = _Compiler(documents, sample_size if mode == "fast" else None)
+        compiled: Dict[str, Check] = {}
+        self._validators: Dict[Tuple[str, str], Check] = {}
+        for endpoint, statuses in endpoints.items():
+            method, _, path = endpoint.partition(" ")
+            for status, name in statuses.items():
+                if name not in documents:
+                    raise ValueError(f"Schema {name!r} for {endpoint} {status} does not exist")
+                if name not in compiled:
+                    compiled[name] = compiler.compile_document(name)
+                self._validators[(f"{method.upper()} {path}", status.upper())] = compiled[name]
+        self._lookups: Dict[Tuple[str, int], Optional[Check]] = {}
+        self._lock = threading.Lock()
+
+    @classmethod
+    def from_directory(cls, directory: str, **kwargs: Any) -> "SchemaRegistry":
+        """Load and compile every schema in a directory.
+
+        The directory holds one JSON Schema per file, plus an ``endpoints.json``
+        mapping each endpoint to a schema file name per status.
+
+        Args:
+            directory: Schema directory
+            **kwargs: Passed to the constructor
+
+        Returns:
+            The compiled registry
+        """
+        documents = {}
+        for name in sorted(os.listdir(directory)):
+            if name.endswith(".json"):
+                with open(os.path.join(directory, name), "rb") as handle:
+                    documents[name] = json.load(handle)
+        endpoints = documents.pop(ENDPOINTS_FILE, {})
+        return cls(endpoints, documents, **kwargs)
+
+    @staticmethod
+    def endpoint(method: str, path: str) -> str:
+        """Get the registry key for a request path relative to the base URL."""
+        return endpoint_name(method, path)
+
+    def validator_for(self, method: str, path: str, status: int) -> Optional[Check]:
+        """Get the compiled validator of a response, if one is registered."""
+        endpoint = self.endpoint(method, path)
+        key = (endpoint, status)
+        try:
+            return self._lookups[key]
+        except KeyError:
+            pass
+        validator = self._validators.get((endpoint, str(status)))
+        if validator is None:
+            validator = self._validators.get((endpoint, f"{status // 100}XX"))
+        with self._lock:
+            self._lookups[key] = validator
+        return validator
+
+    def validate(self, method: str, path: str, status: int, body: bytes) -> None:
+        """Validate a raw response body against its endpoint's schema.
+
+        Args:
+            method: HTTP method of the request
+            path: Request path relative to the API base URL
+            status: Response status code
+            body: Raw response body
+
+        Raises:
+            SchemaValidationError: If the body is not JSON or does not match the
+                schema, or, in strict mode, if no schema is registered
+        """
+        validator = self.validator_for(method, path, status)
+        if validator is None:
+            if self.strict:
+                raise SchemaValidationError(
+                    f"No response schema registered for {self.endpoint(method, path)} {status}",
+                    endpoint=self.endpoint(method, path),
+                    status_code=status,
+                )
+            return
+        try:
+            document = orjson.loads(body) if orjson is not None else json.loads(body)
+        except ValueError as e:
+            raise SchemaValidationError(
+                f"{self.endpoint(method, path)} {status}: response body is not JSON: {e}",
+                endpoint=self.endpoint(method, path),
+                status_code=status,
+                response=body[:200].decode(errors="replace"),
+            ) from e
+        failure = validator(document)
+        if failure is not None:
+            raise SchemaValidationError(
+                f"{self.endpoint(method, path)} {status}: {failure.path}: {failure.message}",
+                endpoint=self.endpoint(method, path),
+                status_code=status,
+                path=failure.path,
+                response=body[:200].decode(errors="replace"),
+            )
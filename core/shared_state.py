@@ -0,0 +1,63 @@
+"""Small fixed-size records shared between threads and, optionally, processes."""
+from contextlib import contextmanager
+from typing import Iterator, List, Optional, Tuple
+import os
+import struct
+import threading
+
+try:
+    import fcntl
+except ImportError:  # fcntl is POSIX only; file-backed records are unavailable elsewhere
+    fcntl = None
+
+Record = Tuple[float, ...]
+
+
+class SharedRecord:
+    """A tuple of floats kept in memory or in a file guarded by ``flock``.
+
+    With ``path`` set, every process opening the same file sees the same
+    record, which lets xdist and locust workers coordinate without a server.
+    """
+
+    def __init__(self, initial: Record, path: Optional[str] = None) -> None:
+        """Initialize the record.
+
+        Args:
+            initial: Value used until the record is first written
+            path: Optional file used to share the record between processes
+        """
+        if path and fcntl is None:
+            raise RuntimeError("Sharing state between processes requires fcntl (POSIX only)")
+        self.path = path
+        self._format = struct.Struct(f"<{len(initial)}d")
+        self._value = tuple(float(item) for item in initial)
+        self._lock = threading.Lock()
+
+    @contextmanager
+    def locked(self) -> Iterator[List[Record]]:
+        """Hold the record lock and yield a one-item list; assigning to it saves the record."""
+        with self._lock:
+            if not self.path:
+                holder = [self._value]
+                yield holder
+                self._value = holder[0]
+                return
+
+            fd = os.open(self.path, os.O_RDWR | os.O_CREAT, 0o644)
+            try:
+                fcntl.flock(fd, fcntl.LOCK_EX)
+                raw = os.pread(fd, self._format.size, 0)
+                stored = len(raw) == self._format.size
+                initial = self._format.unpack(raw) if stored else self._value
+                holder = [initial]
+                yield holder
+                if holder[0] != initial or not stored:
+                    os.pwrite(fd, self._format.pack(*holder[0]), 0)
+            finally:
+                os.close(fd)
+
+    def read(self) -> Record:
+        """Get the current value of the record."""
+        with self.locked() as record:
+            return record[0]
@@ -0,0 +1,230 @@
+"""Streaming access to large API responses without buffering the whole body."""
+from typing import Any, Iterator, Optional
+import codecs
+import json
+
+from requests import Response
+
+from .exceptions import ResponseTooLargeError
+
+try:
+    import ijson
+except ImportError:  # ijson is optional; a built-in array scanner is used instead
+    ijson = None
+
+DEFAULT_CHUNK_SIZE = 64 * 1024
+DEFAULT_MAX_BYTES = 100 * 1024 * 1024
+
+_WHITESPACE = " \t\r\n"
+
+
+class _ChunkReader:
+    """File-like adapter over a chunk iterator, as expected by ijson."""
+
+    def __init__(self, chunks: Iterator[bytes]) -> None:
+        self._chunks = chunks
+        self._buffer = b""
+
+    def read(self, size: int = -1) -> bytes:
+        while size < 0 or len(self._buffer) < size:
+            chunk = next(self._chunks, None)
+            if chunk is None:
+                break
+            self._buffer += chunk
+        if size < 0:
+            size = len(self._buffer)
+        data, self._buffer = self._buffer[:size], self._buffer[size:]
+        return data
+
+
+class StreamingResponse:
+    """A response whose body is consumed incrementally.
+
+    Use as a context manager so the connection is returned to the pool as soon
+    as the caller is done, even if the body was not read to the end.
+    """
+
+    def __init__(
+        self,
+        response: Response,
+        chunk_size: int = DEFAULT_CHUNK_SIZE,
+        max_bytes: Optional[int] = DEFAULT_MAX_BYTES
+    ) -> None:
+        """Initialize the streaming response.
+
+        Args:
+            response: Response opened with ``stream=True``
+            chunk_size: Number of bytes read from the socket at a time
+            max_bytes: Maximum body size before ResponseTooLargeError is raised
+        """
+        self.response = response
+        self.chunk_size = chunk_size
+        self.max_bytes = max_bytes
+        self.bytes_read = 0
+
+    @property
+    def status_code(self) -> int:
+        """Get the HTTP status code."""
+        return self.response.status_code
+
+    @property
+    def headers(self) -> Any:
+        """Get the response headers."""
+        return self.response.headers
+
+    def _too_large(self, size: int) -> ResponseTooLargeError:
+        self.close()
+        return ResponseTooLargeError(
+            message=f"Response body exceeds {self.max_bytes} bytes (read {size})",
+            status_code=self.response.status_code
+        )
+
+    def iter_bytes(self) -> Iterator[bytes]:
+        """Iterate over raw body chunks.
+
+        Raises:
+            ResponseTooLargeError: If the body exceeds ``max_bytes``
+        """
+        declared = self.response.headers.get("Content-Length")
+        if self.max_bytes is not None and declared and declared.isdigit() and int(declared) > self.max_bytes:
+            raise self._too_large(int(declared))
+
+        try:
+            for chunk in self.response.iter_content(chunk_size=self.chunk_size):
+                self.bytes_read += len(chunk)
+                if self.max_bytes is not None and self.bytes_read > self.max_bytes:
+                    raise self._too_large(self.bytes_read)
+                yield chunk
+        finally:
+            self.close()
+
+    def iter_items(self, path: Optional[str] = "data") -> Iterator[Any]:
+        """Iterate over the items of a JSON array as they arrive.
+
+        Args:
+            path: Top-level key holding the array, or None if the body is the array.
+                With ijson installed, any dotted ijson prefix is accepted.
+
+        Raises:
+            ResponseTooLargeError: If the body exceeds ``max_bytes``
+            ValueError: If the body is not the expected JSON shape
+        """
+        if ijson is not None:
+            prefix = f"{path}.item" if path else "item"
+            yield from ijson.items(_ChunkReader(self.iter_bytes()), prefix)
+            return
+        yield from _iter_array_items(self.iter_bytes(), path, self.response.encoding or "utf-8")
+
+    def json(self) -> Any:
+        """Read and decode the whole body, still subject to ``max_bytes``."""
+        return json.loads(b"".join(self.iter_bytes()))
+
+    def close(self) -> None:
+        """Release the connection back to the pool."""
+        self.response.close()
+
+    def __enter__(self) -> "StreamingResponse":
+        return self
+
+    def __exit__(self, *exc_info: Any) -> None:
+        self.close()
+
+
+def _iter_array_items(chunks: Iterator[bytes], key: Optional[str], encoding: str) -> Iterator[Any]:
+    """Decode the items of a JSON array incrementally using the standard library.
+
+    Only a top-level array, or an array stored under a top-level key, is
+    supported; nested paths require ijson.
+    """
+    decoder = json.JSONDecoder()
+    text_decoder = codecs.getincrementaldecoder(encoding)()
+    buffer = ""
+    exhausted = False
+    locator = _ArrayLocator(key)
+
+    def fill() -> bool:
+        nonlocal buffer, exhausted
+        chunk = next(chunks, None)
+        if chunk is None:
+            buffer += text_decoder.decode(b"", final=True)
+            exhausted = True
+            return False
+        buffer += text_decoder.decode(chunk)
+        return True
+
+    while True:
+        start = locator.scan(buffer)
+        if start is not None:
+            buffer = buffer[start:]
+            break
+        if not fill():
+            raise ValueError(f"No JSON array found at {key!r}")
+
+    while True:
+        stripped = buffer.lstrip(_WHITESPACE + ",")
+        buffer = stripped
+        if buffer.startswith("]"):
+            return
+        try:
+            item, end = decoder.raw_decode(buffer)
+        except ValueError:
+            end = None
+        # A value running to the end of the buffer (e.g. a number) may be truncated
+        if end is None or (end == len(buffer) and not exhausted):
+            if not fill():
+                if end is None:
+                    raise ValueError("Truncated JSON array in response body")
+            continue
+        yield item
+        buffer = buffer[end:]
+
+
+class _ArrayLocator:
+    """Finds the opening bracket of the target array across buffer refills."""
+
+    def __init__(self, key: Optional[str]) -> None:
+        self.key = key
+        self.pos = 0
+        self.depth = 0
+        self.in_string = False
+        self.escaped = False
+        self.string_start = 0
+        self.pending: Optional[str] = None
+
+    def scan(self, buffer: str) -> Optional[int]:
+        """Return the index just after the target ``[``, or None if not seen yet."""
+        for index in range(self.pos, len(buffer)):
+            char = buffer[index]
+            if self.in_string:
+                if self.escaped:
+                    self.escaped = False
+                elif char == "\\":
+                    self.escaped = True
+                elif char == '"':
+                    self.in_string = False
+                    if self.depth == 1 and buffer[self.string_start + 1:index] == self.key:
+                        self.pending = "colon"
+                continue
+            if char in _WHITESPACE:
+                continue
+            if self.key is None:
+                if char == "[":
+                    return index + 1
+                raise ValueError("Response body is not a JSON array")
+            if self.pending == "colon":
+                self.pending = "value" if char == ":" else None
+                if self.pending:
+                    continue
+            elif self.pending == "value":
+                self.pending = None
+                if char == "[":
+                    return index + 1
+            if char == '"':
+                self.in_string = True
+                self.string_start = index
+            elif char in "{[":
+                self.depth += 1
+            elif char in "}]":
+                self.depth -= 1
+        self.pos = len(buffer)
+        return None
@@ -0,0 +1,196 @@
+"""Alternative HTTP transports for APIClient.
+
+Every transport exposes the subset of the ``requests.Session`` interface that
+APIClient uses and returns ``requests.Response`` objects, so response handling
+and ``APIError`` semantics are identical whichever backend is selected.
+"""
+from datetime import timedelta
+from typing import Any, AsyncIterator, Awaitable, Dict, Iterator, Optional, Tuple, Union
+import threading
+import time
+
+import requests
+from requests import Response, Session
+from requests.structures import CaseInsensitiveDict
+
+# httpx and asyncio are only needed for the HTTP/2 transport, so they are
+# imported by the first HTTPXSession rather than by every APIClient user.
+asyncio = None
+httpx = None
+
+
+def _import_httpx() -> None:
+    """Import httpx and asyncio into the module namespace.
+
+    Raises:
+        ImportError: If httpx is not installed
+    """
+    global asyncio, httpx
+    if httpx is not None:
+        return
+    try:
+        import httpx as httpx_module
+    except ImportError as e:
+        raise ImportError("The httpx transport requires 'httpx[http2]' to be installed") from e
+    import asyncio as asyncio_module
+    asyncio, httpx = asyncio_module, httpx_module
+
+
+class _HTTPXRaw:
+    """Minimal urllib3-style raw body so ``Response.iter_content`` works on httpx streams."""
+
+    def __init__(self, session: "HTTPXSession", response: "httpx.Response") -> None:
+        self._session = session
+        self._response = response
+
+    def stream(self, chunk_size: int, decode_content: bool = True) -> Iterator[bytes]:
+        chunks = self._response.aiter_bytes(chunk_size)
+        while True:
+            try:
+                more, chunk = self._session._run(_next_chunk(chunks))
+            except httpx.HTTPError as e:
+                raise requests.ConnectionError(str(e)) from e
+            if not more:
+                return
+            yield chunk
+
+    def read(self, size: int = -1) -> bytes:
+        return self._session._run(self._response.aread())
+
+    def close(self) -> None:
+        if not self._response.is_closed:
+            self._session._run(self._response.aclose())
+
+    def release_conn(self) -> None:
+        self.close()
+
+
+async def _next_chunk(chunks: AsyncIterator[bytes]) -> Tuple[bool, bytes]:
+    try:
+        return True, await chunks.__anext__()
+    except StopAsyncIteration:
+        return False, b""
+
+
+class HTTPXSession:
+    """Session backed by an httpx client with HTTP/2 multiplexing.
+
+    Concurrent requests from any number of threads share one connection per
+    host instead of one TCP connection each. The async httpx client runs on a
+    private event loop thread: httpx's synchronous HTTP/2 client can allocate
+    stream IDs out of order when driven from several threads at once.
+    """
+
+    def __init__(self, verify: bool = True, http1: bool = True, http2: bool = True, **client_options: Any) -> None:
+        """Initialize the session.
+
+        Args:
+            verify: Whether to verify SSL certificates (fixed for the client's lifetime)
+            http1: Whether HTTP/1.1 may be negotiated; disable for h2c prior knowledge
+            http2: Whether HTTP/2 may be negotiated
+            **client_options: Extra keyword arguments for ``httpx.AsyncClient``
+        """
+        _import_httpx()
+        self._loop = asyncio.new_event_loop()
+        self._thread = threading.Thread(target=self._loop.run_forever, name="httpx-transport", daemon=True)
+        self._thread.start()
+        self.client = self._run(self._create_client(verify, http1, http2, client_options))
+
+    @staticmethod
+    async def _create_client(verify: bool, http1: bool, http2: bool, options: Dict[str, Any]) -> "httpx.AsyncClient":
+        return httpx.AsyncClient(verify=verify, http1=http1, http2=http2, **options)
+
+    def _run(self, coroutine: Awaitable[Any]) -> Any:
+        return asyncio.run_coroutine_threadsafe(coroutine, self._loop).result()
+
+    def request(
+        self,
+        method: str,
+        url: str,
+        headers: Optional[Dict[str, str]] = None,
+        params: Optional[Dict[str, Any]] = None,
+        data: Optional[Union[str, bytes]] = None,
+        timeout: Optional[float] = None,
+        verify: Optional[bool] = None,
+        stream: bool = False
+    ) -> Response:
+        """Send a request and return it as a ``requests.Response``.
+
+        Args:
+            method: HTTP method
+            url: Full request URL
+            headers: Request headers
+            params: Query parameters
+            data: Encoded request body
+            timeout: Request timeout in seconds
+            verify: Ignored; certificate verification is set on the client
+            stream: Whether to defer downloading the response body
+
+        Returns:
+            Response object
+
+        Raises:
+            requests.RequestException: Mapped from the equivalent httpx error
+        """
+        content = data.encode() if isinstance(data, str) else data
+        try:
+            request = self.client.build_request(
+                method, url, headers=headers, params=params, content=content, timeout=timeout
+            )
+            started = time.perf_counter()
+            response = self._run(self.client.send(request, stream=stream))
+            elapsed = timedelta(seconds=time.perf_counter() - started)
+        except httpx.TimeoutException as e:
+            raise requests.Timeout(str(e)) from e
+        except httpx.TransportError as e:
+            raise requests.ConnectionError(str(e)) from e
+        except httpx.HTTPError as e:
+            raise requests.RequestException(str(e)) from e
+        return self._to_requests_response(response, elapsed, stream)
+
+    def _to_requests_response(self, response: "httpx.Response", elapsed: timedelta, stream: bool) -> Response:
+        converted = Response()
+        converted.status_code = response.status_code
+        converted.headers = CaseInsensitiveDict(response.headers.multi_items())
+        converted.url = str(response.url)
+        converted.reason = response.reason_phrase
+        converted.encoding = response.charset_encoding
+        converted.elapsed = elapsed
+        if stream:
+            converted.raw = _HTTPXRaw(self, response)
+        else:
+            # Marked consumed so that close() does not reach for a raw stream there is none of
+            converted._content = response.content
+            converted._content_consumed = True
+        return converted
+
+    def close(self) -> None:
+        """Close all pooled connections and stop the event loop thread."""
+        if self._loop.is_closed():
+            return
+        self._run(self.client.aclose())
+        self._loop.call_soon_threadsafe(self._loop.stop)
+        self._thread.join()
+        self._loop.close()
+
+
+def create_session(transport: Union[str, Session, HTTPXSession], verify_ssl: bool = True) -> Any:
+    """Create the session object for a transport name.
+
+    Args:
+        transport: ``"requests"``, ``"httpx"``, or a ready-made session object
+        verify_ssl: Whether to verify SSL certificates
+
+    Returns:
+        Session-compatible object
+
+    Raises:
+        ValueError: If the transport name is unknown
+    """
+    if not isinstance(transport, str):
+        return transport
+    if transport == "requests":
+        return Session()
+    if transport == "httpx":
+        return HTTPXSession(verify=verify_ssl)
+    raise ValueError(f"Unknown transport: {transport!r} (expected 'requests' or 'httpx')")
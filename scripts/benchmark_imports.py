@@ -0,0 +1,106 @@
+"""Measure cold import time of the framework's entry points against a budget.
+
+Every measurement runs in a fresh interpreter, which is what each xdist or
+Locust worker pays at startup. The script exits non-zero if any entry point
+exceeds its budget or eagerly imports a heavy dependency it should defer.
+
+Usage:
+    python scripts/benchmark_imports.py --runs 5
+
+Set ``IMPORT_BUDGET_SCALE`` (e.g. ``2``) to relax every budget on slow or
+heavily loaded machines. Timings are noisy, so run this as its own CI step
+rather than inside the test suite; ``--no-timing`` checks only the
+deterministic part (no eager heavy imports) and is what the component
+suite runs.
+"""
+import argparse
+import json
+import os
+import subprocess
+import sys
+from statistics import median
+from typing import Dict, List, Set, Tuple
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+HEAVY = frozenset({"requests", "pydantic", "email_validator", "httpx", "asyncio", "yaml", "paramiko"})
+
+# Entry point -> (budget in ms, heavy modules it is allowed to load)
+BUDGETS: Dict[str, Tuple[float, Set[str]]] = {
+    "core": (50, set()),
+    "agents": (50, set()),
+    "utils": (50, set()),
+    "agents.ssh_client": (100, set()),
+    "utils.logger": (150, set()),
+    "core.api_client": (500, {"requests"}),
+    "core.data_models": (500, {"pydantic", "email_validator"}),
+}
+
+PROBE = (
+    "import sys, time, json\n"
+    "started = time.perf_counter()\n"
+    "import {module}\n"
+    "elapsed = time.perf_counter() - started\n"
+    "print(json.dumps({{'ms': elapsed * 1000, 'modules': sorted(sys.modules)}}))\n"
+)
+
+
+def measure(module: str) -> Tuple[float, Set[str]]:
+    """Import ``module`` in a fresh interpreter.
+
+    Returns:
+        Import time in milliseconds and the top-level packages loaded
+    """
+    output = subprocess.run(
+        [sys.executable, "-c", PROBE.format(module=module)],
+        cwd=ROOT, capture_output=True, text=True, check=True
+    ).stdout
+    result = json.loads(output)
+    return result["ms"], {name.split(".")[0] for name in result["modules"]}
+
+
+def check(runs: int, scale: float, timing: bool = True) -> List[str]:
+    """Measure every entry point and print a report.
+
+    Args:
+        runs: Fresh interpreters per entry point
+        scale: Multiplier applied to every budget
+        timing: Whether to enforce the time budgets, not just the heavy-import rules
+
+    Returns:
+        Budget violations; empty if every entry point is within budget
+    """
+    violations = []
+    print(f"{'Module':<22}{'median (ms)':>12}{'budget (ms)':>13}  heavy imports")
+    for module, (budget, allowed) in BUDGETS.items():
+        timings = []
+        for _ in range(runs):
+            elapsed, loaded = measure(module)
+            timings.append(elapsed)
+        elapsed, budget = median(timings), budget * scale
+        heavy = sorted(loaded & HEAVY)
+        print(f"{module:<22}{elapsed:>12.1f}{budget:>13.0f}  {', '.join(heavy) or '-'}")
+        if timing and elapsed > budget:
+            violations.append(f"{module} took {elapsed:.1f} ms (budget {budget:.0f} ms)")
+        unexpected = set(heavy) - allowed
+        if unexpected:
+            violations.append(f"{module} eagerly imports {', '.join(sorted(unexpected))}")
+    return violations
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--runs", type=int, default=5, help="Fresh interpreters per entry point")
+    parser.add_argument("--scale", type=float, default=float(os.environ.get("IMPORT_BUDGET_SCALE", "1")),
+                        help="Multiplier applied to every budget")
+    parser.add_argument("--no-timing", action="store_true",
+                        help="Only check for eager heavy imports; report but do not enforce timings")
+    args = parser.parse_args()
+
+    violations = check(args.runs, args.scale, timing=not args.no_timing)
+    for violation in violations:
+        print(f"FAIL: {violation}")
+    return 1 if violations else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,199 @@
+"""Compare APIClient transports under high fan-out against a local stub server.
+
+The stub speaks HTTP/1.1 and cleartext HTTP/2 (prior knowledge) on the same
+port and counts the TCP connections it accepts. Every response is delayed to
+mimic server think time, so concurrency rather than raw parsing dominates.
+
+Usage:
+    python scripts/benchmark_transports.py --requests 2000 --concurrency 64
+
+Requires ``httpx[http2]`` (which also provides ``h2``).
+"""
+import argparse
+import asyncio
+import json
+import logging
+import os
+import sys
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from statistics import quantiles
+from typing import Dict, List, Set, Tuple
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import h2.config  # noqa: E402
+import h2.connection  # noqa: E402
+import h2.events  # noqa: E402
+
+from core.api_client import APIClient  # noqa: E402
+from core.transports import HTTPXSession  # noqa: E402
+
+BODY = json.dumps({"success": True, "status": 200, "message": "Notes API is Running"}).encode()
+H2_PREFACE = b"PRI * HTTP/2.0\r\n\r\nSM\r\n\r\n"
+
+
+class StubServer:
+    """Threaded asyncio server answering every request with a fixed JSON body."""
+
+    def __init__(self, delay: float) -> None:
+        self.delay = delay
+        self.connections = 0
+        self.port = 0
+        self._writers: Set[asyncio.StreamWriter] = set()
+        self._loop = asyncio.new_event_loop()
+        self._ready = threading.Event()
+        self._thread = threading.Thread(target=self._run, daemon=True)
+
+    def start(self) -> "StubServer":
+        self._thread.start()
+        self._ready.wait()
+        return self
+
+    def stop(self) -> None:
+        asyncio.run_coroutine_threadsafe(self._shutdown(), self._loop).result()
+        self._loop.call_soon_threadsafe(self._loop.stop)
+        self._thread.join()
+        self._loop.close()
+
+    async def _shutdown(self) -> None:
+        self._server.close()
+        for writer in self._writers:
+            writer.close()
+        tasks = [task for task in asyncio.all_tasks() if task is not asyncio.current_task()]
+        if tasks:
+            await asyncio.wait(tasks, timeout=1)
+
+    def _run(self) -> None:
+        asyncio.set_event_loop(self._loop)
+        self._server = self._loop.run_until_complete(asyncio.start_server(self._handle, "127.0.0.1", 0))
+        self.port = self._server.sockets[0].getsockname()[1]
+        self._ready.set()
+        self._loop.run_forever()
+
+    async def _handle(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter) -> None:
+        self.connections += 1
+        self._writers.add(writer)
+        try:
+            head = await reader.readexactly(len(H2_PREFACE))
+        except asyncio.IncompleteReadError:
+            writer.close()
+            return
+        try:
+            if head == H2_PREFACE:
+                await self._serve_h2(reader, writer, head)
+            else:
+                await self._serve_http1(reader, writer, head)
+        except (ConnectionError, asyncio.IncompleteReadError):
+            pass
+        finally:
+            self._writers.discard(writer)
+            writer.close()
+
+    async def _serve_http1(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter, head: bytes) -> None:
+        buffer = head
+        while True:
+            while b"\r\n\r\n" not in buffer:
+                chunk = await reader.read(65536)
+                if not chunk:
+                    return
+                buffer += chunk
+            request, buffer = buffer.split(b"\r\n\r\n", 1)
+            length = 0
+            for line in request.split(b"\r\n")[1:]:
+                name, _, value = line.partition(b":")
+                if name.strip().lower() == b"content-length":
+                    length = int(value.strip())
+            while len(buffer) < length:
+                buffer += await reader.readexactly(length - len(buffer))
+            buffer = buffer[length:]
+            await asyncio.sleep(self.delay)
+            writer.write(
+                b"HTTP/1.1 200 OK\r\nContent-Type: application/json\r\n"
+                b"Content-Length: %d\r\nConnection: keep-alive\r\n\r\n%s" % (len(BODY), BODY)
+            )
+            await writer.drain()
+
+    async def _serve_h2(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter, head: bytes) -> None:
+        conn = h2.connection.H2Connection(config=h2.config.H2Configuration(client_side=False))
+        conn.initiate_connection()
+        data = head
+
+        async def respond(stream_id: int) -> None:
+            await asyncio.sleep(self.delay)
+            conn.send_headers(stream_id, [
+                (":status", "200"),
+                ("content-type", "application/json"),
+                ("content-length", str(len(BODY))),
+            ])
+            conn.send_data(stream_id, BODY, end_stream=True)
+            writer.write(conn.data_to_send())
+
+        while data:
+            for event in conn.receive_data(data):
+                if isinstance(event, h2.events.RequestReceived):
+                    asyncio.ensure_future(respond(event.stream_id))
+                elif isinstance(event, h2.events.DataReceived):
+                    conn.acknowledge_received_data(event.flow_controlled_length, event.stream_id)
+                elif isinstance(event, h2.events.ConnectionTerminated):
+                    return
+            writer.write(conn.data_to_send())
+            await writer.drain()
+            data = await reader.read(65536)
+
+
+def run_fan_out(client: APIClient, total: int, concurrency: int) -> List[float]:
+    """Send ``total`` health checks from ``concurrency`` threads and return latencies in ms."""
+    def one(_: int) -> float:
+        started = time.perf_counter()
+        client.health_check()
+        return (time.perf_counter() - started) * 1000
+
+    with ThreadPoolExecutor(max_workers=concurrency) as pool:
+        return list(pool.map(one, range(total)))
+
+
+def benchmark(total: int, concurrency: int, delay: float) -> Dict[str, Tuple[int, float, float]]:
+    """Run the fan-out against each transport.
+
+    Returns:
+        Mapping of transport name to (connections, p50 ms, p99 ms)
+    """
+    results = {}
+    transports = {
+        "requests (HTTP/1.1)": lambda: "requests",
+        "httpx (HTTP/2)": lambda: HTTPXSession(http1=False, http2=True),
+    }
+    for name, transport in transports.items():
+        server = StubServer(delay).start()
+        client = APIClient(base_url=f"http://127.0.0.1:{server.port}", transport=transport())
+        try:
+            client.health_check()  # warm up the connection
+            latencies = run_fan_out(client, total, concurrency)
+        finally:
+            client.session.close()
+            server.stop()
+        cuts = quantiles(latencies, n=100)
+        results[name] = (server.connections, cuts[49], cuts[98])
+    return results
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--requests", type=int, default=2000, help="Total requests per transport")
+    parser.add_argument("--concurrency", type=int, default=64, help="Concurrent worker threads")
+    parser.add_argument("--delay", type=float, default=0.005, help="Stub server delay per response in seconds")
+    args = parser.parse_args()
+    # requests opens more connections than its pool keeps; that is the point being measured
+    logging.getLogger("urllib3.connectionpool").setLevel(logging.ERROR)
+
+    results = benchmark(args.requests, args.concurrency, args.delay)
+    print(f"\n{'Transport':<22}{'Connections':>12}{'p50 (ms)':>12}{'p99 (ms)':>12}")
+    for name, (connections, p50, p99) in results.items():
+        print(f"{name:<22}{connections:>12}{p50:>12.2f}{p99:>12.2f}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -1,11 +1,92 @@
+import os
+import sys
+import time
+
 from locust import HttpUser, task, between, events
+from locust.runners import WorkerRunner
 from statistics import mean
 
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from agents.resource_sampler import (  # noqa: E402
+    LatencyTimeline,
+    ResourceSampler,
+    latency_correlations,
+    merge_timelines,
+    write_timeline_csv,
+)
+from agents.ssh_client import SSHPool  # noqa: E402
+from core.endpoints import endpoint_name  # noqa: E402
+from core.metrics import bucket_ms  # noqa: E402
+from utils.results_store import ResultsStore, current_commit  # noqa: E402
+
 # Performance thresholds
 MAX_AVG_RESPONSE_TIME = 500  # Maximum allowed average response time in ms
 MIN_SUCCESS_RATE = 99.0  # Minimum acceptable success rate in percentage
 MIN_RPS = 4.0  # Minimum required Requests Per Second (RPS)
 
+# Remote resource sampling: comma-separated target hosts polled over SSH during the run
+SAMPLE_HOSTS = [host for host in os.environ.get("SAMPLE_HOSTS", "").split(",") if host]
+SAMPLE_INTERVAL = float(os.environ.get("SAMPLE_INTERVAL", "1"))  # Seconds per sample and timeline bucket
+TIMELINE_REPORT = os.environ.get("TIMELINE_REPORT", "logs/locust_timeline.csv")
+RESULTS_DB = os.environ.get("RESULTS_DB")  # Historical results database to append this run to
+RUN_STARTED = time.time()
+
+latency_timeline = LatencyTimeline(resolution=SAMPLE_INTERVAL)
+resource_sampler = None
+resource_rows = {}
+
+@events.request.add_listener
+def record_latency(response_time, exception=None, start_time=None, **kwargs):
+    """Bucket every request's latency for the merged timeline (in the process that sent it)."""
+    latency_timeline.record(start_time or time.time(), response_time, failed=exception is not None)
+
+@events.report_to_master.add_listener
+def send_latency_timeline(client_id, data):
+    """Ship a worker's latency samples to the master with its periodic stats report."""
+    data["latency_timeline"] = latency_timeline.drain()
+
+@events.worker_report.add_listener
+def receive_latency_timeline(client_id, data):
+    """Merge a worker's latency samples into the master's timeline."""
+    latency_timeline.merge(data.get("latency_timeline", []))
+
+@events.test_start.add_listener
+def start_resource_sampler(environment, **kwargs):
+    """Start sampling the target hosts, once per run (not on distributed workers)."""
+    global resource_sampler
+    if SAMPLE_HOSTS and not isinstance(environment.runner, WorkerRunner):
+        pool = SSHPool(os.environ.get("SAMPLE_SSH_USER"), os.environ.get("SAMPLE_SSH_PASSWORD"))
+        resource_sampler = ResourceSampler(pool, SAMPLE_HOSTS, interval=SAMPLE_INTERVAL).start()
+
+@events.test_stop.add_listener
+def stop_resource_sampler(environment, **kwargs):
+    """Stop sampling the target hosts and keep the samples for the report."""
+    global resource_sampler
+    if resource_sampler is not None:
+        resource_sampler.stop()
+        resource_rows.update(resource_sampler.buffer.rows())
+        resource_sampler = None
+
+@events.quitting.add_listener
+def write_timeline_report(environment, **kwargs):
+    """Merge the latency timeline with the host samples and report correlations.
+
+    Runs on quitting rather than test_stop so that, in a distributed run, the
+    workers' final latency reports have reached the master. Only the master
+    (or a local runner) writes the report.
+    """
+    if isinstance(environment.runner, WorkerRunner):
+        return
+    rows = merge_timelines(latency_timeline.rows(), resource_rows)
+    if not rows:
+        return
+    os.makedirs(os.path.dirname(TIMELINE_REPORT) or ".", exist_ok=True)
+    write_timeline_csv(TIMELINE_REPORT, rows)
+    print(f"\nTimeline report written to {TIMELINE_REPORT}")
+    for column, coefficient in list(latency_correlations(rows).items())[:5]:
+        print(f"p95 latency vs {column}: r = {coefficient:+.2f}")
+
 class HealthCheckTest(HttpUser):
     host = "https://practice.expandtesting.com/notes/api"
     wait_time = between(1, 3)  # Simulates real user wait times
@@ -60,4 +141,41 @@ class HealthCheckTest(HttpUser):
             environment.process_exit_code = 1
         else:
             print("PASS: All performance criteria met!")
-            environment.process_exit_code = 0
\ No newline at end of file
+            environment.process_exit_code = 0
+
+@events.quitting.add_listener
+def store_results(environment, **kwargs):
+    """Append the run's per-endpoint stats and latency histograms to the results database."""
+    if not RESULTS_DB or isinstance(environment.runner, WorkerRunner):
+        return
+    stats, histograms = [], {}
+    for entry in environment.stats.entries.values():
+        # Request names are paths relative to the host (the API base URL), as APIClient histograms use
+        endpoint = endpoint_name(entry.method, entry.name)
+        stats.append({
+            "endpoint": endpoint,
+            "requests": entry.num_requests,
+            "failures": entry.num_failures,
+            "avg_ms": entry.avg_response_time,
+            "p50_ms": entry.get_response_time_percentile(0.5),
+            "p95_ms": entry.get_response_time_percentile(0.95),
+            "p99_ms": entry.get_response_time_percentile(0.99),
+            "max_ms": entry.max_response_time,
+            "rps": entry.total_rps,
+        })
+        buckets = histograms.setdefault(endpoint, {})
+        for response_time, count in entry.response_times.items():
+            bucket = bucket_ms(response_time / 1000)
+            buckets[bucket] = buckets.get(bucket, 0) + count
+    with ResultsStore(RESULTS_DB) as store:
+        store.ingest(
+            "locust",
+            started=RUN_STARTED,
+            git_commit=current_commit(),
+            exitstatus=environment.process_exit_code,
+            latency=histograms,
+            locust=stats,
+            meta={"host": environment.host, "users": environment.parsed_options.num_users if environment.parsed_options else None},
+        )
+    print(f"Results appended to {RESULTS_DB}")
+
@@ -0,0 +1,79 @@
+"""Merge the result files of a sharded test run into one report and exit status.
+
+Usage:
+    python scripts/merge_shards.py .shards/shard-*.json --junitxml report.xml
+
+Exit status: 0 if every test passed, 1 if any test failed or a shard
+crashed, 2 if shard files are missing, duplicated or inconsistent.
+"""
+import argparse
+import json
+import os
+import sys
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from core.metrics import percentile  # noqa: E402
+from tests.plugins.sharding import (  # noqa: E402
+    exit_status,
+    merge_results,
+    update_durations,
+    write_junit,
+)
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("results", nargs="+", help="Shard result files (shard-<i>-of-<N>.json)")
+    parser.add_argument("--junitxml", help="Write a combined JUnit XML report")
+    parser.add_argument("--json", help="Write the combined results as JSON")
+    parser.add_argument("--durations", default=".shards/durations.json",
+                        help="Historical durations file to refresh for the next run's balancing")
+    parser.add_argument("--results-db", help="Append the merged run to this results database")
+    args = parser.parse_args()
+
+    results = []
+    for path in args.results:
+        with open(path) as handle:
+            results.append(json.load(handle))
+    combined, problems = merge_results(results)
+
+    print(f"{'Shard':<8}{'Tests':>8}{'Test time (s)':>15}{'Wall time (s)':>15}{'Exit':>6}")
+    for shard_id, shard in sorted(combined["shards"].items()):
+        print(f"{shard_id:<8}{shard['tests']:>8}{shard['test_time']:>15.1f}{shard['wall_time']:>15.1f}{shard['exitstatus']:>6}")
+    print("Outcomes: " + ", ".join(f"{count} {outcome}" for outcome, count in sorted(combined["outcomes"].items())))
+    if combined["latency"]:
+        print(f"{'Endpoint':<32}{'Requests':>10}{'p50 (ms)':>10}{'p95 (ms)':>10}{'p99 (ms)':>10}")
+    for endpoint, buckets in sorted(combined["latency"].items()):
+        p50, p95, p99 = (percentile(buckets, q) for q in (50, 95, 99))
+        print(f"{endpoint:<32}{sum(buckets.values()):>10}{p50:>10.0f}{p95:>10.0f}{p99:>10.0f}")
+    for problem in problems:
+        print(f"ERROR: {problem}")
+
+    if args.junitxml:
+        write_junit(args.junitxml, combined["tests"])
+    if args.json:
+        with open(args.json, "w") as handle:
+            json.dump(combined, handle, indent=1)
+    if not problems:
+        update_durations(args.durations, combined["tests"])
+    status = exit_status(combined, problems)
+    if args.results_db:
+        from utils.results_store import ResultsStore, current_commit
+
+        with ResultsStore(args.results_db) as store:
+            store.ingest(
+                "pytest",
+                started=min(result["started"] for result in results),
+                finished=max(result["started"] + result["wall_time"] for result in results),
+                git_commit=current_commit(),
+                exitstatus=status,
+                tests=combined["tests"],
+                latency=combined["latency"],
+                meta={"shards": len(results), "problems": problems},
+            )
+    return status
+
+
+if __name__ == "__main__":
+    sys.exit(main())
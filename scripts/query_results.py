@@ -0,0 +1,82 @@
+"""Query the historical results database for trends and regressions.
+
+Usage:
+    python scripts/query_results.py runs --last 10
+    python scripts/query_results.py slowest --last 20 --limit 15
+    python scripts/query_results.py trend tests/integration/test_health_check.py::test_health_check_success
+    python scripts/query_results.py endpoint "GET /health-check"
+    python scripts/query_results.py regressions --last 10 --factor 1.5
+
+``regressions`` exits with status 1 when it finds any, so it can gate CI.
+"""
+import argparse
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from utils.results_store import ResultsStore  # noqa: E402
+
+
+def _when(timestamp: float) -> str:
+    return time.strftime("%Y-%m-%d %H:%M", time.localtime(timestamp))
+
+
+def _commit(commit: str) -> str:
+    return (commit or "-")[:10]
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--db", default="results/results.db", help="Results database (default: results/results.db)")
+    commands = parser.add_subparsers(dest="command", required=True)
+    runs = commands.add_parser("runs", help="List recent runs")
+    runs.add_argument("--kind", choices=("pytest", "locust"))
+    runs.add_argument("--last", type=int, default=20)
+    slowest = commands.add_parser("slowest", help="Slowest tests by mean duration over the last N runs")
+    slowest.add_argument("--last", type=int, default=10)
+    slowest.add_argument("--limit", type=int, default=10)
+    trend = commands.add_parser("trend", help="One test's outcome and duration per run")
+    trend.add_argument("nodeid")
+    trend.add_argument("--last", type=int, default=20)
+    endpoint = commands.add_parser("endpoint", help="One endpoint's latency percentiles per run")
+    endpoint.add_argument("endpoint", help='Endpoint name relative to the API base URL, e.g. "GET /notes/:id"')
+    endpoint.add_argument("--last", type=int, default=20)
+    regressions = commands.add_parser("regressions", help="Tests slower in the latest run than their recent mean")
+    regressions.add_argument("--last", type=int, default=10)
+    regressions.add_argument("--factor", type=float, default=1.5)
+    regressions.add_argument("--min-duration", type=float, default=0.05, help="Ignore tests faster than this (s)")
+    args = parser.parse_args()
+
+    with ResultsStore(args.db) as store:
+        if args.command == "runs":
+            print(f"{'Run':>5}  {'Started':<17} {'Kind':<7} {'Commit':<11}{'Tests':>7}{'Failed':>8}{'Exit':>6}")
+            for run in store.runs(args.kind, args.last):
+                exitstatus = "-" if run["exitstatus"] is None else run["exitstatus"]
+                print(f"{run['id']:>5}  {_when(run['started']):<17} {run['kind']:<7} {_commit(run['git_commit']):<11}"
+                      f"{run['tests']:>7}{run['failed']:>8}{exitstatus:>6}")
+        elif args.command == "slowest":
+            print(f"{'Mean (s)':>9}{'Max (s)':>9}{'Runs':>6}{'Fails':>7}  Test")
+            for row in store.slowest_tests(args.last, args.limit):
+                print(f"{row['mean']:>9.3f}{row['max']:>9.3f}{row['runs']:>6}{row['failures']:>7}  {row['nodeid']}")
+        elif args.command == "trend":
+            for row in store.test_trend(args.nodeid, args.last):
+                print(f"{_when(row['started']):<17} {_commit(row['git_commit']):<11}{row['outcome']:<8}{row['duration']:>9.3f}s")
+        elif args.command == "endpoint":
+            print(f"{'Started':<17} {'Kind':<7} {'Commit':<11}{'Requests':>9}{'p50 (ms)':>10}{'p95 (ms)':>10}")
+            for run in store.endpoint_trend(args.endpoint, args.last):
+                print(f"{_when(run['started']):<17} {run['kind']:<7} {_commit(run['git_commit']):<11}"
+                      f"{run['requests']:>9}{run['p50_ms']:>10.0f}{run['p95_ms']:>10.0f}")
+        elif args.command == "regressions":
+            found = store.regressions(args.last, args.factor, args.min_duration)
+            for row in found:
+                print(f"{row['ratio']:>5.1f}x  {row['latest']:.3f}s vs mean {row['mean']:.3f}s over {row['runs']} runs  {row['nodeid']}")
+            if found:
+                return 1
+            print("No regressions")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -10,10 +10,12 @@ export PYTHONPATH=$PYTHONPATH:$(pwd)
 export ENVIRONMENT=local
 export LOG_LEVEL=INFO
 
+# Check worker startup cost; timing budgets are enforced here, outside the test suite
+python scripts/benchmark_imports.py --runs 5 || exit 1
+
 # Run tests with proper configuration
+# Framework logs go through config/logging.yaml to logs/ on a background thread;
+# live CLI logging is left off so it does not skew measured latencies.
 pytest -v \
     -m integration \
-    --log-cli-level=INFO \
-    --log-cli-format="%(asctime)s [%(levelname)8s] %(message)s (%(filename)s:%(lineno)s)" \
-    --log-cli-date-format="%Y-%m-%d %H:%M:%S" \
     tests/integration/test_health_check.py 
\ No newline at end of file
@@ -0,0 +1,59 @@
+"""Fixtures for component tests that exercise the framework without the network."""
+import io
+import json
+from typing import Any, Dict, List, Optional
+
+import pytest
+from requests import Response
+
+from core.api_client import APIClient
+
+
+class FakeSession:
+    """Stand-in for ``requests.Session`` that records calls and replays responses."""
+
+    def __init__(self) -> None:
+        self.calls: List[Dict[str, Any]] = []
+        self.responses: List[Response] = []
+
+    def queue(
+        self,
+        status_code: int = 200,
+        payload: Optional[Any] = None,
+        headers: Optional[Dict[str, str]] = None
+    ) -> None:
+        """Queue a response to be returned by the next request.
+
+        ``payload`` is JSON-encoded unless it is already bytes.
+        """
+        body = payload if isinstance(payload, bytes) else json.dumps(payload if payload is not None else {}).encode()
+        response = Response()
+        response.status_code = status_code
+        response.raw = io.BytesIO(body)
+        response.headers.update(headers or {})
+        self.responses.append(response)
+
+    def request(self, **kwargs: Any) -> Response:
+        self.calls.append(kwargs)
+        if not self.responses:
+            self.queue()
+        response = self.responses.pop(0)
+        response.url = kwargs["url"]
+        return response
+
+    def close(self) -> None:
+        pass
+
+
+@pytest.fixture
+def fake_session() -> FakeSession:
+    """Fixture providing a fresh fake session."""
+    return FakeSession()
+
+
+@pytest.fixture
+def offline_client(fake_session: FakeSession) -> APIClient:
+    """Fixture providing an APIClient wired to the fake session."""
+    client = APIClient(base_url="https://api.test/notes/api")
+    client.session = fake_session
+    return client
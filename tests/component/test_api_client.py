@@ -0,0 +1,49 @@
+"""Component tests for APIClient request preparation."""
+import json
+
+import pytest
+
+from core.api_client import APIClient
+
+
+@pytest.mark.component
+def test_prepared_request_is_reusable(offline_client: APIClient, fake_session) -> None:
+    """A prepared request encodes its body once and can be sent repeatedly."""
+    prepared = offline_client.prepare("POST", "/notes", data={"title": "a"})
+
+    prepared.send()
+    prepared.send()
+
+    assert len(fake_session.calls) == 2
+    assert fake_session.calls[0]["url"] == "https://api.test/notes/api/notes"
+    assert fake_session.calls[0]["data"] is fake_session.calls[1]["data"]
+    assert json.loads(fake_session.calls[0]["data"]) == {"title": "a"}
+
+
+@pytest.mark.component
+def test_prepared_headers_follow_auth_token(offline_client: APIClient, fake_session) -> None:
+    """Cached headers are rebuilt when the auth token changes, including direct assignment."""
+    prepared = offline_client.prepare("GET", "/users/profile", headers={"x-custom": "1"})
+
+    prepared.send()
+    offline_client.auth_token = "abc"
+    prepared.send()
+    offline_client._auth_token = None
+    prepared.send()
+
+    sent = [call["headers"] for call in fake_session.calls]
+    assert "x-auth-token" not in sent[0]
+    assert sent[1]["x-auth-token"] == "abc"
+    assert sent[1]["x-custom"] == "1"
+    assert "x-auth-token" not in sent[2]
+
+
+@pytest.mark.component
+def test_form_content_type_overrides_default(offline_client: APIClient, fake_session) -> None:
+    """Form payloads are urlencoded and sent with the form content type."""
+    offline_client.post("/users/login", data={"email": "a@b.c"}, content_type="form")
+
+    call = fake_session.calls[0]
+    assert call["data"] == "email=a%40b.c"
+    assert call["headers"]["Content-Type"] == "application/x-www-form-urlencoded"
+    assert offline_client.default_headers["Content-Type"] == "application/json"
@@ -0,0 +1,88 @@
+"""Component tests for the APIClient circuit breaker."""
+import time
+
+import pytest
+import requests
+
+from core.api_client import APIClient
+from core.circuit_breaker import OPEN, CircuitBreaker
+from core.exceptions import APIError, CircuitOpenError
+
+
+@pytest.fixture
+def guarded_client(offline_client: APIClient, tmp_path) -> APIClient:
+    """Fixture providing an offline client with a file-backed circuit breaker."""
+    offline_client.circuit_breaker = CircuitBreaker(
+        failure_threshold=2, reset_timeout=60, state_dir=str(tmp_path)
+    )
+    return offline_client
+
+
+def _fail_connections(fake_session) -> None:
+    def refuse(**kwargs):
+        fake_session.calls.append(kwargs)
+        raise requests.ConnectionError("connection refused")
+    fake_session.request = refuse
+
+
+@pytest.mark.component
+def test_open_circuit_fails_fast(guarded_client: APIClient, fake_session) -> None:
+    """Once the threshold is reached, further calls never reach the wire."""
+    _fail_connections(fake_session)
+
+    with pytest.raises(CircuitOpenError):
+        guarded_client.get("/notes", retries=3)
+    with pytest.raises(CircuitOpenError):
+        guarded_client.health_check()
+
+    assert len(fake_session.calls) == 2
+
+
+@pytest.mark.component
+def test_state_is_shared_through_state_dir(guarded_client: APIClient, fake_session, tmp_path) -> None:
+    """A second breaker on the same directory, as in another worker, sees the open circuit."""
+    _fail_connections(fake_session)
+    with pytest.raises(APIError, match="after 2 attempts"):
+        guarded_client.get("/notes/64f1c0ffee00", retries=2)
+
+    other = CircuitBreaker(failure_threshold=2, reset_timeout=60, state_dir=str(tmp_path))
+    with pytest.raises(CircuitOpenError):
+        other.before_call("https://api.test/notes/api/notes/64f1c0ffee99")
+
+
+@pytest.mark.component
+def test_half_open_probe_uses_health_check(guarded_client: APIClient, fake_session) -> None:
+    """After the cool-down a health probe runs and a successful trial closes the circuit."""
+    breaker = guarded_client.circuit_breaker
+    breaker.reset_timeout = 0
+    for _ in range(2):
+        breaker.record_failure("https://api.test/notes/api/notes")
+
+    response = guarded_client.get("/notes")
+
+    assert response.status_code == 200
+    assert [call["url"] for call in fake_session.calls] == [
+        "https://api.test/notes/api/health-check",
+        "https://api.test/notes/api/notes",
+    ]
+    assert {circuit.state for circuit in breaker.circuits_for(fake_session.calls[1]["url"])} == {"closed"}
+
+
+@pytest.mark.component
+def test_open_endpoint_circuit_does_not_claim_the_host_probe(tmp_path) -> None:
+    """A call rejected by one circuit leaves the probe of an expired circuit for the next caller."""
+    breaker = CircuitBreaker(failure_threshold=1, reset_timeout=60, state_dir=str(tmp_path))
+    url = "https://api.test/notes/api/notes"
+    host, endpoint = breaker.circuits_for(url)
+    expired = (OPEN, 1, time.time() - 120)
+    for circuit, record in ((host, expired), (endpoint, (OPEN, 1, time.time()))):
+        with circuit._record.locked() as holder:
+            holder[0] = record
+
+    with pytest.raises(CircuitOpenError, match="notes"):
+        breaker.before_call(url)
+    assert host._record.read() == expired
+
+    with endpoint._record.locked() as holder:
+        holder[0] = expired
+    assert breaker.before_call(url) == [host, endpoint]
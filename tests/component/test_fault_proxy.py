@@ -0,0 +1,95 @@
+"""Component tests for the fault-injection proxy, against a local upstream."""
+import json
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Iterator
+
+import pytest
+
+from core.api_client import APIClient
+from core.exceptions import APIError
+from utils.fault_proxy import FaultProxy, Latency
+
+
+class _Upstream(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+
+    def do_GET(self) -> None:
+        body = json.dumps({"success": True, "status": 200, "path": self.path}).encode()
+        self.send_response(200)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, *args: object) -> None:
+        pass
+
+
+@pytest.fixture(scope="module")
+def fault_proxy_server() -> Iterator[FaultProxy]:
+    """Fault proxy in front of a local upstream instead of the real base URL."""
+    server = ThreadingHTTPServer(("127.0.0.1", 0), _Upstream)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    with FaultProxy(f"http://127.0.0.1:{server.server_port}/notes/api", seed=0) as proxy:
+        yield proxy
+    server.shutdown()
+    server.server_close()
+
+
+@pytest.fixture
+def client(fault_proxy: FaultProxy) -> APIClient:
+    return APIClient(base_url=fault_proxy.base_url)
+
+
+@pytest.mark.component
+@pytest.mark.fault(path="*/health-check", status=503, times=2)
+def test_status_burst_from_marker_expires(client: APIClient, fault_proxy: FaultProxy) -> None:
+    """A marker rule answers the first matching requests itself, then traffic flows again."""
+    for _ in range(2):
+        with pytest.raises(APIError) as error:
+            client.health_check()
+        assert error.value.status_code == 503
+
+    assert client.health_check().json()["path"] == "/notes/api/health-check"
+    assert fault_proxy.stats["status"] == 2
+
+
+@pytest.mark.component
+def test_rules_skipped_by_probability_fall_through(client: APIClient, fault_proxy: FaultProxy) -> None:
+    """A matching rule that loses its probability draw lets later rules for the route apply."""
+    fault_proxy.add_rule(path="*/health-check", status=500, probability=0.0)
+    fault_proxy.add_rule(path="*/health-check", status=503, times=1)
+
+    with pytest.raises(APIError) as error:
+        client.health_check()
+    assert error.value.status_code == 503
+
+
+@pytest.mark.component
+def test_connection_reset_is_retried(client: APIClient, fault_proxy: FaultProxy) -> None:
+    """A single reset is absorbed by APIClient's retry; a partial body on every attempt is not."""
+    fault_proxy.add_rule(reset=True, times=1)
+    assert client.health_check().status_code == 200
+    assert fault_proxy.stats["reset"] == 1
+
+    with fault_proxy.inject(partial=0.5):
+        with pytest.raises(APIError, match="after 2 attempts"):
+            client.health_check()
+    assert fault_proxy.stats["partial"] == 2
+
+
+@pytest.mark.component
+def test_latency_applies_only_to_matching_paths(client: APIClient, fault_proxy: FaultProxy) -> None:
+    """Injected latency delays the matching endpoint and leaves others alone."""
+    fault_proxy.add_rule(path="*/notes", latency=Latency.fixed(0.2))
+
+    started = time.perf_counter()
+    client.get("/health-check")
+    fast = time.perf_counter() - started
+    started = time.perf_counter()
+    client.get("/notes")
+    slow = time.perf_counter() - started
+
+    assert slow >= 0.2 > fast
@@ -0,0 +1,89 @@
+"""Component tests for hedged GET requests."""
+import threading
+import time
+
+import pytest
+
+from core.api_client import APIClient
+from core.hedging import HedgePolicy
+from utils.logger import correlation, test_id_var
+
+
+@pytest.fixture
+def hedged_client(offline_client: APIClient) -> APIClient:
+    """Fixture providing an offline client that hedges after 20 ms."""
+    offline_client.hedging = HedgePolicy(initial_delay=0.02, min_delay=0.02, budget=0, burst=1)
+    yield offline_client
+    offline_client.hedging.close()
+
+
+@pytest.mark.component
+def test_slow_primary_is_hedged(hedged_client: APIClient, fake_session) -> None:
+    """A slow first request is raced by a hedge, whose response is returned."""
+    original = fake_session.request
+    first_call = threading.Event()
+
+    def slow_first(**kwargs):
+        if not first_call.is_set():
+            first_call.set()
+            time.sleep(0.3)
+        return original(**kwargs)
+    fake_session.request = slow_first
+
+    started = time.perf_counter()
+    response = hedged_client.health_check()
+
+    assert response.status_code == 200
+    assert time.perf_counter() - started < 0.25
+    assert hedged_client.hedging.stats.hedges == 1
+    assert hedged_client.hedging.stats.wins == 1
+
+
+@pytest.mark.component
+def test_hedge_budget_caps_extra_load(hedged_client: APIClient, fake_session) -> None:
+    """Once the budget is spent, slow requests are simply awaited."""
+    original = fake_session.request
+
+    def always_slow(**kwargs):
+        time.sleep(0.05)
+        return original(**kwargs)
+    fake_session.request = always_slow
+
+    for _ in range(3):
+        hedged_client.get("/notes")
+    hedged_client.get("/notes", hedge=False)
+
+    stats = hedged_client.hedging.stats
+    assert stats.requests == 3
+    assert stats.hedges == 1
+    assert stats.skipped == 2
+
+
+@pytest.mark.component
+def test_hedged_attempts_keep_the_test_correlation(hedged_client: APIClient, fake_session) -> None:
+    """Primary and hedge run with the caller's context, so log records keep the test id."""
+    original = fake_session.request
+    seen = []
+
+    def slow_recording(**kwargs):
+        seen.append(test_id_var.get())
+        if len(seen) == 1:
+            time.sleep(0.3)
+        return original(**kwargs)
+    fake_session.request = slow_recording
+
+    with correlation(test_id_var, "tests/test_x.py::test_y"):
+        hedged_client.health_check()
+
+    assert seen == ["tests/test_x.py::test_y"] * 2
+
+
+@pytest.mark.component
+def test_latencies_are_tracked_per_endpoint_not_per_resource(hedged_client: APIClient) -> None:
+    """Requests for different notes share one latency window, so the hedge delay can adapt."""
+    hedged_client.get("/notes/65a1b2c3d4e5f60718293a4b")
+    hedged_client.get("/notes/65a1b2c3d4e5f60718293a4c?page=2")
+    hedged_client.health_check()
+
+    assert sorted(hedged_client.hedging._latencies) == ["GET /health-check", "GET /notes/:id"]
+    assert len(hedged_client.hedging._latencies["GET /notes/:id"]) == 2
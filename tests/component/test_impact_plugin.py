@@ -0,0 +1,103 @@
+"""Component tests for change-based test impact selection."""
+import sys
+import threading
+
+import pytest
+
+from tests.plugins.impact import FileTracer, affected_tests, changed_fixtures
+
+CONFTEST = '''import pytest
+
+@pytest.fixture
+def api_client():
+    return "client"
+
+@pytest.fixture(scope="session")
+def base_url():
+    return "https://api.test"
+
+def pytest_addoption(parser):
+    pass
+'''
+
+NODEIDS = [
+    "tests/component/test_api.py::test_get",
+    "tests/component/test_ssh.py::test_connect",
+    "tests/integration/test_health_check.py::test_health",
+    "tests/component/test_new.py::test_added",
+]
+
+INDEX = {
+    "tests/component/test_api.py::test_get": {
+        "files": ["core/api_client.py", "tests/component/test_api.py"], "fixtures": ["api_client"],
+    },
+    "tests/component/test_ssh.py::test_connect": {
+        "files": ["agents/ssh_client.py", "tests/component/test_ssh.py"], "fixtures": ["base_url"],
+    },
+    "tests/integration/test_health_check.py::test_health": {
+        "files": ["core/api_client.py"], "fixtures": ["base_url"],
+    },
+}
+
+
+def _select(changes, root="/nonexistent"):
+    return affected_tests(NODEIDS, INDEX, changes, root, ["tests/integration/test_health_check.py"], ["*.md"])
+
+
+@pytest.mark.component
+def test_selects_tests_that_executed_changed_files_plus_new_and_safety_tests() -> None:
+    """Only tests touching the change run, together with unindexed tests and the safety set."""
+    selected, fallback = _select({"agents/ssh_client.py": {3}, "README.md": None})
+
+    assert fallback is None
+    assert selected == {
+        "tests/component/test_ssh.py::test_connect",
+        "tests/component/test_new.py::test_added",
+        "tests/integration/test_health_check.py::test_health",
+    }
+
+
+@pytest.mark.component
+def test_unknown_changed_file_selects_everything() -> None:
+    """A change the index cannot account for must not skip any test."""
+    selected, fallback = _select({"config/logging.yaml": None})
+
+    assert selected == set(NODEIDS)
+    assert "config/logging.yaml" in fallback
+
+
+@pytest.mark.component
+def test_conftest_changes_select_by_fixture(tmp_path) -> None:
+    """Editing one fixture selects its users; editing anything else selects every test below."""
+    (tmp_path / "tests").mkdir()
+    (tmp_path / "tests" / "conftest.py").write_text(CONFTEST)
+
+    assert changed_fixtures(CONFTEST, {5}) == {"api_client"}
+    assert changed_fixtures(CONFTEST, {7, 9}) == {"base_url"}
+    assert changed_fixtures(CONFTEST, {12}) is None
+
+    selected, _ = affected_tests(NODEIDS, INDEX, {"tests/conftest.py": {5}}, str(tmp_path), [], [])
+    assert selected == {"tests/component/test_api.py::test_get", "tests/component/test_new.py::test_added"}
+    selected, _ = affected_tests(NODEIDS, INDEX, {"tests/conftest.py": {12}}, str(tmp_path), [], [])
+    assert selected == set(NODEIDS)
+
+
+@pytest.mark.component
+def test_file_tracer_restores_the_tracers_it_replaced() -> None:
+    """Stopping the tracer puts back the process and thread tracers of coverage or a debugger."""
+    def other_tracer(frame, event, arg):
+        return None
+
+    original = threading.gettrace()
+    threading.settrace(other_tracer)
+    try:
+        previous = sys.gettrace()
+        tracer = FileTracer()
+        tracer.start()
+        assert threading.gettrace() == tracer._trace
+        tracer.stop()
+
+        assert threading.gettrace() is other_tracer
+        assert sys.gettrace() is previous
+    finally:
+        threading.settrace(original)
@@ -0,0 +1,34 @@
+"""Component test keeping worker startup cheap.
+
+Only the deterministic check runs here. The wall-clock budgets are checked
+by ``scripts/benchmark_imports.py`` as a separate step (see run_tests.sh),
+where timing noise cannot fail the suite.
+"""
+import os
+import subprocess
+import sys
+
+import pytest
+
+ROOT = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+
+@pytest.mark.component
+def test_entry_points_defer_heavy_imports() -> None:
+    """Framework packages load lazily and no entry point eagerly imports a heavy dependency."""
+    result = subprocess.run(
+        [sys.executable, os.path.join(ROOT, "scripts", "benchmark_imports.py"), "--runs", "1", "--no-timing"],
+        capture_output=True, text=True
+    )
+    assert result.returncode == 0, result.stdout + result.stderr
+
+
+@pytest.mark.component
+def test_package_attributes_resolve_lazily() -> None:
+    """Public names are importable from the package without loading unrelated submodules."""
+    import core
+
+    assert core.APIError.__module__ == "core.exceptions"
+    assert "APIError" in dir(core)
+    with pytest.raises(AttributeError):
+        core.NotAnExport
@@ -0,0 +1,51 @@
+"""Component tests for the background logging pipeline."""
+import json
+import logging
+
+import pytest
+
+from utils.logger import correlation, request_id_var, setup_logging, stop_logging
+
+
+@pytest.mark.component
+def test_records_are_written_as_json_with_correlation_ids(tmp_path, monkeypatch) -> None:
+    """Records are formatted on the listener thread with the emitting test and request ids."""
+    config = tmp_path / "logging.yaml"
+    log_file = tmp_path / "logs" / "out-{worker}.log"
+    config.write_text(f"""
+version: 1
+formatters:
+  json:
+    (): utils.logger.JsonFormatter
+handlers:
+  file:
+    class: logging.FileHandler
+    formatter: json
+    filename: {log_file}
+root:
+  level: DEBUG
+  handlers: [file]
+queue:
+  debug_sample_rate: 5
+""")
+    monkeypatch.setenv("PYTEST_XDIST_WORKER", "gw3")
+    root = logging.getLogger()
+    saved_handlers, saved_level = root.handlers[:], root.level
+
+    listener = setup_logging(str(config))
+    try:
+        with correlation(request_id_var, "req-1"):
+            logging.getLogger("component").info("sent %s", "GET", extra={"endpoint": "/notes"})
+        for index in range(10):
+            logging.getLogger("component").debug("chatty %d", index)
+    finally:
+        stop_logging(listener)
+        root.handlers[:] = saved_handlers
+        root.setLevel(saved_level)
+
+    records = [json.loads(line) for line in (tmp_path / "logs" / "out-gw3.log").read_text().splitlines()]
+    assert records[0]["message"] == "sent GET"
+    assert records[0]["request_id"] == "req-1"
+    assert records[0]["endpoint"] == "/notes"
+    assert records[0]["test_id"].endswith("test_records_are_written_as_json_with_correlation_ids")
+    assert [record["message"] for record in records[1:]] == ["chatty 0", "chatty 5"]
@@ -0,0 +1,100 @@
+"""Component tests for the profiling plugin."""
+import os
+import threading
+import time
+
+import pytest
+
+from tests.plugins.profiling import StackSampler
+
+pytest_plugins = ["pytester"]
+
+REPO_ROOT = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+
+def _busy_wait(seconds: float) -> None:
+    deadline = time.perf_counter() + seconds
+    while time.perf_counter() < deadline:
+        pass
+
+
+@pytest.mark.component
+def test_stack_sampler_collects_collapsed_stacks() -> None:
+    """Samples are recorded root-first and attributed to the running function."""
+    sampler = StackSampler(threading.get_ident(), interval=0.001)
+    sampler.start()
+    _busy_wait(0.1)
+    stacks = sampler.stop()
+
+    assert sum(stacks.values()) > 10
+    hottest = stacks.most_common(1)[0][0]
+    assert hottest.split(";")[-1] == "test_profiling_plugin.py:_busy_wait"
+    assert "test_profiling_plugin.py:test_stack_sampler_collects_collapsed_stacks" in hottest
+
+
+@pytest.fixture
+def profiled_pytester(pytester: pytest.Pytester, monkeypatch: pytest.MonkeyPatch) -> pytest.Pytester:
+    """Fixture providing a pytester whose subprocess runs can import the profiling plugin."""
+    monkeypatch.setenv("PYTHONPATH", REPO_ROOT)
+    return pytester
+
+
+PROFILED_SUITE = """
+import time
+import pytest
+
+@pytest.fixture
+def slow_fixture():
+    time.sleep(0.05)
+
+def test_busy(slow_fixture):
+    deadline = time.perf_counter() + 0.1
+    data = []
+    while time.perf_counter() < deadline:
+        data.append(bytearray(64))
+    test_busy.kept = data
+"""
+
+
+@pytest.mark.component
+def test_profile_options_write_profiles_and_summary(profiled_pytester: pytest.Pytester) -> None:
+    """A profiled run writes per-test and merged stacks, allocation reports and the fixture summary."""
+    pytester = profiled_pytester
+    pytester.makepyfile(test_suite=PROFILED_SUITE)
+
+    result = pytester.runpytest_subprocess(
+        "-p", "tests.plugins.profiling", "--profile", "--profile-mem", "--profile-interval", "0.001",
+        "--profile-dir", "profiles",
+    )
+
+    result.assert_outcomes(passed=1)
+    profiles = pytester.path / "profiles"
+    folded = (profiles / "test_suite.py_test_busy.folded").read_text()
+    assert "test_suite.py:test_busy" in folded
+    assert (profiles / "merged.folded").read_text().split("\n")[0].rpartition(" ")[0] in folded
+    assert (profiles / "test_suite.py_test_busy.mem.txt").read_text().startswith("Peak traced memory: ")
+    result.stdout.fnmatch_lines([
+        "*- profiling -*",
+        "Slowest fixture setups:",
+        "*ms  slow_fixture (function)",
+        "Top allocators*",
+        "*test_suite.py:*",
+    ])
+
+
+@pytest.mark.component
+def test_profile_merges_xdist_worker_output(profiled_pytester: pytest.Pytester) -> None:
+    """Under xdist the controller merges every worker's stacks and fixture timings."""
+    pytest.importorskip("xdist")
+    pytester = profiled_pytester
+    pytester.makepyfile(test_suite=PROFILED_SUITE + "\ndef test_second(slow_fixture):\n    test_busy(None)\n")
+
+    result = pytester.runpytest_subprocess(
+        "-p", "tests.plugins.profiling", "-n", "2", "--profile", "--profile-interval", "0.001",
+        "--profile-dir", "profiles",
+    )
+
+    result.assert_outcomes(passed=2)
+    merged = (pytester.path / "profiles" / "merged.folded").read_text()
+    assert "test_suite.py:test_busy" in merged and "test_suite.py:test_second" in merged
+    result.stdout.fnmatch_lines(["*ms  slow_fixture (function)"])
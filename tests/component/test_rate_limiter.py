@@ -0,0 +1,79 @@
+"""Component tests for the client-side rate limiter."""
+import time
+
+import pytest
+
+from core.api_client import APIClient
+from core.rate_limiter import RateLimit, RateLimiter, TokenBucket
+
+
+@pytest.mark.component
+def test_token_bucket_paces_after_burst() -> None:
+    """Requests beyond the burst are delayed according to the rate."""
+    bucket = TokenBucket(RateLimit(rate=10, burst=2))
+
+    delays = [bucket.reserve() for _ in range(4)]
+
+    assert delays[:2] == [0.0, 0.0]
+    assert delays[2] == pytest.approx(0.1, abs=0.02)
+    assert delays[3] == pytest.approx(0.2, abs=0.02)
+
+
+@pytest.mark.component
+def test_shared_bucket_state_is_seen_by_other_instances(tmp_path) -> None:
+    """Two buckets on the same state file draw from one budget, like two workers would."""
+    state_file = str(tmp_path / "bucket.state")
+    first = TokenBucket(RateLimit(rate=1, burst=1), state_file)
+    second = TokenBucket(RateLimit(rate=1, burst=1), state_file)
+
+    assert first.reserve() == 0.0
+    assert second.reserve() > 0.5
+
+
+@pytest.mark.component
+def test_adaptive_mode_backs_off_on_429(tmp_path) -> None:
+    """A 429 halves the rate and healthy responses recover it up to the limit."""
+    limiter = RateLimiter(
+        groups={"/notes/api/notes": RateLimit(rate=8)},
+        state_dir=str(tmp_path),
+        adaptive=True,
+        increase_step=2,
+    )
+    url = "https://api.test/notes/api/notes/1"
+
+    limiter.record(url, 429, 0.1)
+    bucket = limiter._buckets_for(url)[0]
+    assert bucket.rate == 4
+    limiter.record(url, 200, 0.1)
+    limiter.record(url, 200, 0.1)
+    limiter.record(url, 200, 0.1)
+    assert bucket.rate == 8
+    assert limiter._buckets_for("https://api.test/notes/api/users/login") == []
+
+
+@pytest.mark.component
+def test_adaptive_mode_backs_off_on_transport_errors_and_slow_responses() -> None:
+    """A request without a response, or one slower than the threshold, counts as overload."""
+    limiter = RateLimiter(host_limit=RateLimit(rate=8), adaptive=True, latency_threshold=1.0)
+    url = "https://api.test/notes/api/notes"
+    bucket = limiter._buckets_for(url)[0]
+
+    limiter.record(url, None, 0.1)
+    assert bucket.rate == 4
+    limiter.record(url, 200, 2.0)
+    assert bucket.rate == 2
+
+
+@pytest.mark.component
+def test_client_retries_429_when_limited(offline_client: APIClient, fake_session) -> None:
+    """With a limiter configured, a 429 is retried at the reduced pace."""
+    offline_client.rate_limiter = RateLimiter(host_limit=RateLimit(rate=1000), adaptive=True)
+    fake_session.queue(status_code=429)
+    fake_session.queue(payload={"success": True})
+
+    started = time.perf_counter()
+    response = offline_client.get("/notes")
+
+    assert response.status_code == 200
+    assert len(fake_session.calls) == 2
+    assert time.perf_counter() - started < 1
@@ -0,0 +1,135 @@
+"""Component tests for the remote resource sampler, with a fake SSH pool."""
+import threading
+import time
+from typing import List, Optional, Tuple
+
+import pytest
+
+from agents.resource_sampler import (
+    SNAPSHOT_COMMAND,
+    LatencyTimeline,
+    ResourceSampler,
+    latency_correlations,
+    merge_timelines,
+)
+
+
+def _proc_output(busy: int, idle: int, rx: int, sectors_written: int) -> str:
+    return "\n@@\n".join([
+        f"cpu  {busy} 0 0 {idle} 0 0 0 0 0 0",
+        "0.50 0.40 0.30 1/100 1234",
+        "MemTotal:       1000 kB\nMemFree:         100 kB\nMemAvailable:    250 kB",
+        "Inter-|   Receive\n face |bytes packets\n"
+        f"    lo: 999 1 0 0 0 0 0 0 999 1 0 0 0 0 0 0\n  eth0: {rx} 1 0 0 0 0 0 0 500 1 0 0 0 0 0 0",
+        f"   8       0 sda 10 0 0 0 5 0 {sectors_written} 0 0 0 0\n   8       1 sda1 10 0 0 0 5 0 99999 0 0 0 0",
+        "loop0\nsda",
+    ])
+
+
+class FakeClient:
+    def __init__(self, outputs: List[str]) -> None:
+        self.outputs = outputs
+        self.commands: List[str] = []
+        self.timeouts: List[Optional[float]] = []
+
+    def execute_command(self, command: str, timeout: Optional[float] = None) -> Tuple[str, str]:
+        self.commands.append(command)
+        self.timeouts.append(timeout)
+        return self.outputs.pop(0), ""
+
+
+class HungClient(FakeClient):
+    """Client whose command never returns, like a stalled SSH channel that ignores its timeout."""
+
+    def __init__(self) -> None:
+        super().__init__([])
+        self.called = threading.Event()
+        self.release = threading.Event()
+
+    def execute_command(self, command: str, timeout: Optional[float] = None) -> Tuple[str, str]:
+        self.called.set()
+        self.release.wait()
+        return "", "closed"
+
+
+class FakePool:
+    def __init__(self, clients: dict) -> None:
+        self.clients = clients
+
+    def get(self, hostname: str) -> FakeClient:
+        return self.clients[hostname]
+
+    def close_all(self) -> None:
+        pass
+
+
+@pytest.mark.component
+def test_sampler_runs_one_batched_command_per_host_and_tick() -> None:
+    """Rates come from consecutive snapshots; each tick costs one remote command per host."""
+    client = FakeClient([_proc_output(100, 900, 1000, 0), _proc_output(400, 1600, 3000, 8)])
+    sampler = ResourceSampler(FakePool({"app-1": client}), ["app-1"], interval=1.0)
+
+    sampler.sample(100.0)
+    sampler.sample(101.0)
+
+    assert client.commands == [SNAPSHOT_COMMAND, SNAPSHOT_COMMAND]
+    assert client.timeouts == [sampler.command_timeout] * 2
+    rates = sampler.buffer.rows()[101.0]["app-1"]
+    assert rates["cpu_pct"] == pytest.approx(30.0)
+    assert rates["mem_used_pct"] == pytest.approx(75.0)
+    assert rates["net_rx_bps"] == 2000
+    assert rates["disk_write_bps"] == 8 * 512
+    assert rates["load1"] == 0.5
+
+
+@pytest.mark.component
+def test_sampler_keeps_a_bounded_history_and_stops_despite_a_hung_host() -> None:
+    """Only the newest ``max_samples`` ticks are kept, and stop() gives up on a blocked command."""
+    client = FakeClient([_proc_output(100 * tick, 900 * tick, 0, 0) for tick in range(1, 6)])
+    sampler = ResourceSampler(FakePool({"app-1": client}), ["app-1"], max_samples=2)
+    for tick in range(5):
+        sampler.sample(100.0 + tick)
+    assert list(sampler.buffer.rows()) == [103.0, 104.0]
+
+    hung = HungClient()
+    sampler = ResourceSampler(FakePool({"app-1": hung}), ["app-1"], interval=0.01, command_timeout=0.1).start()
+    assert hung.called.wait(1)
+    started = time.perf_counter()
+    sampler.stop()
+    hung.release.set()
+    assert time.perf_counter() - started < 1
+
+
+@pytest.mark.component
+def test_latency_and_resource_timelines_merge_by_bucket() -> None:
+    """Merged rows line up latency with host metrics, and correlations are ranked."""
+    latency = LatencyTimeline(resolution=1.0)
+    resources = {}
+    for second, (latency_ms, cpu) in enumerate([(100, 10.0), (120, 20.0), (400, 90.0)]):
+        latency.record(1000.0 + second + 0.5, latency_ms)
+        resources[1000.0 + second] = {"app-1": {"cpu_pct": cpu, "load1": 1.0 + second % 2}}
+
+    rows = merge_timelines(latency.rows(), resources)
+
+    assert [row["timestamp"] for row in rows] == [1000.0, 1001.0, 1002.0]
+    assert rows[2]["p95_ms"] == 400 and rows[2]["app-1:cpu_pct"] == 90.0
+    correlations = latency_correlations(rows)
+    assert list(correlations)[0] == "app-1:cpu_pct"
+    assert correlations["app-1:cpu_pct"] > 0.99
+
+
+@pytest.mark.component
+def test_latency_timeline_merges_samples_drained_from_workers() -> None:
+    """Samples drained from worker timelines combine into the master's buckets."""
+    master, workers = LatencyTimeline(), [LatencyTimeline(), LatencyTimeline()]
+    workers[0].record(1000.2, 100)
+    workers[1].record(1000.7, 300, failed=True)
+    workers[1].record(1001.1, 50)
+
+    for worker in workers:
+        master.merge(worker.drain())
+
+    rows = master.rows()
+    assert rows[1000.0]["rps"] == 2 and rows[1000.0]["failures"] == 1 and rows[1000.0]["max_ms"] == 300
+    assert rows[1001.0]["rps"] == 1
+    assert workers[1].drain() == []
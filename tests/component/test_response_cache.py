@@ -0,0 +1,83 @@
+"""Component tests for the APIClient response cache."""
+import pytest
+
+from core.api_client import APIClient
+from core.response_cache import ResponseCache
+
+
+@pytest.fixture
+def cached_client(offline_client: APIClient) -> APIClient:
+    """Fixture providing an offline client with an in-memory cache."""
+    offline_client.cache = ResponseCache(ttl=60)
+    return offline_client
+
+
+@pytest.mark.component
+def test_repeated_reads_are_served_from_cache(cached_client: APIClient, fake_session) -> None:
+    """A second GET of the same resource does not hit the wire, and the cached response closes cleanly."""
+    fake_session.queue(payload={"message": "Notes API is Running"})
+
+    first = cached_client.health_check()
+    with cached_client.health_check() as second:
+        pass  # closed before the body is read, as when a caller discards it
+
+    assert len(fake_session.calls) == 1
+    assert second.json() == first.json()
+    assert cached_client.cache.stats.hits == 1
+    assert cached_client.cache.stats.misses == 1
+
+
+@pytest.mark.component
+def test_cache_is_partitioned_by_auth_token(cached_client: APIClient, fake_session) -> None:
+    """Responses cached for one token are not served to another."""
+    cached_client.get("/users/profile")
+    cached_client.auth_token = "other-user"
+    cached_client.get("/users/profile")
+
+    assert len(fake_session.calls) == 2
+
+
+@pytest.mark.component
+def test_writes_invalidate_resource_and_collection(cached_client: APIClient, fake_session) -> None:
+    """A PUT to a note drops cached reads of the note and the note list."""
+    cached_client.get("/notes")
+    cached_client.get("/notes/1")
+    cached_client.put("/notes/1", data={"title": "new"})
+    cached_client.get("/notes")
+    cached_client.get("/notes/1")
+
+    assert len(fake_session.calls) == 5
+    assert cached_client.cache.stats.invalidations == 2
+
+
+@pytest.mark.component
+def test_stale_entry_is_revalidated_with_etag(cached_client: APIClient, fake_session, tmp_path) -> None:
+    """A stale entry is revalidated with If-None-Match and reused on 304."""
+    cached_client.cache = ResponseCache(ttl=0, cache_dir=str(tmp_path))
+    fake_session.queue(payload={"data": [1, 2]}, headers={"ETag": '"v1"'})
+    fake_session.queue(status_code=304)
+
+    cached_client.get("/notes")
+    response = cached_client.get("/notes")
+
+    assert fake_session.calls[1]["headers"]["If-None-Match"] == '"v1"'
+    assert response.status_code == 200
+    assert response.json() == {"data": [1, 2]}
+    assert cached_client.cache.stats.revalidations == 1
+
+
+@pytest.mark.component
+def test_disk_entries_are_shared_as_json(cached_client: APIClient, fake_session, tmp_path) -> None:
+    """Another process's cache reads persisted entries, and unreadable files are treated as misses."""
+    cached_client.cache = ResponseCache(ttl=60, cache_dir=str(tmp_path))
+    fake_session.queue(payload={"data": [1, 2]})
+    cached_client.get("/notes")
+
+    other = ResponseCache(ttl=60, cache_dir=str(tmp_path))
+    key = other.key("GET", "https://api.test/notes/api/notes", None, None)
+    entry, fresh = other.lookup(key)
+    assert fresh and entry.content == b'{"data": [1, 2]}'
+
+    with open(other._file_for(key), "wb") as handle:
+        handle.write(b"\x80\x04not json")
+    assert ResponseCache(ttl=60, cache_dir=str(tmp_path)).lookup(key) == (None, False)
@@ -0,0 +1,77 @@
+"""Component tests for the historical results store and latency histograms."""
+import pytest
+
+from core.metrics import LatencyHistogram, bucket_ms, percentile
+from utils.results_store import ResultsStore
+
+FAST = "tests/component/test_a.py::test_fast"
+SLOW = "tests/component/test_a.py::test_slow"
+
+
+def _tests(fast, slow, slow_outcome="passed"):
+    return [
+        {"nodeid": FAST, "outcome": "passed", "duration": fast},
+        {"nodeid": SLOW, "outcome": slow_outcome, "duration": slow},
+    ]
+
+
+@pytest.fixture
+def store(tmp_path):
+    """Results store with three pytest runs, the last one slower for ``test_slow``."""
+    with ResultsStore(str(tmp_path / "results.db")) as store:
+        for started, slow in ((1.0, 0.5), (2.0, 0.6), (3.0, 1.5)):
+            store.ingest(
+                "pytest", started=started, finished=started + 1, git_commit=f"c{int(started)}",
+                exitstatus=0, tests=_tests(0.1, slow),
+                latency={"GET /notes/:id": {8: 9, 64: 1}},
+            )
+        yield store
+
+
+@pytest.mark.component
+def test_histogram_buckets_and_normalises_endpoints(offline_client) -> None:
+    """Latencies land in power-of-two buckets keyed by method and base-relative, ID-normalised path."""
+    histogram = LatencyHistogram()
+    histogram.record("get", "/notes/42", 0.005)
+    histogram.record("GET", "/notes/43?page=2", 0.030)
+    offline_client.latency_histogram = histogram
+    offline_client.get("/notes/65a1b2c3d4e5f60718293a4b")
+
+    assert (bucket_ms(0.0005), bucket_ms(0.005), bucket_ms(0.030)) == (1, 8, 32)
+    assert list(histogram.snapshot()) == ["GET /notes/:id"]
+    assert sum(histogram.snapshot()["GET /notes/:id"].values()) == 3
+    assert percentile({8: 9, 64: 1}, 50) == 8.0
+    assert percentile({8: 9, 64: 1}, 95) == 64.0
+
+
+@pytest.mark.component
+def test_runs_and_slowest_tests(store) -> None:
+    """Runs are listed newest first, and tests are ranked by mean duration."""
+    runs = store.runs()
+    assert [run["git_commit"] for run in runs] == ["c3", "c2", "c1"]
+    assert runs[0]["tests"] == 2 and runs[0]["failed"] == 0
+
+    slowest = store.slowest_tests(limit=1)
+    assert slowest[0]["nodeid"] == SLOW
+    assert slowest[0]["mean"] == pytest.approx(2.6 / 3)
+
+
+@pytest.mark.component
+def test_regressions_compare_latest_run_with_baseline(store) -> None:
+    """Only the test that slowed down in the latest run is reported."""
+    regressions = store.regressions(factor=1.5)
+    assert [row["nodeid"] for row in regressions] == [SLOW]
+    assert regressions[0]["ratio"] == pytest.approx(1.5 / 0.55)
+    assert store.regressions(factor=3.0) == []
+
+
+@pytest.mark.component
+def test_endpoint_and_test_trends(store) -> None:
+    """Trends return one point per run, oldest first."""
+    trend = store.endpoint_trend("GET /notes/:id")
+    assert [point["git_commit"] for point in trend] == ["c1", "c2", "c3"]
+    assert trend[-1]["requests"] == 10
+    assert (trend[-1]["p50_ms"], trend[-1]["p95_ms"]) == (8.0, 64.0)
+
+    durations = [row["duration"] for row in store.test_trend(SLOW, last_runs=2)]
+    assert durations == [0.6, 1.5]
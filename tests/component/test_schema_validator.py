@@ -0,0 +1,108 @@
+"""Component tests for precompiled response schema validation."""
+import json
+import os
+
+import pytest
+
+from core.api_client import APIClient
+from core.exceptions import APIError, SchemaValidationError
+from core.schema_validator import SchemaRegistry, compile_schema
+
+SCHEMAS_DIR = os.path.join(os.path.dirname(os.path.dirname(__file__)), "schemas")
+
+
+def _note(index, **overrides):
+    note = {
+        "id": f"{index:024x}", "title": "Title", "description": "Description", "category": "Work",
+        "completed": False, "created_at": "2024-01-01T00:00:00.000Z", "updated_at": "2024-01-01T00:00:00.000Z",
+        "user_id": "u1",
+    }
+    note.update(overrides)
+    return note
+
+
+def _envelope(data, status=200):
+    return {"success": True, "status": status, "message": "OK", "data": data}
+
+
+def _json(document):
+    return json.dumps(document).encode()
+
+
+@pytest.mark.component
+def test_compiled_schema_reports_first_violation_with_path() -> None:
+    """Violations are reported with the JSON path where they occur."""
+    validate = compile_schema({
+        "type": "object",
+        "required": ["items"],
+        "properties": {"items": {"type": "array", "items": {"type": "object", "properties": {
+            "count": {"type": "integer", "minimum": 0},
+            "kind": {"enum": ["a", "b"]},
+        }}}},
+        "additionalProperties": False,
+    })
+
+    assert validate({"items": [{"count": 1, "kind": "a"}]}) is None
+    assert validate({}) == ("$", "missing required property 'items'")
+    assert validate({"items": [{}, {"count": True}]}) == ("$.items[1].count", "expected integer, got boolean")
+    assert validate({"items": [{"kind": "c"}]}) == ("$.items[0].kind", "'c' is not one of ['a', 'b']")
+    assert validate({"items": [], "extra": 1}) == ("$.extra", "unexpected property 'extra'")
+
+
+@pytest.mark.component
+def test_unsupported_keywords_are_rejected_at_compile_time() -> None:
+    """A keyword the compiler does not implement fails loudly instead of passing everything."""
+    with pytest.raises(ValueError, match="oneOf"):
+        compile_schema({"oneOf": [{"type": "string"}, {"type": "integer"}]})
+    with pytest.raises(ValueError, match="Unresolvable"):
+        compile_schema({"$ref": "missing.json"})
+
+
+@pytest.mark.component
+def test_repository_schemas_accept_valid_responses() -> None:
+    """Every schema in tests/schemas compiles and accepts a well-formed response."""
+    registry = SchemaRegistry.from_directory(SCHEMAS_DIR, strict=True)
+    note_id = "65a1b2c3d4e5f60718293a4b"
+
+    registry.validate("GET", "/health-check", 200, b'{"success":true,"status":200,"message":"Notes API is Running"}')
+    registry.validate("GET", "/notes", 200, _json(_envelope([_note(i) for i in range(3)])))
+    registry.validate("PUT", f"/notes/{note_id}", 200, _json(_envelope(_note(1))))
+    registry.validate("POST", "/users/login", 401, b'{"success":false,"status":401,"message":"Incorrect"}')
+    with pytest.raises(SchemaValidationError, match="No response schema"):
+        registry.validate("GET", "/unknown", 200, b"{}")
+
+
+@pytest.mark.component
+def test_fast_mode_samples_long_arrays() -> None:
+    """Fast mode checks a sample of long lists, including the first and last item."""
+    full = SchemaRegistry.from_directory(SCHEMAS_DIR)
+    fast = SchemaRegistry.from_directory(SCHEMAS_DIR, mode="fast", sample_size=10)
+    notes = [_note(i) for i in range(100)]
+
+    notes[5]["category"] = "Unknown"  # between sampled items
+    body = _json(_envelope(notes))
+    fast.validate("GET", "/notes", 200, body)
+    with pytest.raises(SchemaValidationError) as error:
+        full.validate("GET", "/notes", 200, body)
+    assert error.value.path == "$.data[5].category"
+
+    notes[99]["completed"] = "no"
+    with pytest.raises(SchemaValidationError, match=r"\$\.data\[99\]\.completed"):
+        fast.validate("GET", "/notes", 200, _json(_envelope(notes)))
+
+
+@pytest.mark.component
+def test_client_raises_typed_error_for_invalid_response(offline_client: APIClient, fake_session) -> None:
+    """The client validates buffered responses against the endpoint and status schema."""
+    offline_client.schemas = SchemaRegistry.from_directory(SCHEMAS_DIR)
+    fake_session.queue(200, _envelope(_note(1)))
+    fake_session.queue(200, _envelope(_note(2, completed="yes")))
+
+    assert offline_client.get("/notes/65a1b2c3d4e5f60718293a4b").json()["data"]["id"] == _note(1)["id"]
+    with pytest.raises(SchemaValidationError) as error:
+        offline_client.get("/notes/65a1b2c3d4e5f60718293a4c")
+
+    assert isinstance(error.value, APIError)
+    assert error.value.endpoint == "GET /notes/:id"
+    assert error.value.status_code == 200
+    assert error.value.path == "$.data.completed"
@@ -0,0 +1,100 @@
+"""Component tests for duration-balanced sharding and result merging."""
+import json
+import os
+import sys
+from xml.etree import ElementTree
+
+import pytest
+
+from tests.plugins.sharding import RESULT_VERSION, assign_shards, exit_status, merge_results, write_junit
+
+pytest_plugins = ["pytester"]
+
+REPO_ROOT = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+NODEIDS = [f"tests/component/test_{index}.py::test_case" for index in range(10)]
+
+
+def _result(shard_id, tests, shard_count=2, latency=None):
+    return {
+        "version": RESULT_VERSION, "shard_id": shard_id, "shard_count": shard_count, "started": 0.0,
+        "wall_time": 1.0, "exitstatus": 0, "tests": tests,
+        "latency": latency or {},
+    }
+
+
+@pytest.mark.component
+def test_assignment_is_balanced_and_independent_of_collection_order() -> None:
+    """Every test lands in exactly one shard, and slow tests are spread out."""
+    durations = {nodeid: float(index) for index, nodeid in enumerate(NODEIDS)}
+    assignment, totals = assign_shards(NODEIDS, durations, 3)
+
+    assert assign_shards(list(reversed(NODEIDS)), durations, 3)[0] == assignment
+    assert set(assignment.values()) == {1, 2, 3}
+    assert sum(totals) == sum(durations.values())
+    assert max(totals) - min(totals) <= 2.0
+
+
+@pytest.mark.component
+def test_merge_combines_shards_and_flags_failures(tmp_path) -> None:
+    """Merged results sum latency histograms, keep each test once and fail if any test failed."""
+    combined, problems = merge_results([
+        _result(1, [{"nodeid": NODEIDS[0], "outcome": "passed", "duration": 0.005}],
+                latency={"GET /notes": {"8": 3}, "GET /notes/:id": {"16": 1}}),
+        _result(2, [{"nodeid": NODEIDS[1], "outcome": "failed", "duration": 0.006, "message": "E assert 1 == 2"}],
+                latency={"GET /notes": {"8": 1, "64": 2}}),
+    ])
+
+    assert problems == []
+    assert combined["outcomes"] == {"passed": 1, "failed": 1}
+    assert combined["latency"] == {"GET /notes": {8: 4, 64: 2}, "GET /notes/:id": {16: 1}}
+    assert exit_status(combined, problems) == 1
+
+    report = tmp_path / "report.xml"
+    write_junit(str(report), combined["tests"])
+    suites = ElementTree.parse(report).getroot().findall("testsuite")
+    assert [(suite.get("name"), suite.get("failures")) for suite in suites] == [("shard-1", "0"), ("shard-2", "1")]
+
+
+@pytest.mark.component
+def test_merge_reports_missing_shards() -> None:
+    """A run is incomplete when a shard's result file is missing."""
+    combined, problems = merge_results([_result(1, [{"nodeid": NODEIDS[0], "outcome": "passed", "duration": 0.1}], 3)])
+
+    assert problems == ["missing shards: [2, 3]"]
+    assert exit_status(combined, problems) == 2
+
+
+SHARDED_SUITE = """
+def test_{index}(latency_histogram):
+    latency_histogram.record("GET", "/notes/{index}", 0.005)
+"""
+
+
+@pytest.mark.component
+def test_shard_files_carry_api_latency_for_the_merge(pytester: pytest.Pytester, monkeypatch: pytest.MonkeyPatch) -> None:
+    """Each shard writes the APIClient latency histogram, and the merge script combines and ingests it."""
+    monkeypatch.setenv("PYTHONPATH", REPO_ROOT)
+    pytester.makepyfile(**{f"test_{index}": SHARDED_SUITE.format(index=index) for index in range(4)})
+    for shard in (1, 2):
+        result = pytester.runpytest_subprocess(
+            "-p", "tests.plugins.latency", "-p", "tests.plugins.sharding",
+            "--shard-count", "2", "--shard-id", str(shard), "--shard-results", "shards",
+        )
+        result.assert_outcomes(passed=2)
+
+    files = sorted(str(path) for path in (pytester.path / "shards").glob("shard-*.json"))
+    for path in files:
+        with open(path) as handle:
+            assert json.load(handle)["latency"] == {"GET /notes/:id": {"8": 2}}
+
+    result = pytester.run(
+        sys.executable, os.path.join(REPO_ROOT, "scripts", "merge_shards.py"), *files,
+        "--durations", "durations.json", "--results-db", "results.db",
+    )
+    assert result.ret == 0
+    result.stdout.fnmatch_lines(["GET /notes/:id*4*8*8*8"])
+
+    from utils.results_store import ResultsStore
+
+    with ResultsStore(str(pytester.path / "results.db")) as store:
+        assert store.endpoint_trend("GET /notes/:id")[-1]["requests"] == 4
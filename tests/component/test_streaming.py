@@ -0,0 +1,50 @@
+"""Component tests for streamed APIClient responses."""
+import json
+
+import pytest
+
+from core import streaming
+from core.api_client import APIClient
+from core.exceptions import ResponseTooLargeError
+
+
+@pytest.fixture(params=["stdlib", "ijson"])
+def parser(request, monkeypatch) -> str:
+    """Run each test with the built-in array scanner and, if installed, ijson."""
+    if request.param == "stdlib":
+        monkeypatch.setattr(streaming, "ijson", None)
+    elif streaming.ijson is None:
+        pytest.skip("ijson is not installed")
+    return request.param
+
+
+@pytest.mark.component
+def test_iter_items_yields_array_entries(offline_client: APIClient, fake_session, parser) -> None:
+    """Items under the envelope's data key are decoded one by one across chunk boundaries."""
+    notes = [{"id": str(i), "title": f"note {i}", "tags": ["a", "]"]} for i in range(50)]
+    fake_session.queue(payload={"success": True, "message": "[data]", "data": notes, "status": 200})
+
+    with offline_client.stream("GET", "/notes", chunk_size=7) as response:
+        items = list(response.iter_items("data"))
+
+    assert fake_session.calls[0]["stream"] is True
+    assert items == notes
+
+
+@pytest.mark.component
+def test_iter_items_handles_top_level_numbers(offline_client: APIClient, fake_session, parser) -> None:
+    """Numbers split across chunks are not emitted until they are complete."""
+    fake_session.queue(payload=json.dumps([123456, 7, 89]).encode())
+
+    with offline_client.stream("GET", "/numbers", chunk_size=2) as response:
+        assert list(response.iter_items(None)) == [123456, 7, 89]
+
+
+@pytest.mark.component
+def test_max_bytes_is_enforced(offline_client: APIClient, fake_session) -> None:
+    """Reading past max_bytes raises a typed error."""
+    fake_session.queue(payload={"data": ["x" * 100] * 10})
+
+    with offline_client.stream("GET", "/notes", chunk_size=64, max_bytes=256) as response:
+        with pytest.raises(ResponseTooLargeError):
+            list(response.iter_bytes())
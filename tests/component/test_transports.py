@@ -0,0 +1,95 @@
+"""Component tests for the pluggable APIClient transports."""
+import pytest
+from requests import Session
+
+from core.api_client import APIClient
+from core.circuit_breaker import CircuitBreaker
+from core.exceptions import APIError
+from core.rate_limiter import RateLimit, RateLimiter
+from core.transports import HTTPXSession, create_session
+
+
+@pytest.mark.component
+def test_create_session_by_name() -> None:
+    """Transport names map to session objects and unknown names are rejected."""
+    assert isinstance(create_session("requests"), Session)
+    with pytest.raises(ValueError):
+        create_session("carrier-pigeon")
+
+
+@pytest.mark.component
+def test_httpx_transport_returns_requests_responses() -> None:
+    """Responses from the httpx transport behave like requests responses."""
+    httpx = pytest.importorskip("httpx")
+
+    def handler(request: "httpx.Request") -> "httpx.Response":
+        assert request.headers["x-auth-token"] == "token"
+        return httpx.Response(200, json={"success": True, "path": request.url.path})
+
+    session = HTTPXSession(transport=httpx.MockTransport(handler))
+    client = APIClient(base_url="https://api.test/notes/api", transport=session)
+    client.auth_token = "token"
+    try:
+        response = client.get("/users/profile")
+    finally:
+        session.close()
+
+    assert response.status_code == 200
+    assert response.json() == {"success": True, "path": "/notes/api/users/profile"}
+
+
+@pytest.mark.component
+def test_httpx_transport_maps_errors_to_api_error() -> None:
+    """Transport failures and HTTP errors surface as APIError, as with requests."""
+    httpx = pytest.importorskip("httpx")
+
+    calls = []
+
+    def handler(request: "httpx.Request") -> "httpx.Response":
+        calls.append(request)
+        if request.url.path.endswith("/down"):
+            raise httpx.ConnectTimeout("timed out", request=request)
+        return httpx.Response(409, json={"message": "An account already exists"})
+
+    session = HTTPXSession(transport=httpx.MockTransport(handler))
+    client = APIClient(base_url="https://api.test", transport=session)
+    try:
+        with pytest.raises(APIError, match="after 2 attempts"):
+            client.get("/down")
+        with pytest.raises(APIError) as exc_info:
+            client.post("/users/register", data={"email": "a@b.c"})
+    finally:
+        session.close()
+
+    assert len(calls) == 3
+    assert exc_info.value.status_code == 409
+    assert "An account already exists" in str(exc_info.value)
+
+
+@pytest.mark.component
+def test_httpx_responses_can_be_closed_on_retry_and_probe(tmp_path) -> None:
+    """A 429 retry and a half-open health probe close httpx-backed responses without error."""
+    httpx = pytest.importorskip("httpx")
+
+    statuses = iter([200, 429, 200])
+    paths = []
+
+    def handler(request: "httpx.Request") -> "httpx.Response":
+        paths.append(request.url.path)
+        return httpx.Response(next(statuses), json={"success": True})
+
+    session = HTTPXSession(transport=httpx.MockTransport(handler))
+    client = APIClient(
+        base_url="https://api.test/notes/api",
+        transport=session,
+        rate_limiter=RateLimiter(host_limit=RateLimit(rate=1000), adaptive=True),
+        circuit_breaker=CircuitBreaker(failure_threshold=1, reset_timeout=0, state_dir=str(tmp_path)),
+    )
+    client.circuit_breaker.record_failure("https://api.test/notes/api/notes")
+    try:
+        response = client.get("/notes", retries=2)
+    finally:
+        session.close()
+
+    assert response.status_code == 200
+    assert paths == ["/notes/api/health-check", "/notes/api/notes", "/notes/api/notes"]
@@ -1,9 +1,25 @@
 """Global pytest configuration and fixtures."""
+import logging.handlers
+import os
 import pytest
 from core.api_client import APIClient
-from core.data_models import UserRegisterRequest
-from typing import Dict, Any
+from typing import TYPE_CHECKING, Dict, Any, Iterator, Optional
 from utils.data_generator import generate_random_email
+from utils.logger import correlation, setup_logging, stop_logging, test_id_var
+
+if TYPE_CHECKING:  # the rest are imported by the fixtures that use them, keeping collection cheap
+    from core.circuit_breaker import CircuitBreaker
+    from core.hedging import HedgePolicy
+    from core.metrics import LatencyHistogram
+    from core.rate_limiter import RateLimiter
+    from core.schema_validator import SchemaRegistry
+    from utils.fault_proxy import FaultProxy
+
+pytest_plugins = [
+    "tests.plugins.profiling", "tests.plugins.impact", "tests.plugins.latency", "tests.plugins.sharding",
+    "tests.plugins.results_db",
+]
+
 
 @pytest.fixture(scope="session")
 def authenticated_api_client() -> APIClient:
@@ -12,6 +28,8 @@ def authenticated_api_client() -> APIClient:
     
     :return: An authenticated instance of APIClient.
     """
+    from core.data_models import UserRegisterRequest  # pydantic is only needed by this fixture
+
     client = APIClient(base_url)
 
     # Register a user
@@ -49,16 +67,280 @@ def pytest_addoption(parser: pytest.Parser) -> None:
         default="https://practice.expandtesting.com/notes/api",
         help="Base URL for the API",
     )
+    parser.addoption(
+        "--rate-limit",
+        action="store",
+        type=float,
+        default=None,
+        help="Maximum requests per second per host, shared by all xdist workers",
+    )
+    parser.addoption(
+        "--max-in-flight",
+        action="store",
+        type=int,
+        default=None,
+        help="Maximum concurrent requests across all xdist workers",
+    )
+    parser.addoption(
+        "--adaptive-rate-limit",
+        action="store_true",
+        default=False,
+        help="Back off on 429 responses and recover gradually (AIMD)",
+    )
+    parser.addoption(
+        "--rate-limit-latency",
+        action="store",
+        type=float,
+        default=None,
+        help="With --adaptive-rate-limit, also back off on responses slower than this many seconds",
+    )
+    parser.addoption(
+        "--circuit-breaker",
+        action="store_true",
+        default=False,
+        help="Fail fast once the target looks down, sharing breaker state across xdist workers",
+    )
+    parser.addoption(
+        "--circuit-reset-timeout",
+        action="store",
+        type=float,
+        default=30.0,
+        help="Seconds an open circuit rejects requests before probing the health check",
+    )
+    parser.addoption(
+        "--hedge",
+        action="store_true",
+        default=False,
+        help="Hedge slow GET and health-check requests with a duplicate request",
+    )
+    parser.addoption(
+        "--schema-validation",
+        action="store",
+        choices=("full", "fast", "off"),
+        default="full",
+        help="Validate responses against tests/schemas: every array item (full), "
+             "a sample of long arrays (fast), or not at all (off)",
+    )
+
+HEDGE_POLICY_KEY = pytest.StashKey["HedgePolicy"]()
+LOG_LISTENER_KEY = pytest.StashKey[logging.handlers.QueueListener]()
+
+def pytest_configure(config: pytest.Config) -> None:
+    """
+    Start the framework's background logging pipeline.
+    
+    :param config: The pytest configuration object.
+    """
+    config.stash[LOG_LISTENER_KEY] = setup_logging()
+
+def pytest_unconfigure(config: pytest.Config) -> None:
+    """
+    Flush and stop the logging pipeline.
+    
+    :param config: The pytest configuration object.
+    """
+    listener = config.stash.get(LOG_LISTENER_KEY, None)
+    if listener is not None:
+        stop_logging(listener)
+
+@pytest.fixture(autouse=True)
+def log_correlation(request: pytest.FixtureRequest) -> Iterator[None]:
+    """
+    Fixture tagging every log record emitted during a test with its node id.
+    
+    :param request: The pytest request object.
+    """
+    with correlation(test_id_var, request.node.nodeid):
+        yield
+
+@pytest.fixture(scope="session")
+def hedge_policy(pytestconfig) -> Iterator[Optional["HedgePolicy"]]:
+    """
+    Fixture providing the session's hedging policy, if enabled.
+    
+    :param pytestconfig: The pytest configuration object.
+    :return: A HedgePolicy, or None when hedging is off.
+    """
+    if not pytestconfig.getoption("--hedge"):
+        yield None
+        return
+    from core.hedging import HedgePolicy
+
+    policy = pytestconfig.stash[HEDGE_POLICY_KEY] = HedgePolicy()
+    yield policy
+    policy.close()
+
+def pytest_terminal_summary(terminalreporter, config: pytest.Config) -> None:
+    """
+    Report hedging activity at the end of the run.
+    
+    :param terminalreporter: The terminal reporter plugin.
+    :param config: The pytest configuration object.
+    """
+    policy = config.stash.get(HEDGE_POLICY_KEY, None)
+    if policy is not None:
+        terminalreporter.write_sep("-", "request hedging")
+        terminalreporter.write_line(policy.stats.summary())
+
+@pytest.fixture(scope="session")
+def run_shared_dir(tmp_path_factory: pytest.TempPathFactory, pytestconfig) -> str:
+    """
+    Fixture providing a directory shared by every xdist worker of the current run.
+    
+    :param tmp_path_factory: The pytest temporary path factory.
+    :param pytestconfig: The pytest configuration object.
+    :return: Path of the shared directory.
+    """
+    basetemp = tmp_path_factory.getbasetemp()
+    # Each xdist worker gets its own basetemp under a per-run parent directory
+    root = basetemp.parent if hasattr(pytestconfig, "workerinput") else basetemp
+    shared = root / "shared"
+    shared.mkdir(exist_ok=True)
+    return str(shared)
+
+@pytest.fixture(scope="session")
+def rate_limiter(pytestconfig, run_shared_dir: str) -> Optional["RateLimiter"]:
+    """
+    Fixture providing a rate limiter shared across xdist workers, if enabled.
+    
+    :param pytestconfig: The pytest configuration object.
+    :param run_shared_dir: Directory shared by all workers of the run.
+    :return: A RateLimiter, or None when no limit was requested.
+    """
+    rate = pytestconfig.getoption("--rate-limit")
+    max_in_flight = pytestconfig.getoption("--max-in-flight")
+    if rate is None and max_in_flight is None:
+        return None
+    from core.rate_limiter import RateLimit, RateLimiter
+
+    return RateLimiter(
+        host_limit=RateLimit(rate=rate) if rate else None,
+        state_dir=os.path.join(run_shared_dir, "rate_limiter"),
+        adaptive=pytestconfig.getoption("--adaptive-rate-limit"),
+        latency_threshold=pytestconfig.getoption("--rate-limit-latency"),
+        max_in_flight=max_in_flight,
+    )
+
+@pytest.fixture(scope="session")
+def circuit_breaker(pytestconfig, run_shared_dir: str) -> Optional["CircuitBreaker"]:
+    """
+    Fixture providing a circuit breaker shared across clients and xdist workers, if enabled.
+    
+    :param pytestconfig: The pytest configuration object.
+    :param run_shared_dir: Directory shared by all workers of the run.
+    :return: A CircuitBreaker, or None when not requested.
+    """
+    if not pytestconfig.getoption("--circuit-breaker"):
+        return None
+    from core.circuit_breaker import CircuitBreaker
+
+    return CircuitBreaker.shared(
+        reset_timeout=pytestconfig.getoption("--circuit-reset-timeout"),
+        state_dir=os.path.join(run_shared_dir, "circuit_breaker"),
+    )
+
+@pytest.fixture(scope="session")
+def response_schemas(pytestconfig) -> Optional["SchemaRegistry"]:
+    """
+    Fixture providing the response schemas, compiled once for the session.
+    
+    :param pytestconfig: The pytest configuration object.
+    :return: A SchemaRegistry, or None when validation is off.
+    """
+    mode = pytestconfig.getoption("--schema-validation")
+    if mode == "off":
+        return None
+    from core.schema_validator import SchemaRegistry
+
+    return SchemaRegistry.from_directory(os.path.join(os.path.dirname(__file__), "schemas"), mode=mode)
 
 @pytest.fixture
-def api_client(base_url: str) -> APIClient:
+def api_client(
+    base_url: str,
+    rate_limiter: Optional["RateLimiter"],
+    circuit_breaker: Optional["CircuitBreaker"],
+    hedge_policy: Optional["HedgePolicy"],
+    latency_histogram: Optional["LatencyHistogram"],
+    response_schemas: Optional["SchemaRegistry"]
+) -> APIClient:
     """
     Fixture to provide an API client instance.
     
     :param base_url: The base URL for the API.
+    :param rate_limiter: Shared rate limiter, if enabled.
+    :param circuit_breaker: Shared circuit breaker, if enabled.
+    :param hedge_policy: Shared hedging policy, if enabled.
+    :param latency_histogram: Per-endpoint latency histogram, if results are recorded.
+    :param response_schemas: Compiled response schemas, if validation is on.
+    :return: An instance of APIClient.
+    """
+    return APIClient(
+        base_url=base_url,
+        rate_limiter=rate_limiter,
+        circuit_breaker=circuit_breaker,
+        hedging=hedge_policy,
+        latency_histogram=latency_histogram,
+        schemas=response_schemas
+    )
+
+@pytest.fixture(scope="session")
+def fault_proxy_server(base_url: str) -> Iterator["FaultProxy"]:
+    """
+    Fixture running one fault-injection proxy in front of the base URL for the session.
+    
+    :param base_url: The base URL for the API.
+    :return: A started FaultProxy.
+    """
+    from utils.fault_proxy import FaultProxy  # asyncio is only needed by tests that inject faults
+
+    with FaultProxy(base_url, seed=0) as proxy:
+        yield proxy
+
+@pytest.fixture
+def fault_proxy(fault_proxy_server: "FaultProxy", request: pytest.FixtureRequest) -> Iterator["FaultProxy"]:
+    """
+    Fixture providing the fault proxy with this test's rules.
+    
+    Rules come from ``@pytest.mark.fault(...)`` markers (nearest first) and
+    from ``fault_proxy.add_rule(...)`` calls in the test; all are removed afterwards.
+    
+    :param fault_proxy_server: The session's fault proxy.
+    :param request: The pytest request object.
+    :return: The FaultProxy; point clients at its ``base_url``.
+    """
+    for marker in request.node.iter_markers("fault"):
+        fault_proxy_server.add_rule(**marker.kwargs)
+    yield fault_proxy_server
+    fault_proxy_server.clear()
+
+@pytest.fixture
+def proxied_api_client(
+    fault_proxy: "FaultProxy",
+    rate_limiter: Optional["RateLimiter"],
+    circuit_breaker: Optional["CircuitBreaker"],
+    hedge_policy: Optional["HedgePolicy"],
+    latency_histogram: Optional["LatencyHistogram"],
+    response_schemas: Optional["SchemaRegistry"]
+) -> APIClient:
+    """
+    Fixture to provide an API client that talks to the API through the fault proxy.
+    
+    :param fault_proxy: The fault proxy with this test's rules.
+    :param rate_limiter: Shared rate limiter, if enabled.
+    :param circuit_breaker: Shared circuit breaker, if enabled.
+    :param hedge_policy: Shared hedging policy, if enabled.
+    :param latency_histogram: Per-endpoint latency histogram, if results are recorded.
+    :param response_schemas: Compiled response schemas, if validation is on.
     :return: An instance of APIClient.
     """
-    return APIClient(base_url=base_url)
+    return APIClient(
+        base_url=fault_proxy.base_url,
+        rate_limiter=rate_limiter,
+        circuit_breaker=circuit_breaker,
+        hedging=hedge_policy,
+        latency_histogram=latency_histogram,
+        schemas=response_schemas
+    )
 
 @pytest.fixture
 def registration_data() -> Dict[str, Any]:
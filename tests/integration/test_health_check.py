@@ -11,18 +11,32 @@ from core.api_client import APIClient
 
 
 @pytest.fixture(scope="session")
-def api_client(pytestconfig) -> APIClient:
+def api_client(
+    pytestconfig, rate_limiter, circuit_breaker, hedge_policy, latency_histogram, response_schemas
+) -> APIClient:
     """
     Fixture to provide a configured API client instance.
 
     Args:
         pytestconfig: Pytest configuration object.
+        rate_limiter: Shared rate limiter, if enabled.
+        circuit_breaker: Shared circuit breaker, if enabled.
+        hedge_policy: Shared hedging policy, if enabled.
+        latency_histogram: Per-endpoint latency histogram, if results are recorded.
+        response_schemas: Compiled response schemas, if validation is on.
 
     Returns:
         APIClient: Configured API client instance.
     """
     base_url = pytestconfig.getoption("--base-url") or "https://practice.expandtesting.com/notes/api"
-    client = APIClient(base_url=base_url)
+    client = APIClient(
+        base_url=base_url,
+        rate_limiter=rate_limiter,
+        circuit_breaker=circuit_breaker,
+        hedging=hedge_policy,
+        latency_histogram=latency_histogram,
+        schemas=response_schemas
+    )
     print("APIClient instantiated:", client)
     return client
 
@@ -0,0 +1,351 @@
+"""Change-based test impact selection.
+
+``--impact-record`` traces which source files every test executes (during
+setup, call and teardown) and which fixtures it requests, and merges the
+result into a JSON index (``--impact-map``). Only the tests that ran are
+updated, so the index can be refreshed incrementally by any run.
+
+``--affected-only`` diffs the working tree against ``--affected-base`` and
+keeps only the tests that can be impacted:
+
+* tests that executed a changed file, or live in a changed test module;
+* for a changed ``conftest.py``, tests below it that request a changed
+  fixture (any other change to the file selects every test below it);
+* tests missing from the index, e.g. new ones;
+* the safety set from the ``impact_safety`` ini option.
+
+A changed file the index knows nothing about (configuration, a plugin, a
+script used through a subprocess) cannot be ruled out, so the full suite
+runs. So does a run without an index or without a usable git diff.
+
+Tracing is file-granular: a global ``sys.settrace`` function notes each new
+frame's file and declines line tracing, so C calls and lines cost nothing.
+It replaces any other tracer (coverage, debuggers) while recording, and
+threads started before a test (e.g. session-scoped pools) are not traced.
+"""
+from fnmatch import fnmatch
+from typing import Any, Dict, Iterator, List, Optional, Set, Tuple
+import ast
+import json
+import os
+import re
+import subprocess
+import sys
+import threading
+import warnings
+
+import pytest
+
+DEFAULT_IGNORE = ["*.md", "assets/*", ".gitignore"]
+
+_HUNK = re.compile(r"^@@ -\d+(?:,\d+)? \+(\d+)(?:,(\d+))? @@")
+
+# Changed path -> changed line numbers in the new version, or None if the whole file counts
+Changes = Dict[str, Optional[Set[int]]]
+
+
+def pytest_addoption(parser: pytest.Parser) -> None:
+    """Add test impact command line and ini options."""
+    group = parser.getgroup("impact")
+    group.addoption("--affected-only", action="store_true", default=False,
+                    help="Only run tests impacted by changes since --affected-base")
+    group.addoption("--affected-base", action="store", default="HEAD",
+                    help="Git revision to diff against (default: HEAD, i.e. uncommitted changes)")
+    group.addoption("--impact-record", action="store_true", default=False,
+                    help="Record which files and fixtures each test uses into the impact map")
+    group.addoption("--impact-map", action="store", default=".impact/map.json",
+                    help="Path of the test impact index (default: .impact/map.json)")
+    parser.addini("impact_safety", type="linelist", default=[],
+                  help="Node ids, paths or globs always run with --affected-only")
+    parser.addini("impact_ignore", type="linelist", default=DEFAULT_IGNORE,
+                  help="Globs of changed files that never affect tests")
+
+
+def pytest_configure(config: pytest.Config) -> None:
+    """Register the impact plugin only when it was requested."""
+    if config.getoption("--affected-only") or config.getoption("--impact-record"):
+        config.pluginmanager.register(ImpactSelector(config), "impact")
+
+
+class FileTracer:
+    """Records the files of every Python function called while active."""
+
+    def __init__(self) -> None:
+        self.files: Set[str] = set()
+        self._previous = None
+        self._previous_threading = None
+
+    def _trace(self, frame: Any, event: str, arg: Any) -> None:
+        self.files.add(frame.f_code.co_filename)
+
+    def start(self) -> None:
+        self._previous = sys.gettrace()
+        self._previous_threading = threading.gettrace()
+        sys.settrace(self._trace)
+        threading.settrace(self._trace)
+
+    def stop(self) -> Set[str]:
+        sys.settrace(self._previous)
+        threading.settrace(self._previous_threading)
+        self.files.discard(__file__)
+        return self.files
+
+
+def load_map(path: str) -> Dict[str, Dict[str, List[str]]]:
+    """Load the test index, or an empty one if it does not exist yet.
+
+    Returns:
+        Mapping of node id to its ``files`` and ``fixtures``
+    """
+    try:
+        with open(path) as handle:
+            return json.load(handle)["tests"]
+    except FileNotFoundError:
+        return {}
+
+
+def save_map(path: str, tests: Dict[str, Dict[str, List[str]]], root: str, revision: Optional[str]) -> None:
+    """Write the test index atomically, dropping tests whose module no longer exists."""
+    tests = {
+        nodeid: entry for nodeid, entry in tests.items()
+        if os.path.exists(os.path.join(root, nodeid.split("::")[0]))
+    }
+    os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+    temporary = f"{path}.{os.getpid()}.tmp"
+    with open(temporary, "w") as handle:
+        json.dump({"version": 1, "revision": revision, "tests": tests}, handle, indent=1, sort_keys=True)
+    os.replace(temporary, path)
+
+
+def _git(root: str, *args: str) -> str:
+    return subprocess.run(["git", *args], cwd=root, capture_output=True, text=True, check=True).stdout
+
+
+def changed_files(root: str, base: str) -> Changes:
+    """List files changed since ``base``, including uncommitted and untracked ones.
+
+    Args:
+        root: Directory the returned paths are relative to
+        base: Git revision to diff against
+
+    Returns:
+        Changed paths with the changed line numbers of their new version
+
+    Raises:
+        subprocess.CalledProcessError: If git fails, e.g. for an unknown revision
+    """
+    changes: Changes = {path: None for path in _git(root, "diff", "--name-only", "--no-renames", "--relative", base).splitlines()}
+    current = None
+    for line in _git(root, "diff", "-U0", "--no-renames", "--relative", base).splitlines():
+        if line.startswith("+++ "):
+            current = line[6:] if line.startswith("+++ b/") else None
+            continue
+        match = _HUNK.match(line)
+        if current is None or match is None:
+            continue
+        start, count = int(match.group(1)), int(match.group(2) or 1)
+        # A pure deletion is reported as the line before the gap
+        lines = set(range(start, start + count)) if count else {start, start + 1}
+        changes[current] = (changes.get(current) or set()) | lines
+    for path in _git(root, "ls-files", "--others", "--exclude-standard").splitlines():
+        changes[path] = None
+    return changes
+
+
+def changed_fixtures(source: str, lines: Optional[Set[int]]) -> Optional[Set[str]]:
+    """Find the fixtures of a conftest file touched by a change.
+
+    Args:
+        source: Current source of the conftest file
+        lines: Changed line numbers, or None if the whole file changed
+
+    Returns:
+        Names of the changed fixtures, or None if the change is not limited to fixtures
+    """
+    if lines is None:
+        return None
+    spans = {}
+    for node in ast.parse(source).body:
+        if isinstance(node, (ast.FunctionDef, ast.AsyncFunctionDef)) and any(
+            "fixture" in ast.unparse(decorator) for decorator in node.decorator_list
+        ):
+            start = min(decorator.lineno for decorator in node.decorator_list)
+            spans[node.name] = (start, node.end_lineno)
+    fixtures = set()
+    for line in lines:
+        names = [name for name, (start, end) in spans.items() if start <= line <= end]
+        if not names:
+            return None
+        fixtures.update(names)
+    return fixtures
+
+
+def _matches(nodeid: str, pattern: str) -> bool:
+    prefix = pattern.rstrip("/")
+    return (
+        nodeid == prefix
+        or nodeid.startswith(prefix + "::")
+        or nodeid.startswith(prefix + "/")
+        or fnmatch(nodeid, pattern)
+    )
+
+
+def affected_tests(
+    nodeids: List[str],
+    tests: Dict[str, Dict[str, List[str]]],
+    changes: Changes,
+    root: str,
+    safety: List[str],
+    ignore: List[str]
+) -> Tuple[Set[str], Optional[str]]:
+    """Select the tests that can be impacted by a set of changes.
+
+    Args:
+        nodeids: Collected test node ids
+        tests: Test index, as returned by ``load_map``
+        changes: Changed files, as returned by ``changed_files``
+        root: Directory node ids and changed paths are relative to
+        safety: Node ids, paths or globs that are always selected
+        ignore: Globs of changed paths that never affect tests
+
+    Returns:
+        Selected node ids, and the reason everything was selected (None if not)
+    """
+    selected = {nodeid for nodeid in nodeids if nodeid not in tests}
+    selected.update(nodeid for nodeid in nodeids if any(_matches(nodeid, pattern) for pattern in safety))
+    users: Dict[str, Set[str]] = {}
+    for nodeid in nodeids:
+        for path in tests.get(nodeid, {}).get("files", ()):
+            users.setdefault(path, set()).add(nodeid)
+        users.setdefault(nodeid.split("::")[0], set()).add(nodeid)
+
+    for path, lines in sorted(changes.items()):
+        if any(fnmatch(path, pattern) for pattern in ignore):
+            continue
+        if os.path.basename(path) == "conftest.py":
+            directory = os.path.dirname(path)
+            below = [nodeid for nodeid in nodeids if not directory or nodeid.startswith(directory + "/")]
+            source_path = os.path.join(root, path)
+            fixtures = None
+            if os.path.exists(source_path):
+                with open(source_path) as handle:
+                    fixtures = changed_fixtures(handle.read(), lines)
+            if fixtures is None:
+                selected.update(below)
+            else:
+                selected.update(
+                    nodeid for nodeid in below
+                    if nodeid not in tests or fixtures & set(tests[nodeid].get("fixtures", ()))
+                )
+        elif path in users:
+            selected.update(users[path])
+        elif path.endswith(".py") and not os.path.exists(os.path.join(root, path)):
+            # A deleted module nothing used; anything that still imports it fails at collection
+            continue
+        else:
+            return set(nodeids), f"{path} is not in the impact map"
+    return selected, None
+
+
+class ImpactSelector:
+    """Plugin object deselecting unaffected tests and/or recording the index."""
+
+    def __init__(self, config: pytest.Config) -> None:
+        self.config = config
+        self.root = str(config.rootpath)
+        self.map_path = os.path.join(self.root, config.getoption("--impact-map"))
+        self.affected_only = config.getoption("--affected-only")
+        self.record = config.getoption("--impact-record")
+        self.is_worker = hasattr(config, "workerinput")
+        self.recorded: Dict[str, Dict[str, List[str]]] = {}
+        self.skipped: Set[str] = set()
+        self.message: Optional[str] = None
+
+    @pytest.hookimpl(trylast=True)
+    def pytest_collection_modifyitems(self, config: pytest.Config, items: List[pytest.Item]) -> None:
+        """Deselect tests that the current changes cannot affect."""
+        if not self.affected_only:
+            return
+        base = config.getoption("--affected-base")
+        tests = load_map(self.map_path)
+        if not tests:
+            self.message = f"impact: no index at {self.map_path}, running all tests"
+            return
+        try:
+            changes = changed_files(self.root, base)
+        except (OSError, subprocess.CalledProcessError) as e:
+            warnings.warn(pytest.PytestWarning(f"impact: cannot diff against {base!r} ({e}); running all tests"))
+            return
+
+        nodeids = [item.nodeid for item in items]
+        selected, fallback = affected_tests(
+            nodeids, tests, changes, self.root,
+            config.getini("impact_safety"), config.getini("impact_ignore")
+        )
+        if fallback:
+            self.message = f"impact: {fallback}, running all tests"
+            return
+        keep = [item for item in items if item.nodeid in selected]
+        deselected = [item for item in items if item.nodeid not in selected]
+        if deselected:
+            config.hook.pytest_deselected(items=deselected)
+            items[:] = keep
+        self.message = f"impact: {len(keep)}/{len(nodeids)} tests affected by {len(changes)} changed files since {base}"
+
+    def pytest_report_collectionfinish(self, config: pytest.Config) -> Optional[str]:
+        """Report what the selection did."""
+        return self.message
+
+    @pytest.hookimpl(hookwrapper=True)
+    def pytest_runtest_protocol(self, item: pytest.Item, nextitem: Optional[pytest.Item]) -> Iterator[None]:
+        """Trace the files used by setup, call and teardown of each test."""
+        if not self.record:
+            yield
+            return
+        tracer = FileTracer()
+        tracer.start()
+        try:
+            yield
+        finally:
+            files = tracer.stop()
+        self.recorded[item.nodeid] = {
+            "files": self._relative_sources(files),
+            "fixtures": sorted(getattr(item, "fixturenames", ())),
+        }
+
+    def _relative_sources(self, files: Set[str]) -> List[str]:
+        prefix = self.root + os.sep
+        return sorted(
+            os.path.relpath(path, self.root).replace(os.sep, "/") for path in files
+            if path.startswith(prefix) and "site-packages" not in path and os.sep + "." not in path[len(self.root):]
+        )
+
+    def pytest_runtest_logreport(self, report: pytest.TestReport) -> None:
+        """Remember skipped tests; their traces say nothing about their dependencies."""
+        if report.skipped:
+            self.skipped.add(report.nodeid)
+
+    def _results(self) -> Dict[str, Dict[str, List[str]]]:
+        return {nodeid: entry for nodeid, entry in self.recorded.items() if nodeid not in self.skipped}
+
+    def pytest_sessionfinish(self, session: pytest.Session) -> None:
+        """Hand traces to the controller, or merge them into the index."""
+        if not self.record:
+            return
+        if self.is_worker:
+            self.config.workeroutput["impact"] = json.dumps(self._results())
+            return
+        tests = load_map(self.map_path)
+        tests.update(self._results())
+        try:
+            revision = _git(self.root, "rev-parse", "HEAD").strip()
+        except (OSError, subprocess.CalledProcessError):
+            revision = None
+        save_map(self.map_path, tests, self.root, revision)
+
+    @pytest.hookimpl(optionalhook=True)
+    def pytest_testnodedown(self, node: Any, error: Any) -> None:
+        """Collect a finished xdist worker's traces."""
+        payload = getattr(node, "workeroutput", {}).get("impact")
+        if payload:
+            self.recorded.update(json.loads(payload))
@@ -0,0 +1,52 @@
+"""The session's per-endpoint latency histogram, shared by the plugins that record results.
+
+``results_db.py`` and ``sharding.py`` both report the latency of every
+request made by the ``api_client`` fixtures. They enable one histogram on
+the pytest config, so the requests are counted once even when both are
+active. Under xdist, workers send their histogram to the controller when
+they finish.
+"""
+from typing import TYPE_CHECKING, Any, Optional
+import json
+
+import pytest
+
+if TYPE_CHECKING:
+    from core.metrics import LatencyHistogram
+
+HISTOGRAM_KEY = pytest.StashKey["LatencyHistogram"]()
+
+
+def enable_latency_histogram(config: pytest.Config) -> "LatencyHistogram":
+    """Get the session's latency histogram, creating it on first use."""
+    if HISTOGRAM_KEY not in config.stash:
+        from core.metrics import LatencyHistogram
+
+        config.stash[HISTOGRAM_KEY] = LatencyHistogram()
+    return config.stash[HISTOGRAM_KEY]
+
+
+@pytest.fixture(scope="session")
+def latency_histogram(pytestconfig: pytest.Config) -> Optional["LatencyHistogram"]:
+    """
+    Fixture providing the session's per-endpoint latency histogram, if results are recorded.
+
+    :param pytestconfig: The pytest configuration object.
+    :return: A LatencyHistogram, or None when neither --results-db nor sharding is enabled.
+    """
+    return pytestconfig.stash.get(HISTOGRAM_KEY, None)
+
+
+@pytest.hookimpl(optionalhook=True)
+def pytest_testnodedown(node: Any, error: Any) -> None:
+    """Merge a finished xdist worker's latency histogram."""
+    payload = getattr(node, "workeroutput", {}).get("latency_histogram")
+    if payload:
+        enable_latency_histogram(node.config).merge(json.loads(payload))
+
+
+def pytest_sessionfinish(session: pytest.Session) -> None:
+    """Send a worker's latency histogram to the controller."""
+    config = session.config
+    if hasattr(config, "workerinput") and HISTOGRAM_KEY in config.stash:
+        config.workeroutput["latency_histogram"] = json.dumps(config.stash[HISTOGRAM_KEY].snapshot())
@@ -0,0 +1,23 @@
+"""Per-test outcome bookkeeping shared by the plugins that record results."""
+from typing import Any, Dict
+
+import pytest
+
+
+def record_report(tests: Dict[str, Dict[str, Any]], report: pytest.TestReport) -> None:
+    """Accumulate a test's outcome and duration over setup, call and teardown.
+
+    Failed and skipped tests also keep the failure text or skip reason under ``message``.
+
+    Args:
+        tests: Results so far by node id; updated in place
+        report: Report of one test phase
+    """
+    test = tests.setdefault(report.nodeid, {"nodeid": report.nodeid, "outcome": "passed", "duration": 0.0})
+    test["duration"] += report.duration
+    if report.failed:
+        test["outcome"] = "failed" if report.when == "call" else "error"
+        test["message"] = report.longreprtext[-4000:]
+    elif report.skipped and test["outcome"] == "passed":
+        test["outcome"] = "skipped"
+        test["message"] = str(report.longrepr[-1]) if isinstance(report.longrepr, tuple) else ""
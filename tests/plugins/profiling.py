@@ -0,0 +1,209 @@
+"""Per-test CPU and memory profiling.
+
+Enable with ``--profile`` (sampling CPU profiler) and/or ``--profile-mem``
+(tracemalloc). For every selected test the plugin writes a collapsed-stack
+``.folded`` file, ready for ``flamegraph.pl`` or speedscope, and/or a
+``.mem.txt`` file listing the peak and the allocation sites still alive when
+the test finished, into ``--profile-dir``.
+The terminal summary lists the slowest fixtures and the top allocators.
+Under xdist, workers write into the same directory and send their summaries
+to the controller, which merges everything into ``merged.folded``.
+
+Nothing is registered unless one of the options is given, so a normal run
+pays no overhead.
+"""
+from collections import Counter
+from fnmatch import fnmatch
+from typing import Any, Dict, Iterator, List, Optional, Tuple
+import json
+import os
+import re
+import sys
+import threading
+import time
+import tracemalloc
+
+import pytest
+
+TOP_N = 10
+
+
+def pytest_addoption(parser: pytest.Parser) -> None:
+    """Add profiling command line options."""
+    group = parser.getgroup("profiling")
+    group.addoption("--profile", action="store_true", default=False,
+                    help="Sample CPU stacks per test and write collapsed-stack files")
+    group.addoption("--profile-mem", action="store_true", default=False,
+                    help="Trace allocations per test with tracemalloc")
+    group.addoption("--profile-dir", action="store", default=".profiles",
+                    help="Directory for profiling output (default: .profiles)")
+    group.addoption("--profile-match", action="store", default="*",
+                    help="Only profile tests whose node id matches this glob")
+    group.addoption("--profile-interval", action="store", type=float, default=0.005,
+                    help="CPU sampling interval in seconds (default: 0.005)")
+
+
+def pytest_configure(config: pytest.Config) -> None:
+    """Register the profiler only when profiling was requested."""
+    if config.getoption("--profile") or config.getoption("--profile-mem"):
+        config.pluginmanager.register(Profiler(config), "profiler")
+
+
+class StackSampler:
+    """Samples one thread's Python stack at a fixed interval from a background thread."""
+
+    def __init__(self, thread_id: int, interval: float) -> None:
+        self.thread_id = thread_id
+        self.interval = interval
+        self.stacks: Counter = Counter()
+        self._stop = threading.Event()
+        self._thread = threading.Thread(target=self._run, name="profile-sampler", daemon=True)
+
+    def start(self) -> None:
+        self._thread.start()
+
+    def stop(self) -> Counter:
+        self._stop.set()
+        self._thread.join()
+        return self.stacks
+
+    def _run(self) -> None:
+        while not self._stop.wait(self.interval):
+            frame = sys._current_frames().get(self.thread_id)
+            names = []
+            while frame is not None:
+                code = frame.f_code
+                names.append(f"{os.path.basename(code.co_filename)}:{code.co_name}")
+                frame = frame.f_back
+            if names:
+                self.stacks[";".join(reversed(names))] += 1
+
+
+def _safe_name(nodeid: str) -> str:
+    return re.sub(r"[^\w.-]+", "_", nodeid).strip("_")
+
+
+class Profiler:
+    """Plugin object holding per-run profiling state."""
+
+    def __init__(self, config: pytest.Config) -> None:
+        self.config = config
+        self.cpu = config.getoption("--profile")
+        self.mem = config.getoption("--profile-mem")
+        self.match = config.getoption("--profile-match")
+        self.interval = config.getoption("--profile-interval")
+        self.output_dir = os.path.join(str(config.rootpath), config.getoption("--profile-dir"))
+        self.fixture_times: Dict[str, float] = {}
+        self.allocators: Counter = Counter()
+        self.is_worker = hasattr(config, "workerinput")
+        os.makedirs(self.output_dir, exist_ok=True)
+        if not self.is_worker:
+            self._clear_previous_run()
+        self._ignored_traces = [
+            tracemalloc.Filter(False, __file__),
+            tracemalloc.Filter(False, tracemalloc.__file__),
+        ]
+        if self.mem and not tracemalloc.is_tracing():
+            tracemalloc.start()
+
+    def _clear_previous_run(self) -> None:
+        for filename in os.listdir(self.output_dir):
+            if filename.endswith((".folded", ".mem.txt")):
+                os.remove(os.path.join(self.output_dir, filename))
+
+    @pytest.hookimpl(hookwrapper=True)
+    def pytest_fixture_setup(self, fixturedef: pytest.FixtureDef, request: pytest.FixtureRequest) -> Iterator[None]:
+        """Time every fixture setup."""
+        started = time.perf_counter()
+        yield
+        elapsed = time.perf_counter() - started
+        key = f"{fixturedef.argname} ({fixturedef.scope})"
+        self.fixture_times[key] = max(self.fixture_times.get(key, 0.0), elapsed)
+
+    @pytest.hookimpl(hookwrapper=True)
+    def pytest_runtest_protocol(self, item: pytest.Item, nextitem: Optional[pytest.Item]) -> Iterator[None]:
+        """Profile setup, call and teardown of selected tests."""
+        if not fnmatch(item.nodeid, self.match):
+            yield
+            return
+
+        sampler = StackSampler(threading.get_ident(), self.interval) if self.cpu else None
+        if self.mem:
+            # Only allocations made during this test are traced, which keeps snapshots small
+            tracemalloc.clear_traces()
+            tracemalloc.reset_peak()
+        if sampler:
+            sampler.start()
+        yield
+        name = _safe_name(item.nodeid)
+        if sampler:
+            self._write_folded(name, sampler.stop())
+        if self.mem:
+            peak = tracemalloc.get_traced_memory()[1]
+            snapshot = tracemalloc.take_snapshot().filter_traces(self._ignored_traces)
+            self._write_allocations(name, peak, snapshot.statistics("lineno"))
+
+    def _write_folded(self, name: str, stacks: Counter) -> None:
+        with open(os.path.join(self.output_dir, f"{name}.folded"), "w") as handle:
+            for stack, count in stacks.most_common():
+                handle.write(f"{stack} {count}\n")
+
+    def _write_allocations(self, name: str, peak: int, statistics: List[tracemalloc.Statistic]) -> None:
+        with open(os.path.join(self.output_dir, f"{name}.mem.txt"), "w") as handle:
+            handle.write(f"Peak traced memory: {peak} B\n")
+            for stat in statistics[:TOP_N * 3]:
+                frame = stat.traceback[0]
+                handle.write(f"{stat.size:>12} B  {stat.count:>8} blocks  {frame.filename}:{frame.lineno}\n")
+        for stat in statistics:
+            frame = stat.traceback[0]
+            self.allocators[f"{frame.filename}:{frame.lineno}"] += stat.size
+
+    def _summary(self) -> Dict[str, Any]:
+        return {"fixtures": self.fixture_times, "allocators": dict(self.allocators)}
+
+    def _merge(self, summary: Dict[str, Any]) -> None:
+        for key, elapsed in summary["fixtures"].items():
+            self.fixture_times[key] = max(self.fixture_times.get(key, 0.0), elapsed)
+        self.allocators.update(summary["allocators"])
+
+    def pytest_sessionfinish(self, session: pytest.Session) -> None:
+        """Hand worker summaries to the controller, or merge stacks on the controller."""
+        if self.is_worker:
+            self.config.workeroutput["profiling"] = json.dumps(self._summary())
+        elif self.cpu:
+            self._merge_folded()
+
+    @pytest.hookimpl(optionalhook=True)
+    def pytest_testnodedown(self, node: Any, error: Any) -> None:
+        """Collect a finished xdist worker's summary."""
+        payload = getattr(node, "workeroutput", {}).get("profiling")
+        if payload:
+            self._merge(json.loads(payload))
+
+    def _merge_folded(self) -> None:
+        merged: Counter = Counter()
+        for filename in os.listdir(self.output_dir):
+            if filename.endswith(".folded") and filename != "merged.folded":
+                with open(os.path.join(self.output_dir, filename)) as handle:
+                    for line in handle:
+                        stack, _, count = line.rstrip("\n").rpartition(" ")
+                        merged[stack] += int(count)
+        with open(os.path.join(self.output_dir, "merged.folded"), "w") as handle:
+            for stack, count in merged.most_common():
+                handle.write(f"{stack} {count}\n")
+
+    def pytest_terminal_summary(self, terminalreporter: Any) -> None:
+        """Report the slowest fixtures and top allocators."""
+        if self.is_worker:
+            return
+        terminalreporter.write_sep("-", "profiling")
+        terminalreporter.write_line(f"Profiles written to {self.output_dir}")
+        slowest: List[Tuple[str, float]] = sorted(self.fixture_times.items(), key=lambda item: -item[1])
+        if slowest:
+            terminalreporter.write_line("Slowest fixture setups:")
+            for name, elapsed in slowest[:TOP_N]:
+                terminalreporter.write_line(f"  {elapsed * 1000:10.1f} ms  {name}")
+        if self.allocators:
+            terminalreporter.write_line("Top allocators (memory still held after each profiled test):")
+            for site, size in self.allocators.most_common(TOP_N):
+                terminalreporter.write_line(f"  {size / 1024:10.1f} KiB  {site}")
@@ -0,0 +1,62 @@
+"""Record every run into the historical results database.
+
+With ``--results-db PATH`` the session's test outcomes and durations, and
+the per-endpoint latency histograms of every ``APIClient`` created by the
+``api_client`` fixtures (see ``latency.py``), are ingested into
+``utils.results_store`` as one run. Under xdist, the controller ingests
+the whole run in a single transaction. Query the history with
+``scripts/query_results.py``.
+"""
+from typing import Any, Dict
+import time
+
+import pytest
+
+from tests.plugins.latency import enable_latency_histogram
+from tests.plugins.outcomes import record_report
+
+
+def pytest_addoption(parser: pytest.Parser) -> None:
+    """Add the results database option."""
+    group = parser.getgroup("results")
+    group.addoption("--results-db", action="store", default=None,
+                    help="SQLite database to append this run's results to")
+
+
+def pytest_configure(config: pytest.Config) -> None:
+    """Register the recorder only when a database was given."""
+    if config.getoption("--results-db"):
+        config.pluginmanager.register(ResultsRecorder(config), "results_db")
+
+
+class ResultsRecorder:
+    """Plugin object collecting the run's results."""
+
+    def __init__(self, config: pytest.Config) -> None:
+        self.config = config
+        self.path = config.getoption("--results-db")
+        self.is_worker = hasattr(config, "workerinput")
+        self.histogram = enable_latency_histogram(config)
+        self.tests: Dict[str, Dict[str, Any]] = {}
+        self.started = time.time()
+
+    def pytest_runtest_logreport(self, report: pytest.TestReport) -> None:
+        """Record each test phase for the run's results."""
+        record_report(self.tests, report)
+
+    def pytest_sessionfinish(self, session: pytest.Session, exitstatus: int) -> None:
+        """Ingest the run; xdist workers leave that to the controller."""
+        if self.is_worker:
+            return
+        from utils.results_store import ResultsStore, current_commit
+
+        with ResultsStore(self.path) as store:
+            store.ingest(
+                "pytest",
+                started=self.started,
+                git_commit=current_commit(str(self.config.rootpath)),
+                exitstatus=int(exitstatus),
+                tests=self.tests.values(),
+                latency=self.histogram.snapshot(),
+                meta={"args": list(self.config.invocation_params.args)},
+            )
@@ -0,0 +1,267 @@
+"""Deterministic, duration-balanced sharding of the suite across machines.
+
+Run the same suite on N machines with ``--shard-count N --shard-id i``
+(``i`` from 1 to N). Every shard computes the same split: tests are
+assigned, longest first, to the shard with the smallest estimated total,
+using the historical durations in ``--shard-durations``. Tests without
+history are estimated at the median known duration.
+pytest-xdist keeps working inside each shard, because every worker
+computes the same split.
+
+Each shard writes ``shard-<i>-of-<N>.json`` into ``--shard-results``. The
+file holds per-test outcomes and durations and the shard's per-endpoint
+latency histogram of ``APIClient`` requests (see ``latency.py``).
+``scripts/merge_shards.py`` combines the files into one JUnit report, one
+latency histogram, a refreshed durations file and a single exit status.
+"""
+from statistics import median
+from typing import Any, Dict, Iterator, List, Optional, Tuple
+import heapq
+import json
+import os
+import time
+
+import pytest
+
+from core.metrics import LatencyHistogram
+from tests.plugins.latency import enable_latency_histogram
+from tests.plugins.outcomes import record_report
+
+RESULT_VERSION = 2
+DEFAULT_DURATION = 1.0
+
+# Exit codes of the merge step
+EXIT_OK = 0
+EXIT_TESTS_FAILED = 1
+EXIT_INCOMPLETE = 2
+
+
+def pytest_addoption(parser: pytest.Parser) -> None:
+    """Add sharding command line options."""
+    group = parser.getgroup("sharding")
+    group.addoption("--shard-count", action="store", type=int, default=None,
+                    help="Split the suite into this many shards")
+    group.addoption("--shard-id", action="store", type=int, default=None,
+                    help="Shard to run, from 1 to --shard-count")
+    group.addoption("--shard-durations", action="store", default=".shards/durations.json",
+                    help="Historical test durations used to balance shards")
+    group.addoption("--shard-results", action="store", default=".shards",
+                    help="Directory for this shard's result file (default: .shards)")
+
+
+def pytest_configure(config: pytest.Config) -> None:
+    """Register the shard selector only when sharding was requested."""
+    count, shard_id = config.getoption("--shard-count"), config.getoption("--shard-id")
+    if count is None and shard_id is None:
+        return
+    if count is None or shard_id is None or count < 1 or not 1 <= shard_id <= count:
+        raise pytest.UsageError("--shard-id and --shard-count must be given together, with 1 <= id <= count")
+    config.pluginmanager.register(ShardSelector(config, shard_id, count), "sharding")
+
+
+def load_durations(path: str) -> Dict[str, float]:
+    """Load historical test durations in seconds, or none if the file does not exist."""
+    try:
+        with open(path) as handle:
+            return json.load(handle)
+    except FileNotFoundError:
+        return {}
+
+
+def _write_json(path: str, payload: Any) -> None:
+    os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+    temporary = f"{path}.{os.getpid()}.tmp"
+    with open(temporary, "w") as handle:
+        json.dump(payload, handle, indent=1, sort_keys=True)
+    os.replace(temporary, path)
+
+
+def assign_shards(nodeids: List[str], durations: Dict[str, float], count: int) -> Tuple[Dict[str, int], List[float]]:
+    """Split tests into ``count`` shards of similar estimated duration.
+
+    The result depends only on the arguments, so every machine computes
+    the same assignment.
+
+    Args:
+        nodeids: Collected test node ids
+        durations: Historical durations in seconds
+        count: Number of shards
+
+    Returns:
+        Mapping of node id to shard (1-based), and each shard's estimated total
+    """
+    known = [durations[nodeid] for nodeid in nodeids if nodeid in durations]
+    default = median(known) if known else DEFAULT_DURATION
+    estimates = sorted(((durations.get(nodeid, default), nodeid) for nodeid in nodeids), key=lambda item: (-item[0], item[1]))
+
+    heap = [(0.0, shard) for shard in range(1, count + 1)]
+    totals = [0.0] * count
+    assignment = {}
+    for estimate, nodeid in estimates:
+        total, shard = heapq.heappop(heap)
+        assignment[nodeid] = shard
+        totals[shard - 1] = total + estimate
+        heapq.heappush(heap, (total + estimate, shard))
+    return assignment, totals
+
+
+class ShardSelector:
+    """Plugin object selecting this shard's tests and recording their results."""
+
+    def __init__(self, config: pytest.Config, shard_id: int, count: int) -> None:
+        self.config = config
+        self.shard_id = shard_id
+        self.count = count
+        root = str(config.rootpath)
+        self.durations_path = os.path.join(root, config.getoption("--shard-durations"))
+        self.results_path = os.path.join(root, config.getoption("--shard-results"), f"shard-{shard_id}-of-{count}.json")
+        self.is_worker = hasattr(config, "workerinput")
+        self.histogram = enable_latency_histogram(config)
+        self.tests: Dict[str, Dict[str, Any]] = {}
+        self.message: Optional[str] = None
+        self.started = time.time()
+
+    @pytest.hookimpl(hookwrapper=True)
+    def pytest_collection_modifyitems(self, config: pytest.Config, items: List[pytest.Item]) -> Iterator[None]:
+        """Keep only this shard's tests, after every other plugin has filtered the items."""
+        yield
+        assignment, totals = assign_shards([item.nodeid for item in items], load_durations(self.durations_path), self.count)
+        keep = [item for item in items if assignment[item.nodeid] == self.shard_id]
+        deselected = [item for item in items if assignment[item.nodeid] != self.shard_id]
+        if deselected:
+            config.hook.pytest_deselected(items=deselected)
+            items[:] = keep
+        self.message = (
+            f"shard {self.shard_id}/{self.count}: {len(keep)}/{len(assignment)} tests, "
+            f"estimated {totals[self.shard_id - 1]:.1f}s (shards: {', '.join(f'{total:.1f}s' for total in totals)})"
+        )
+
+    def pytest_report_collectionfinish(self, config: pytest.Config) -> Optional[str]:
+        """Report this shard's share of the suite."""
+        return self.message
+
+    def pytest_runtest_logreport(self, report: pytest.TestReport) -> None:
+        """Record each test phase for the shard's result file."""
+        record_report(self.tests, report)
+
+    def pytest_sessionfinish(self, session: pytest.Session, exitstatus: int) -> None:
+        """Write the shard's result file; an empty shard is not a failure."""
+        if self.is_worker:
+            return
+        if exitstatus == pytest.ExitCode.NO_TESTS_COLLECTED:
+            # More shards than tests; the merge step reports a run where no shard ran anything
+            session.exitstatus = pytest.ExitCode.OK
+        _write_json(self.results_path, {
+            "version": RESULT_VERSION,
+            "shard_id": self.shard_id,
+            "shard_count": self.count,
+            "started": self.started,
+            "wall_time": time.time() - self.started,
+            "exitstatus": int(session.exitstatus),
+            "tests": sorted(self.tests.values(), key=lambda test: test["nodeid"]),
+            "latency": self.histogram.snapshot(),
+        })
+
+
+def merge_results(results: List[Dict[str, Any]]) -> Tuple[Dict[str, Any], List[str]]:
+    """Combine shard result files.
+
+    Args:
+        results: Parsed shard result files
+
+    Returns:
+        The combined result, and problems that make it incomplete (missing or duplicate shards)
+    """
+    problems = []
+    counts = {result["shard_count"] for result in results}
+    if len(counts) != 1:
+        problems.append(f"shards disagree on the shard count: {sorted(counts)}")
+    expected = set(range(1, max(counts, default=0) + 1))
+    seen = [result["shard_id"] for result in results]
+    missing = sorted(expected - set(seen))
+    if missing:
+        problems.append(f"missing shards: {missing}")
+    duplicates = sorted({shard for shard in seen if seen.count(shard) > 1})
+    if duplicates:
+        problems.append(f"duplicate shards: {duplicates}")
+    versions = sorted({result.get("version") for result in results} - {RESULT_VERSION}, key=str)
+    if versions:
+        problems.append(f"result files of another version: {versions} (expected {RESULT_VERSION})")
+    if results and not any(result["tests"] for result in results):
+        problems.append("no shard ran any tests")
+
+    tests: Dict[str, Dict[str, Any]] = {}
+    latency = LatencyHistogram()
+    for result in results:
+        for test in result["tests"]:
+            if test["nodeid"] in tests:
+                problems.append(f"{test['nodeid']} ran in more than one shard")
+            tests[test["nodeid"]] = dict(test, shard=result["shard_id"])
+        latency.merge(result.get("latency", {}))
+
+    outcomes: Dict[str, int] = {}
+    for test in tests.values():
+        outcomes[test["outcome"]] = outcomes.get(test["outcome"], 0) + 1
+    combined = {
+        "version": RESULT_VERSION,
+        "shards": {
+            result["shard_id"]: {
+                "tests": len(result["tests"]),
+                "wall_time": result["wall_time"],
+                "test_time": sum(test["duration"] for test in result["tests"]),
+                "exitstatus": result["exitstatus"],
+            }
+            for result in results
+        },
+        "outcomes": outcomes,
+        "tests": [tests[nodeid] for nodeid in sorted(tests)],
+        "latency": latency.snapshot(),
+    }
+    return combined, problems
+
+
+def exit_status(combined: Dict[str, Any], problems: List[str]) -> int:
+    """Get one exit status for the whole sharded run."""
+    if problems:
+        return EXIT_INCOMPLETE
+    failed = combined["outcomes"].get("failed", 0) + combined["outcomes"].get("error", 0)
+    crashed = any(shard["exitstatus"] not in (0, 1) for shard in combined["shards"].values())
+    return EXIT_TESTS_FAILED if failed or crashed else EXIT_OK
+
+
+def update_durations(path: str, tests: List[Dict[str, Any]]) -> None:
+    """Merge the latest measured durations into the historical durations file."""
+    durations = load_durations(path)
+    durations.update({test["nodeid"]: round(test["duration"], 4) for test in tests if test["outcome"] != "skipped"})
+    _write_json(path, durations)
+
+
+def write_junit(path: str, tests: List[Dict[str, Any]]) -> None:
+    """Write the combined results as a JUnit XML report, one testsuite per shard."""
+    from xml.etree import ElementTree
+
+    root = ElementTree.Element("testsuites", name="pytest")
+    suites: Dict[int, ElementTree.Element] = {}
+    for test in tests:
+        suite = suites.get(test["shard"])
+        if suite is None:
+            suite = suites[test["shard"]] = ElementTree.SubElement(root, "testsuite", name=f"shard-{test['shard']}")
+        path_part, _, name = test["nodeid"].partition("::")
+        case = ElementTree.SubElement(
+            suite, "testcase",
+            classname=path_part.replace("/", ".").removesuffix(".py"),
+            name=name or path_part,
+            time=f"{test['duration']:.3f}",
+        )
+        if test["outcome"] in ("failed", "error", "skipped"):
+            tag = "failure" if test["outcome"] == "failed" else test["outcome"]
+            message = test.get("message", "")
+            ElementTree.SubElement(case, tag, message=message.splitlines()[-1] if message else "").text = message
+    for suite in suites.values():
+        cases = list(suite)
+        suite.set("tests", str(len(cases)))
+        for attribute, tag in (("failures", "failure"), ("errors", "error"), ("skipped", "skipped")):
+            suite.set(attribute, str(sum(1 for case in cases if case.find(tag) is not None)))
+        suite.set("time", f"{sum(float(case.get('time')) for case in cases):.3f}")
+    os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+    ElementTree.ElementTree(root).write(path, encoding="utf-8", xml_declaration=True)
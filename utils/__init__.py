@@ -1 +1,23 @@
-"""Utils package for test automation."""
+"""Utils package for test automation.
+
+Public names are loaded on first access (PEP 562).
+"""
+from .lazy import lazy_exports
+
+_EXPORTS = {
+    "FaultProxy": "fault_proxy",
+    "FaultRule": "fault_proxy",
+    "Latency": "fault_proxy",
+    "ResultsStore": "results_store",
+    "generate_random_email": "data_generator",
+    "generate_random_string": "data_generator",
+    "correlation": "logger",
+    "new_request_id": "logger",
+    "request_id_var": "logger",
+    "setup_logging": "logger",
+    "stop_logging": "logger",
+    "test_id_var": "logger",
+}
+
+__all__ = sorted(_EXPORTS)
+__getattr__, __dir__ = lazy_exports(__name__, _EXPORTS)
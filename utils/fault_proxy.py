@@ -0,0 +1,399 @@
+"""Fault-injection HTTP proxy for resilience and latency experiments.
+
+``FaultProxy`` listens on a local port and forwards plain HTTP/1.1 to an
+upstream base URL (``http`` or ``https``). Point an ``APIClient`` at
+``proxy.base_url`` instead of the real base URL. Rules chosen by method and
+path then inject:
+
+* latency drawn from a distribution, before the request is forwarded;
+* a bandwidth limit on the response;
+* connection resets, before any response byte is sent;
+* partial responses, cut off after a fraction of the body;
+* synthetic status codes (429/5xx bursts), answered without contacting upstream.
+
+Random choices come from one seeded generator, so a sequential experiment
+replays identically. The proxy runs on its own event loop thread and is safe
+to reconfigure from test code while requests are in flight.
+"""
+from collections import Counter
+from contextlib import contextmanager
+from dataclasses import dataclass
+from fnmatch import fnmatch
+from http import HTTPStatus
+from typing import Any, Dict, Iterator, List, Optional, Tuple
+from urllib.parse import urlsplit
+import asyncio
+import json
+import math
+import random
+import socket
+import ssl
+import struct
+import threading
+
+
+@dataclass(frozen=True)
+class Latency:
+    """Latency distribution in seconds.
+
+    Attributes:
+        kind: ``fixed``, ``uniform``, ``lognormal`` or ``pareto``
+        a: Fixed value, lower bound, median or scale, depending on ``kind``
+        b: Upper bound, sigma or alpha, depending on ``kind``
+    """
+    kind: str
+    a: float
+    b: float = 0.0
+
+    @classmethod
+    def fixed(cls, seconds: float) -> "Latency":
+        return cls("fixed", seconds)
+
+    @classmethod
+    def uniform(cls, low: float, high: float) -> "Latency":
+        return cls("uniform", low, high)
+
+    @classmethod
+    def lognormal(cls, median: float, sigma: float) -> "Latency":
+        """Right-skewed latency typical of real services."""
+        return cls("lognormal", median, sigma)
+
+    @classmethod
+    def pareto(cls, scale: float, alpha: float) -> "Latency":
+        """Heavy-tailed latency; smaller ``alpha`` means a longer tail."""
+        return cls("pareto", scale, alpha)
+
+    def sample(self, rng: random.Random) -> float:
+        """Draw one latency value."""
+        if self.kind == "fixed":
+            return self.a
+        if self.kind == "uniform":
+            return rng.uniform(self.a, self.b)
+        if self.kind == "lognormal":
+            return rng.lognormvariate(math.log(self.a), self.b)
+        if self.kind == "pareto":
+            return self.a * rng.paretovariate(self.b)
+        raise ValueError(f"Unknown latency distribution: {self.kind!r}")
+
+
+@dataclass
+class FaultRule:
+    """Faults injected into matching requests.
+
+    Attributes:
+        path: Glob matched against the request path, without the query string
+        method: HTTP method to match, or ``*``
+        latency: Delay added before the request is forwarded
+        bandwidth: Response bandwidth limit in bytes per second
+        status: Status code answered by the proxy instead of forwarding the request
+        retry_after: ``Retry-After`` header sent with ``status``
+        reset: Whether to reset the connection instead of responding
+        partial: Fraction of the response body sent before the connection is dropped
+        probability: Chance that a matching request is affected
+        times: Number of requests to affect before the rule expires; None for no limit
+    """
+    path: str = "*"
+    method: str = "*"
+    latency: Optional[Latency] = None
+    bandwidth: Optional[int] = None
+    status: Optional[int] = None
+    retry_after: Optional[float] = None
+    reset: bool = False
+    partial: Optional[float] = None
+    probability: float = 1.0
+    times: Optional[int] = None
+
+    def matches(self, method: str, path: str) -> bool:
+        """Check whether the rule applies to a request."""
+        return (
+            self.times != 0
+            and (self.method == "*" or self.method.upper() == method)
+            and fnmatch(path, self.path)
+        )
+
+
+class FaultProxy:
+    """Local HTTP proxy injecting faults into traffic to one upstream."""
+
+    def __init__(
+        self,
+        upstream: str,
+        host: str = "127.0.0.1",
+        port: int = 0,
+        seed: Optional[int] = None,
+        verify_ssl: bool = True
+    ) -> None:
+        """Initialize the proxy.
+
+        Args:
+            upstream: Upstream base URL, e.g. the ``--base-url`` under test
+            host: Interface to listen on
+            port: Port to listen on; 0 picks a free port
+            seed: Seed for latency and probability draws
+            verify_ssl: Whether to verify the upstream's certificate
+        """
+        parts = urlsplit(upstream)
+        self.upstream = upstream
+        self.upstream_host = parts.hostname
+        self.upstream_port = parts.port or (443 if parts.scheme == "https" else 80)
+        self.upstream_netloc = parts.netloc
+        self.upstream_path = parts.path.rstrip("/")
+        self.host = host
+        self.port = port
+        self.stats: Counter = Counter()
+        self._ssl = None
+        if parts.scheme == "https":
+            self._ssl = ssl.create_default_context()
+            if not verify_ssl:
+                self._ssl.check_hostname = False
+                self._ssl.verify_mode = ssl.CERT_NONE
+        self._rules: List[FaultRule] = []
+        self._lock = threading.Lock()
+        self._rng = random.Random(seed)
+        self._loop = asyncio.new_event_loop()
+        self._thread: Optional[threading.Thread] = None
+        self._server: Optional[asyncio.AbstractServer] = None
+        self._writers: set = set()
+
+    @property
+    def url(self) -> str:
+        """Get the proxy's root URL."""
+        return f"http://{self.host}:{self.port}"
+
+    @property
+    def base_url(self) -> str:
+        """Get the URL to use in place of the upstream base URL."""
+        return self.url + self.upstream_path
+
+    def start(self) -> "FaultProxy":
+        """Start listening on the proxy's event loop thread."""
+        self._thread = threading.Thread(target=self._loop.run_forever, name="fault-proxy", daemon=True)
+        self._thread.start()
+        self._server = self._run(asyncio.start_server(self._handle, self.host, self.port))
+        self.port = self._server.sockets[0].getsockname()[1]
+        return self
+
+    def stop(self) -> None:
+        """Close all connections and stop the event loop thread."""
+        if self._loop.is_closed():
+            return
+        if self._server is None:
+            self._loop.close()
+            return
+        self._run(self._shutdown())
+        self._loop.call_soon_threadsafe(self._loop.stop)
+        self._thread.join()
+        self._loop.close()
+
+    def __enter__(self) -> "FaultProxy":
+        return self.start()
+
+    def __exit__(self, *exc_info: Any) -> None:
+        self.stop()
+
+    def _run(self, coroutine: Any) -> Any:
+        return asyncio.run_coroutine_threadsafe(coroutine, self._loop).result()
+
+    async def _shutdown(self) -> None:
+        self._server.close()
+        for writer in list(self._writers):
+            writer.close()
+        # Let the connection handlers see the closed streams and clean up before the loop stops
+        tasks = [task for task in asyncio.all_tasks() if task is not asyncio.current_task()]
+        if tasks:
+            await asyncio.wait(tasks, timeout=1)
+
+    def add_rule(self, rule: Optional[FaultRule] = None, **fields: Any) -> FaultRule:
+        """Add a rule; earlier rules take precedence.
+
+        Args:
+            rule: Rule to add; built from ``fields`` if omitted
+            **fields: ``FaultRule`` attributes
+
+        Returns:
+            The added rule
+        """
+        rule = rule or FaultRule(**fields)
+        with self._lock:
+            self._rules.append(rule)
+        return rule
+
+    def remove_rule(self, rule: FaultRule) -> None:
+        """Remove a rule if it is still active."""
+        with self._lock:
+            if rule in self._rules:
+                self._rules.remove(rule)
+
+    def clear(self) -> None:
+        """Remove all rules and reset the statistics."""
+        with self._lock:
+            self._rules.clear()
+            self.stats.clear()
+
+    @contextmanager
+    def inject(self, **fields: Any) -> Iterator[FaultRule]:
+        """Apply a rule for the duration of a block."""
+        rule = self.add_rule(**fields)
+        try:
+            yield rule
+        finally:
+            self.remove_rule(rule)
+
+    def _match(self, method: str, path: str) -> Tuple[Optional[FaultRule], float]:
+        with self._lock:
+            self.stats["requests"] += 1
+            for rule in self._rules:
+                if not rule.matches(method, path):
+                    continue
+                if self._rng.random() >= rule.probability:
+                    continue  # this rule sat the request out; a later one may still apply
+                if rule.times is not None:
+                    rule.times -= 1
+                return rule, rule.latency.sample(self._rng) if rule.latency else 0.0
+        return None, 0.0
+
+    async def _handle(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter) -> None:
+        self._writers.add(writer)
+        upstream: Optional[Tuple[asyncio.StreamReader, asyncio.StreamWriter]] = None
+        try:
+            while True:
+                request = await _read_head(reader)
+                if request is None:
+                    return
+                method, target, headers = _parse_head(request)
+                body = await _read_body(reader, headers)
+                rule, delay = self._match(method, urlsplit(target).path)
+                if delay:
+                    self.stats["latency"] += 1
+                    await asyncio.sleep(delay)
+                if rule is not None and rule.reset:
+                    self.stats["reset"] += 1
+                    _abort(writer)
+                    return
+                if rule is not None and rule.status is not None:
+                    self.stats["status"] += 1
+                    await self._send(writer, _synthetic_response(rule.status, rule.retry_after), rule.bandwidth)
+                    continue
+
+                if upstream is None:
+                    upstream = await asyncio.open_connection(
+                        self.upstream_host, self.upstream_port, ssl=self._ssl,
+                        server_hostname=self.upstream_host if self._ssl else None
+                    )
+                upstream[1].write(_rewrite_host(request, self.upstream_netloc) + body)
+                await upstream[1].drain()
+                response = await _read_head(upstream[0])
+                if response is None:
+                    raise ConnectionResetError("Upstream closed the connection")
+                _, status, response_headers = _parse_head(response)
+                bodiless = method == "HEAD" or status.startswith("1") or status in ("204", "304")
+                response_body = b"" if bodiless else await _read_body(upstream[0], response_headers, response=True)
+                # A body delimited by the end of stream can only be relayed the same way
+                closing = "close" in response_headers.get("connection", "").lower() or not (
+                    bodiless or "content-length" in response_headers or "transfer-encoding" in response_headers
+                )
+
+                if rule is not None and rule.partial is not None:
+                    self.stats["partial"] += 1
+                    writer.write(response + response_body[:int(len(response_body) * rule.partial)])
+                    await writer.drain()
+                    _abort(writer)
+                    return
+                if rule is not None and rule.bandwidth:
+                    self.stats["throttled"] += 1
+                await self._send(writer, response + response_body, rule.bandwidth if rule else None)
+                if closing:
+                    return
+        except (ConnectionError, OSError, asyncio.IncompleteReadError, asyncio.LimitOverrunError):
+            pass
+        finally:
+            self._writers.discard(writer)
+            writer.close()
+            if upstream is not None:
+                upstream[1].close()
+
+    @staticmethod
+    async def _send(writer: asyncio.StreamWriter, data: bytes, bandwidth: Optional[int]) -> None:
+        if not bandwidth:
+            writer.write(data)
+            await writer.drain()
+            return
+        # Send in slices of about 50 ms worth of bandwidth
+        step = max(1, bandwidth // 20)
+        for offset in range(0, len(data), step):
+            piece = data[offset:offset + step]
+            writer.write(piece)
+            await writer.drain()
+            await asyncio.sleep(len(piece) / bandwidth)
+
+
+async def _read_head(reader: asyncio.StreamReader) -> Optional[bytes]:
+    """Read a request or response head, or return None at a clean end of stream."""
+    try:
+        return await reader.readuntil(b"\r\n\r\n")
+    except asyncio.IncompleteReadError as e:
+        if e.partial:
+            raise
+        return None
+
+
+def _parse_head(head: bytes) -> Tuple[str, str, Dict[str, str]]:
+    """Split a head into its first two start-line tokens and lower-cased headers.
+
+    The tokens are (method, target) for a request and (version, status) for a response.
+    """
+    lines = head.decode("latin-1").split("\r\n")
+    first, second = (lines[0].split(" ") + ["", ""])[:2]
+    headers = {}
+    for line in lines[1:]:
+        name, _, value = line.partition(":")
+        if name:
+            headers[name.strip().lower()] = value.strip()
+    return first, second, headers
+
+
+async def _read_body(reader: asyncio.StreamReader, headers: Dict[str, str], response: bool = False) -> bytes:
+    """Read a message body framed by chunked encoding, Content-Length, or end of stream."""
+    if "chunked" in headers.get("transfer-encoding", "").lower():
+        data = bytearray()
+        while True:
+            line = await reader.readuntil(b"\r\n")
+            data += line
+            if int(line.split(b";")[0], 16) == 0:
+                while True:
+                    trailer = await reader.readuntil(b"\r\n")
+                    data += trailer
+                    if trailer == b"\r\n":
+                        return bytes(data)
+            data += await reader.readexactly(int(line.split(b";")[0], 16) + 2)
+    if "content-length" in headers:
+        return await reader.readexactly(int(headers["content-length"]))
+    return await reader.read() if response else b""
+
+
+def _rewrite_host(head: bytes, netloc: str) -> bytes:
+    lines = head.split(b"\r\n")
+    for index, line in enumerate(lines):
+        if line.lower().startswith(b"host:"):
+            lines[index] = b"Host: " + netloc.encode()
+    return b"\r\n".join(lines)
+
+
+def _synthetic_response(status: int, retry_after: Optional[float]) -> bytes:
+    try:
+        reason = HTTPStatus(status).phrase
+    except ValueError:
+        reason = "Injected Fault"
+    body = json.dumps({"success": False, "status": status, "message": f"Injected fault: {status} {reason}"}).encode()
+    head = f"HTTP/1.1 {status} {reason}\r\nContent-Type: application/json\r\nContent-Length: {len(body)}\r\n"
+    if retry_after is not None:
+        head += f"Retry-After: {retry_after:g}\r\n"
+    return head.encode() + b"\r\n" + body
+
+
+def _abort(writer: asyncio.StreamWriter) -> None:
+    """Reset the connection (RST) rather than closing it gracefully."""
+    sock = writer.get_extra_info("socket")
+    if sock is not None:
+        sock.setsockopt(socket.SOL_SOCKET, socket.SO_LINGER, struct.pack("ii", 1, 0))
+    writer.transport.abort()
@@ -0,0 +1,33 @@
+"""Lazy attribute loading for package ``__init__`` modules (PEP 562)."""
+from importlib import import_module
+from typing import Any, Callable, Dict, List, Tuple
+
+
+def lazy_exports(package: str, exports: Dict[str, str]) -> Tuple[Callable[[str], Any], Callable[[], List[str]]]:
+    """Build module-level ``__getattr__`` and ``__dir__`` functions for a package.
+
+    A public name is imported from its submodule the first time it is
+    accessed and then cached in the package namespace, so later lookups are
+    plain attribute reads.
+
+    Args:
+        package: The package's ``__name__``
+        exports: Mapping of public name to the submodule defining it
+
+    Returns:
+        The ``(__getattr__, __dir__)`` pair to assign in the package
+    """
+    namespace = import_module(package).__dict__
+
+    def __getattr__(name: str) -> Any:
+        submodule = exports.get(name)
+        if submodule is None:
+            raise AttributeError(f"module {package!r} has no attribute {name!r}")
+        value = getattr(import_module(f"{package}.{submodule}"), name)
+        namespace[name] = value
+        return value
+
+    def __dir__() -> List[str]:
+        return sorted(set(namespace) | set(exports))
+
+    return __getattr__, __dir__
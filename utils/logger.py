@@ -0,0 +1,160 @@
+"""Non-blocking structured logging for the automation framework.
+
+``setup_logging`` applies ``config/logging.yaml`` and then moves the
+configured handlers behind a ``QueueListener``: callers only enqueue the
+record, while message formatting, JSON encoding and I/O happen on a
+background thread. Records carry the current test and request correlation
+IDs, and high-volume DEBUG records can be sampled per call site.
+"""
+from contextlib import contextmanager
+from typing import Any, Dict, Iterator, Optional, Tuple
+import atexit
+import contextvars
+import itertools
+import json
+import logging
+import logging.handlers
+import os
+import queue
+
+DEFAULT_CONFIG_PATH = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "config", "logging.yaml")
+
+test_id_var: contextvars.ContextVar[Optional[str]] = contextvars.ContextVar("test_id", default=None)
+request_id_var: contextvars.ContextVar[Optional[str]] = contextvars.ContextVar("request_id", default=None)
+
+_request_ids = itertools.count(1)
+_STANDARD_ATTRS = frozenset(vars(logging.LogRecord("", 0, "", 0, "", (), None))) | {"message", "asctime"}
+
+
+def new_request_id() -> str:
+    """Generate a cheap, process-unique request correlation ID."""
+    return f"{os.getpid():x}-{next(_request_ids):x}"
+
+
+@contextmanager
+def correlation(var: contextvars.ContextVar, value: Optional[str]) -> Iterator[None]:
+    """Bind a correlation ID for the duration of the block.
+
+    Args:
+        var: ``test_id_var`` or ``request_id_var``
+        value: ID to bind
+    """
+    token = var.set(value)
+    try:
+        yield
+    finally:
+        var.reset(token)
+
+
+class CorrelationFilter(logging.Filter):
+    """Stamps records with the correlation IDs of the emitting context.
+
+    Must run on the emitting thread, i.e. be attached to the queue handler,
+    because context variables are not visible from the listener thread.
+    """
+
+    def filter(self, record: logging.LogRecord) -> bool:
+        record.test_id = test_id_var.get()
+        record.request_id = request_id_var.get()
+        return True
+
+
+class SamplingFilter(logging.Filter):
+    """Keeps one in every ``rate`` records at or below ``level`` per call site."""
+
+    def __init__(self, rate: int = 1, level: int = logging.DEBUG) -> None:
+        super().__init__()
+        self.rate = rate
+        self.level = level
+        self._counts: Dict[Tuple[str, int], int] = {}
+
+    def filter(self, record: logging.LogRecord) -> bool:
+        if self.rate <= 1 or record.levelno > self.level:
+            return True
+        key = (record.pathname, record.lineno)
+        count = self._counts.get(key, 0)
+        self._counts[key] = count + 1
+        return count % self.rate == 0
+
+
+class LazyQueueHandler(logging.handlers.QueueHandler):
+    """Queue handler that defers message formatting to the listener thread.
+
+    The stock ``QueueHandler.prepare`` merges ``args`` into the message on the
+    caller's thread so records can be pickled; an in-process queue does not
+    need that, so the record is enqueued untouched.
+    """
+
+    def prepare(self, record: logging.LogRecord) -> logging.LogRecord:
+        return record
+
+
+class JsonFormatter(logging.Formatter):
+    """Formats records as single-line JSON objects, including ``extra`` fields."""
+
+    def format(self, record: logging.LogRecord) -> str:
+        payload: Dict[str, Any] = {
+            "ts": self.formatTime(record, self.datefmt),
+            "level": record.levelname,
+            "logger": record.name,
+            "message": record.getMessage(),
+        }
+        for key, value in vars(record).items():
+            if key not in _STANDARD_ATTRS and value is not None:
+                payload[key] = value
+        if record.exc_info:
+            payload["exc_info"] = self.formatException(record.exc_info)
+        return json.dumps(payload, default=str)
+
+
+def setup_logging(
+    config_path: Optional[str] = None,
+    level: Optional[str] = None
+) -> logging.handlers.QueueListener:
+    """Configure logging from YAML and move its handlers onto a background thread.
+
+    Args:
+        config_path: Path to the YAML config (defaults to ``config/logging.yaml``)
+        level: Root level override; falls back to the ``LOG_LEVEL`` environment variable
+
+    Returns:
+        The started QueueListener; pass it to ``stop_logging`` to flush it (also done at exit)
+    """
+    import logging.config
+    import yaml  # deferred so that importing the correlation helpers stays cheap
+
+    with open(config_path or DEFAULT_CONFIG_PATH) as handle:
+        config = yaml.safe_load(handle)
+
+    sample_rate = int(config.pop("queue", {}).get("debug_sample_rate", 1))
+    worker = os.environ.get("PYTEST_XDIST_WORKER", "main")
+    for handler in config.get("handlers", {}).values():
+        if "filename" in handler:
+            handler["filename"] = handler["filename"].format(worker=worker)
+            os.makedirs(os.path.dirname(handler["filename"]) or ".", exist_ok=True)
+    level = level or os.environ.get("LOG_LEVEL")
+    if level:
+        config.setdefault("root", {})["level"] = level.upper()
+
+    logging.config.dictConfig(config)
+    root = logging.getLogger()
+    handlers = list(root.handlers)
+    for handler in handlers:
+        root.removeHandler(handler)
+
+    log_queue: queue.SimpleQueue = queue.SimpleQueue()
+    queue_handler = LazyQueueHandler(log_queue)
+    queue_handler.addFilter(SamplingFilter(sample_rate))
+    queue_handler.addFilter(CorrelationFilter())
+    root.addHandler(queue_handler)
+
+    listener = logging.handlers.QueueListener(log_queue, *handlers, respect_handler_level=True)
+    listener.start()
+    atexit.register(stop_logging, listener)
+    return listener
+
+
+def stop_logging(listener: logging.handlers.QueueListener) -> None:
+    """Flush queued records and stop the listener thread; safe to call twice."""
+    if listener._thread is not None:
+        listener.stop()
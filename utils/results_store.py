@@ -0,0 +1,253 @@
+"""SQLite store of historical test and load-test results.
+
+Every pytest or Locust run becomes one row in ``runs``, tagged with the git
+commit. Its test outcomes and durations, per-endpoint latency histograms and
+Locust request statistics hang off that row. Each run is ingested in a
+single transaction, and the indexes on run, test, endpoint and commit keep
+trend queries cheap as history grows.
+"""
+from contextlib import contextmanager
+from typing import Any, Dict, Iterable, Iterator, List, Optional
+import json
+import os
+import socket
+import sqlite3
+import subprocess
+import time
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS runs (
+    id INTEGER PRIMARY KEY,
+    kind TEXT NOT NULL,
+    started REAL NOT NULL,
+    finished REAL,
+    git_commit TEXT,
+    host TEXT,
+    exitstatus INTEGER,
+    meta TEXT
+);
+CREATE TABLE IF NOT EXISTS test_results (
+    run_id INTEGER NOT NULL REFERENCES runs(id) ON DELETE CASCADE,
+    nodeid TEXT NOT NULL,
+    outcome TEXT NOT NULL,
+    duration REAL NOT NULL,
+    PRIMARY KEY (run_id, nodeid)
+);
+CREATE TABLE IF NOT EXISTS endpoint_latency (
+    run_id INTEGER NOT NULL REFERENCES runs(id) ON DELETE CASCADE,
+    endpoint TEXT NOT NULL,
+    bucket_ms INTEGER NOT NULL,
+    count INTEGER NOT NULL,
+    PRIMARY KEY (run_id, endpoint, bucket_ms)
+);
+CREATE TABLE IF NOT EXISTS locust_stats (
+    run_id INTEGER NOT NULL REFERENCES runs(id) ON DELETE CASCADE,
+    endpoint TEXT NOT NULL,
+    requests INTEGER NOT NULL,
+    failures INTEGER NOT NULL,
+    avg_ms REAL,
+    p50_ms REAL,
+    p95_ms REAL,
+    p99_ms REAL,
+    max_ms REAL,
+    rps REAL,
+    PRIMARY KEY (run_id, endpoint)
+);
+CREATE INDEX IF NOT EXISTS runs_by_kind ON runs(kind, started);
+CREATE INDEX IF NOT EXISTS runs_by_commit ON runs(git_commit);
+CREATE INDEX IF NOT EXISTS test_results_by_test ON test_results(nodeid, run_id);
+CREATE INDEX IF NOT EXISTS endpoint_latency_by_endpoint ON endpoint_latency(endpoint, run_id);
+CREATE INDEX IF NOT EXISTS locust_stats_by_endpoint ON locust_stats(endpoint, run_id);
+"""
+
+# The last :last_runs runs, of kind :kind unless it is NULL, as the CTE ``recent``
+RECENT_RUNS = """
+WITH recent AS (
+    SELECT id, kind, started, git_commit FROM runs
+    WHERE :kind IS NULL OR kind = :kind
+    ORDER BY started DESC LIMIT :last_runs
+)"""
+
+LOCUST_COLUMNS = ("endpoint", "requests", "failures", "avg_ms", "p50_ms", "p95_ms", "p99_ms", "max_ms", "rps")
+
+
+def current_commit(root: Optional[str] = None) -> Optional[str]:
+    """Get the commit being tested, from ``GIT_COMMIT`` or the working tree."""
+    if os.environ.get("GIT_COMMIT"):
+        return os.environ["GIT_COMMIT"]
+    try:
+        return subprocess.run(
+            ["git", "rev-parse", "HEAD"], cwd=root, capture_output=True, text=True, check=True
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+class ResultsStore:
+    """Embedded SQLite results database."""
+
+    def __init__(self, path: str) -> None:
+        """Open (and if needed create) the database.
+
+        Args:
+            path: Database file
+        """
+        os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+        self.path = path
+        self.connection = sqlite3.connect(path, timeout=30)
+        self.connection.row_factory = sqlite3.Row
+        # WAL lets trend queries run while another process ingests
+        self.connection.execute("PRAGMA journal_mode=WAL")
+        self.connection.execute("PRAGMA synchronous=NORMAL")
+        self.connection.execute("PRAGMA foreign_keys=ON")
+        self.connection.executescript(SCHEMA)
+
+    def close(self) -> None:
+        self.connection.close()
+
+    def __enter__(self) -> "ResultsStore":
+        return self
+
+    def __exit__(self, *exc_info: Any) -> None:
+        self.close()
+
+    @contextmanager
+    def _transaction(self) -> Iterator[sqlite3.Connection]:
+        with self.connection:
+            yield self.connection
+
+    def ingest(
+        self,
+        kind: str,
+        started: float,
+        finished: Optional[float] = None,
+        git_commit: Optional[str] = None,
+        exitstatus: Optional[int] = None,
+        tests: Iterable[Dict[str, Any]] = (),
+        latency: Optional[Dict[str, Dict[int, int]]] = None,
+        locust: Iterable[Dict[str, Any]] = (),
+        meta: Optional[Dict[str, Any]] = None
+    ) -> int:
+        """Store one run and all of its results in a single transaction.
+
+        Args:
+            kind: ``pytest`` or ``locust``
+            started: Run start as a Unix timestamp
+            finished: Run end as a Unix timestamp; defaults to now
+            git_commit: Commit under test
+            exitstatus: Process exit status of the run
+            tests: Dicts with ``nodeid``, ``outcome`` and ``duration`` (seconds)
+            latency: Per-endpoint histograms of bucket upper bound (ms) to count
+            locust: Dicts with the keys in ``LOCUST_COLUMNS``
+            meta: Extra JSON-serialisable run information
+
+        Returns:
+            The new run's id
+        """
+        with self._transaction() as connection:
+            run_id = connection.execute(
+                "INSERT INTO runs (kind, started, finished, git_commit, host, exitstatus, meta) VALUES (?, ?, ?, ?, ?, ?, ?)",
+                (kind, started, finished or time.time(), git_commit, socket.gethostname(), exitstatus,
+                 json.dumps(meta) if meta else None),
+            ).lastrowid
+            connection.executemany(
+                "INSERT OR REPLACE INTO test_results (run_id, nodeid, outcome, duration) VALUES (?, ?, ?, ?)",
+                ((run_id, test["nodeid"], test["outcome"], test["duration"]) for test in tests),
+            )
+            connection.executemany(
+                "INSERT INTO endpoint_latency (run_id, endpoint, bucket_ms, count) VALUES (?, ?, ?, ?)",
+                (
+                    (run_id, endpoint, int(bucket), count)
+                    for endpoint, buckets in (latency or {}).items()
+                    for bucket, count in buckets.items()
+                ),
+            )
+            connection.executemany(
+                f"INSERT INTO locust_stats (run_id, {', '.join(LOCUST_COLUMNS)}) VALUES (?{', ?' * len(LOCUST_COLUMNS)})",
+                ((run_id, *(row.get(column) for column in LOCUST_COLUMNS)) for row in locust),
+            )
+        return run_id
+
+    def runs(self, kind: Optional[str] = None, last: int = 20) -> List[sqlite3.Row]:
+        """Get the most recent runs, newest first."""
+        return self.connection.execute(
+            """
+            SELECT r.*, (SELECT COUNT(*) FROM test_results t WHERE t.run_id = r.id) AS tests,
+                   (SELECT COUNT(*) FROM test_results t WHERE t.run_id = r.id AND t.outcome IN ('failed', 'error')) AS failed
+            FROM runs r WHERE (?1 IS NULL OR r.kind = ?1) ORDER BY r.started DESC LIMIT ?2
+            """,
+            (kind, last),
+        ).fetchall()
+
+    def slowest_tests(self, last_runs: int = 10, limit: int = 10) -> List[sqlite3.Row]:
+        """Get the tests with the highest mean duration over the last pytest runs."""
+        return self.connection.execute(
+            f"""
+            {RECENT_RUNS}
+            SELECT t.nodeid, COUNT(*) AS runs, AVG(t.duration) AS mean, MAX(t.duration) AS max,
+                   SUM(t.outcome IN ('failed', 'error')) AS failures
+            FROM test_results t JOIN recent r ON r.id = t.run_id
+            WHERE t.outcome != 'skipped'
+            GROUP BY t.nodeid ORDER BY mean DESC LIMIT :limit
+            """,
+            {"kind": "pytest", "last_runs": last_runs, "limit": limit},
+        ).fetchall()
+
+    def test_trend(self, nodeid: str, last_runs: int = 20) -> List[sqlite3.Row]:
+        """Get a test's outcome and duration in each of the last pytest runs, oldest first."""
+        return self.connection.execute(
+            f"""
+            {RECENT_RUNS}
+            SELECT r.id AS run_id, r.started, r.git_commit, t.outcome, t.duration
+            FROM recent r JOIN test_results t ON t.run_id = r.id AND t.nodeid = :nodeid
+            ORDER BY r.started
+            """,
+            {"kind": "pytest", "last_runs": last_runs, "nodeid": nodeid},
+        ).fetchall()
+
+    def endpoint_trend(self, endpoint: str, last_runs: int = 20) -> List[Dict[str, Any]]:
+        """Get an endpoint's request count and latency percentiles per run, oldest first.
+
+        Percentiles are bucket upper bounds, from ``APIClient`` histograms
+        (pytest runs) or from Locust statistics (locust runs).
+        """
+        from core.metrics import percentile
+
+        trend: Dict[int, Dict[str, Any]] = {}
+        for row in self.connection.execute(
+            f"""
+            {RECENT_RUNS}
+            SELECT r.id AS run_id, r.kind, r.started, r.git_commit, l.bucket_ms, l.count
+            FROM recent r JOIN endpoint_latency l ON l.run_id = r.id AND l.endpoint = :endpoint
+            """,
+            {"kind": None, "last_runs": last_runs, "endpoint": endpoint},
+        ):
+            run = trend.setdefault(row["run_id"], {
+                "run_id": row["run_id"], "kind": row["kind"], "started": row["started"],
+                "git_commit": row["git_commit"], "buckets": {},
+            })
+            run["buckets"][row["bucket_ms"]] = row["count"]
+        for run in trend.values():
+            buckets = run.pop("buckets")
+            run.update(requests=sum(buckets.values()), p50_ms=percentile(buckets, 50), p95_ms=percentile(buckets, 95))
+        return sorted(trend.values(), key=lambda run: run["started"])
+
+    def regressions(self, last_runs: int = 10, factor: float = 1.5, min_duration: float = 0.05) -> List[sqlite3.Row]:
+        """Find tests whose latest duration exceeds their mean over the preceding runs by ``factor``."""
+        return self.connection.execute(
+            f"""
+            {RECENT_RUNS},
+            latest AS (SELECT id FROM recent ORDER BY started DESC LIMIT 1),
+            baseline AS (
+                SELECT t.nodeid, AVG(t.duration) AS mean, COUNT(*) AS runs
+                FROM test_results t JOIN recent r ON r.id = t.run_id
+                WHERE t.run_id NOT IN (SELECT id FROM latest) AND t.outcome = 'passed'
+                GROUP BY t.nodeid
+            )
+            SELECT t.nodeid, b.mean, t.duration AS latest, t.duration / b.mean AS ratio, b.runs
+            FROM test_results t JOIN latest l ON l.id = t.run_id JOIN baseline b ON b.nodeid = t.nodeid
+            WHERE t.duration >= :min_duration AND t.duration > b.mean * :factor
+            ORDER BY ratio DESC
+            """,
+            {"kind": "pytest", "last_runs": last_runs, "factor": factor, "min_duration": min_duration},
+        ).fetchall()